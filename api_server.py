@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Matching API Server
+Local HTTP service for the frontend: filtered, paginated events and pair
+matching, with identical in-flight match requests coalesced into one LLM
+call, a TTL cache of recent results, and gzip and ETag/304 responses
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+from event_matcher import EventMatcher, LocalScorer, Person
+from event_dedupe import DedupeReport, dedupe_events
+from event_store import EventStore, event_key
+from interest_index import InterestIndex
+from llm_cache import ResponseCache
+from location_resolver import UNKNOWN, load_registry
+
+GZIP_MIN_BYTES = 1024
+MAX_PER_PAGE = 100
+MATCH_MODES = ('llm', 'local')
+
+class EventCatalog:
+    def __init__(self, path: str = 'all_luma_events.json', store: Optional[EventStore] = None,
+                 refresh_seconds: float = 30.0):
+        """Events served by the API, from the JSON export or the SQLite store
+
+        The JSON file is reloaded when it changes on disk, the store at most
+        every refresh_seconds. version changes whenever the events do, and
+        keys both the ETags and the match cache.
+        """
+        self.path = path
+        self.store = store
+        self.refresh_seconds = refresh_seconds
+        self.registry = load_registry()
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._loaded_at = 0.0
+        self.version = ''
+        self.events: List[Dict] = []
+        self.index = InterestIndex([])
+        self.dedupe_report = DedupeReport()
+
+    def _current_stamp(self):
+        if self.store:
+            return None if time.monotonic() - self._loaded_at < self.refresh_seconds else object()
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def snapshot(self) -> Tuple[str, List[Dict], InterestIndex]:
+        """(version, events, interest index), reloading first if the source has changed"""
+        with self._lock:
+            stamp = self._current_stamp()
+            if self._loaded_at == 0.0 or (stamp is not None and stamp != self._stamp):
+                if self.store:
+                    events = self.store.query()
+                else:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        events = json.load(f)
+                    # The JSON export can list an event once per scrape that saw it; keep the freshest copy
+                    events = list({event_key(e): e for e in reversed(events)}.values())[::-1]
+                # Recurring series collapse to one event, so matching never sees the copies
+                events, deduper = dedupe_events(events)
+                self.dedupe_report = deduper.report
+                digest = zlib.crc32('\n'.join(
+                    f"{e.get('link')}|{e.get('date')}|{e.get('status')}|{e.get('occurrences', 1)}" for e in events
+                ).encode('utf-8'))
+                self.version = f"{len(events)}-{digest:08x}"
+                self.events = events
+                self.index = InterestIndex(events)
+                self._stamp = stamp
+                self._loaded_at = time.monotonic()
+            return self.version, self.events, self.index
+
+    def canonical_city(self, city: str) -> str:
+        resolution = self.registry.resolve(city)
+        return resolution.city if resolution.known else city.strip()
+
+    def filter(self, cities: Optional[List[str]] = None, interests: Optional[List[str]] = None,
+               query: Optional[str] = None) -> List[Dict]:
+        """Events in any of cities, matching any interest (best first) and containing query"""
+        _, events, index = self.snapshot()
+        positions = range(len(events))
+        if interests:
+            scores = index.score_interests(interests)
+            positions = sorted(scores, key=lambda i: (-scores[i], i))
+        if cities:
+            wanted = {self.canonical_city(c).lower() for c in cities}
+            positions = [i for i in positions if (events[i].get('city') or '').lower() in wanted]
+        if query:
+            q = query.lower()
+            positions = [i for i in positions
+                         if any(q in (events[i].get(key) or '').lower() for key in ('title', 'organizers', 'location'))]
+        return [events[i] for i in positions]
+
+    def events_for_pair(self, person1: Person, person2: Person) -> List[Dict]:
+        """Events in either person's city, or the whole catalog if neither city is known"""
+        cities = [c for c in dict.fromkeys(r.city for r in self.registry.resolve_many(
+            [person1.location, person2.location])) if c != UNKNOWN]
+        events = self.filter(cities=cities) if cities else []
+        return events or self.snapshot()[1]
+
+class MatchService:
+    def __init__(self, catalog: EventCatalog, matcher: Optional[EventMatcher] = None,
+                 ttl_seconds: float = 300.0, max_entries: int = 256):
+        """Pair matching with request coalescing and a TTL cache
+
+        Requests for the same pair, mode and catalog version share one
+        computation while it is running, and its result is then served from
+        the cache for ttl_seconds. Without a matcher only 'local' mode works.
+        """
+        self.catalog = catalog
+        self.matcher = matcher
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0, 'cache_hits': 0, 'errors': 0}
+        self._cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(version: str, mode: str, person1: Person, person2: Person) -> str:
+        def person_key(p: Person):
+            return [p.name, p.location.strip().lower(), sorted({i.strip().lower() for i in p.interests})]
+        raw = json.dumps([version, mode, person_key(person1), person_key(person2)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _compute(self, mode: str, person1: Person, person2: Person) -> Dict:
+        events = self.catalog.events_for_pair(person1, person2)
+        if mode == 'local':
+            matches = LocalScorer([person1, person2]).score_pairs(events)[(person1.name, person2.name)]
+        else:
+            results = self.matcher.find_matching_events_json(events, person1, person2)
+            matches = [r.to_dict(person1.name, person2.name) for r in results]
+        return {'mode': mode, 'person1': person1.name, 'person2': person2.name,
+                'events_considered': len(events), 'matches': matches}
+
+    def match(self, person1: Person, person2: Person, mode: Optional[str] = None) -> Tuple[Dict, str]:
+        """The match payload and where it came from: 'cache', 'coalesced' or 'computed'"""
+        mode = mode or ('llm' if self.matcher else 'local')
+        if mode not in MATCH_MODES:
+            raise ValueError(f"mode must be one of {MATCH_MODES}, got {mode!r}")
+        if mode == 'llm' and self.matcher is None:
+            raise ValueError("LLM matching is disabled on this server; use mode=local")
+        version, _, _ = self.catalog.snapshot()
+        key = self.make_key(version, mode, person1, person2)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return cached[1], 'cache'
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not owner:
+            return future.result(), 'coalesced'
+
+        try:
+            payload = self._compute(mode, person1, person2)
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self.stats['computed'] += 1
+            # An LLM call that found nothing isn't worth keeping; the next request retries it
+            if payload['matches'] or mode == 'local':
+                self._cache[key] = (time.monotonic() + self.ttl_seconds, payload)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+            del self._in_flight[key]
+        future.set_result(payload)
+        return payload, 'computed'
+
+def load_person(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def person_from_request(data: Any, default_path: str) -> Person:
+    """A Person from a request body entry, falling back to the saved intern profile"""
+    if data is None:
+        data = load_person(default_path)
+    if not isinstance(data, dict) or not isinstance(data.get('interests'), list):
+        raise ValueError("each person needs a name, a location and a list of interests")
+    return Person(name=str(data.get('name') or 'Person'), interests=[str(i) for i in data['interests']],
+                  location=str(data.get('location') or ''))
+
+class APIServer:
+    def __init__(self, catalog: EventCatalog, matches: MatchService, host: str = '127.0.0.1', port: int = 8000,
+                 people_paths: Tuple[str, str] = ('intern1.json', 'intern2.json')):
+        """Serve /api/events, /api/match, /api/people and /api/stats"""
+        self.catalog = catalog
+        self.matches = matches
+        self.people_paths = people_paths
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def events_page(self, params: Dict[str, List[str]]) -> Dict:
+        try:
+            page = int(params.get('page', ['1'])[0])
+            per_page = int(params.get('per_page', ['20'])[0])
+        except ValueError:
+            raise ValueError("page and per_page must be integers")
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            raise ValueError(f"page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}")
+        events = self.catalog.filter(cities=params.get('city'), interests=params.get('interest'),
+                                     query=params.get('q', [None])[0])
+        start = (page - 1) * per_page
+        return {
+            'version': self.catalog.version,
+            'total': len(events),
+            'page': page,
+            'per_page': per_page,
+            'pages': (len(events) + per_page - 1) // per_page,
+            'events': events[start:start + per_page]
+        }
+
+    def match(self, body: Dict) -> Tuple[Dict, str]:
+        person1 = person_from_request(body.get('person1'), self.people_paths[0])
+        person2 = person_from_request(body.get('person2'), self.people_paths[1])
+        return self.matches.match(person1, person2, body.get('mode'))
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest()[:20]
+                encoding = None
+                if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    encoding = 'gzip'
+                    etag += '-gzip'
+                etag += '"'
+
+                if status == 200 and etag in self._if_none_match():
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Vary', 'Accept-Encoding')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if encoding:
+                    body = gzip.compress(body, compresslevel=6)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _if_none_match(self) -> List[str]:
+                header = self.headers.get('If-None-Match', '')
+                return [tag.strip().removeprefix('W/') for tag in header.split(',') if tag.strip()]
+
+            def _error(self, status: int, message: str):
+                self._send_json(status, {'error': message})
+
+            def _route(self, method: str, body: Optional[Dict] = None):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                try:
+                    if method == 'GET' and url.path == '/api/events':
+                        self._send_json(200, api.events_page(params))
+                    elif url.path == '/api/match':
+                        if method == 'GET':
+                            body = {'mode': params.get('mode', [None])[0]}
+                        payload, source = api.match(body or {})
+                        self._send_json(200, payload, {'X-Match-Source': source})
+                    elif method == 'GET' and url.path == '/api/people':
+                        self._send_json(200, [load_person(p) for p in api.people_paths])
+                    elif method == 'GET' and url.path == '/api/stats':
+                        self._send_json(200, {'catalog_version': api.catalog.version,
+                                              'events': len(api.catalog.events),
+                                              'events_deduplicated': api.catalog.dedupe_report.removed,
+                                              'match': api.matches.stats})
+                    else:
+                        self._error(404, f"no route for {method} {url.path}")
+                except ValueError as e:
+                    self._error(400, str(e))
+                except FileNotFoundError as e:
+                    self._error(503, f"data not available: {e.filename}")
+                except Exception as e:
+                    print(f"Error handling {method} {url.path}: {str(e)}")
+                    self._error(500, "internal error")
+
+            def do_GET(self):
+                self._route('GET')
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    self._error(400, "invalid JSON body")
+                    return
+                if not isinstance(body, dict):
+                    self._error(400, "request body must be a JSON object")
+                    return
+                self._route('POST', body)
+
+            def do_OPTIONS(self):
+                self.send_response(204)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        return Handler
+
+    def start(self) -> 'APIServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'APIServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    """Run the API server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local API for events and pair matching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--events', default='all_luma_events.json', help="Events JSON to serve")
+    parser.add_argument('--db', help="Serve events from this SQLite event store instead")
+    parser.add_argument('--top-k', type=int, default=30, help="Events pre-ranked locally before the LLM call")
+    parser.add_argument('--ttl', type=float, default=300.0, help="Seconds to keep match results")
+    parser.add_argument('--local-only', action='store_true', help="Disable LLM matching")
+    args = parser.parse_args()
+
+    load_dotenv()
+    catalog = EventCatalog(args.events, store=EventStore(args.db) if args.db else None)
+    matcher = None
+    if not args.local_only:
+        matcher = EventMatcher(top_k=args.top_k or None, cache=ResponseCache(), output_file=None)
+    server = APIServer(catalog, MatchService(catalog, matcher, ttl_seconds=args.ttl), args.host, args.port)
+    print(f"Matching API listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Batch Event Matcher
+Matches a whole cohort of profiles, either every pair or a supplied pair
+list, with bounded concurrent LLM calls and per-pair JSONL output
+"""
+
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from event_dedupe import dedupe_events
+from event_matcher import DEFAULT_API_URL, EventMatcher, Person
+from llm_cache import ResponseCache
+from llm_client import LLMClient
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.05):
+        """Token bucket shared by all workers
+
+        rate is the steady number of requests per second. On HTTP 429 the rate
+        is halved (down to min_rate) and every worker pauses for Retry-After;
+        each success then creeps the rate back up towards the configured one.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.throttle_count = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Back off after the API answered 429"""
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def on_success(self):
+        """Recover rate additively after a successful request"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+
+def load_profiles(path: str) -> List[Person]:
+    """Load profiles from a directory of JSON files or from a JSONL file"""
+    profiles = []
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            if not filename.endswith('.json'):
+                continue
+            with open(os.path.join(path, filename), 'r', encoding='utf-8') as f:
+                profiles.append(Person.from_json(json.load(f)))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    profiles.append(Person.from_json(json.loads(line)))
+    return profiles
+
+
+def load_pairs(path: str, profiles: List[Person]) -> List[Tuple[Person, Person]]:
+    """Load a JSONL pair list of {"person1": name, "person2": name} records"""
+    by_name = {p.name: p for p in profiles}
+    pairs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                pairs.append((by_name[record['person1']], by_name[record['person2']]))
+            except KeyError as e:
+                print(f"Warning: skipping pair on line {line_no}, unknown profile {e}")
+    return pairs
+
+
+def all_pairs(profiles: List[Person]) -> List[Tuple[Person, Person]]:
+    """Every unordered pair of profiles"""
+    return list(itertools.combinations(profiles, 2))
+
+
+class BatchMatcher:
+    def __init__(self, concurrency: int = 8, rate: float = 2.0, top_k: Optional[int] = 25,
+                 cache: Optional[ResponseCache] = None, cache_mode: str = 'use',
+                 api_url: Optional[str] = None, hedge: bool = False, dedupe: bool = True):
+        """Run find_matching_events for many pairs on a bounded thread pool
+
+        All workers share one LLMClient (connection pool, retries and the
+        rate limiter) and one response cache. With dedupe, duplicate and
+        recurring events are collapsed once for the whole batch.
+        """
+        self.concurrency = concurrency
+        self.dedupe = dedupe
+        self.top_k = top_k
+        self.cache = cache
+        self.cache_mode = cache_mode
+        self.rate_limiter = TokenBucket(rate)
+        self.client = LLMClient(
+            api_url or os.getenv('DEEPSEEK_API_URL', DEFAULT_API_URL),
+            os.getenv('DEEPSEEK_API_KEY'),
+            pool_size=concurrency,
+            rate_limiter=self.rate_limiter,
+            hedge=hedge
+        )
+
+    def _match_pair(self, events: List[Dict], person1: Person, person2: Person) -> Dict:
+        matcher = EventMatcher(
+            top_k=self.top_k,
+            cache=self.cache,
+            cache_mode=self.cache_mode,
+            client=self.client,
+            output_file=None
+        )
+        start = time.perf_counter()
+        matches = matcher.find_matching_events(events, person1, person2)
+        stats = matcher.last_prerank_stats
+        return {
+            'person1': person1.name,
+            'person2': person2.name,
+            'matches': matches,
+            'ok': bool(matches),
+            'elapsed': round(time.perf_counter() - start, 3),
+            'prerank': asdict(stats) if stats else None
+        }
+
+    def run(self, events: List[Dict], pairs: List[Tuple[Person, Person]], output_path: str) -> Dict:
+        """Match every pair, appending one JSON line per pair to output_path as it finishes"""
+        start = time.perf_counter()
+        succeeded = failed = 0
+        if self.dedupe:
+            events, deduper = dedupe_events(events)
+            deduper.print_report()
+        with open(output_path, 'a', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._match_pair, events, p1, p2): (p1, p2) for p1, p2 in pairs}
+            for future in as_completed(futures):
+                p1, p2 = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'person1': p1.name, 'person2': p2.name, 'matches': '', 'ok': False,
+                              'error': str(e)}
+                if result['ok']:
+                    succeeded += 1
+                else:
+                    failed += 1
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                out.flush()
+                print(f"[{succeeded + failed}/{len(pairs)}] {p1.name} + {p2.name}: "
+                      f"{'ok' if result['ok'] else 'failed'}")
+
+        summary = {
+            'pairs': len(pairs),
+            'succeeded': succeeded,
+            'failed': failed,
+            'elapsed': round(time.perf_counter() - start, 3),
+            'throttled': self.rate_limiter.throttle_count
+        }
+        print(f"\nMatched {succeeded}/{len(pairs)} pairs in {summary['elapsed']}s "
+              f"({summary['throttled']} rate-limit responses)")
+        self.client.print_stats()
+        return summary
+
+
+def main():
+    """Main function to run batch matching over a cohort"""
+    parser = argparse.ArgumentParser(description="Match every pair in a cohort of profiles to events")
+    parser.add_argument('profiles', help="Directory of profile JSON files, or a JSONL file of profiles")
+    parser.add_argument('--pairs', help="JSONL file of {\"person1\": name, \"person2\": name}; default is all pairs")
+    parser.add_argument('--events', default='all_luma_events.json')
+    parser.add_argument('--output', default='batch_matches.jsonl')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=2.0, help="Max LLM requests per second")
+    parser.add_argument('--top-k', type=int, default=25)
+    parser.add_argument('--hedge', action='store_true', help="Hedge requests slower than the observed p95")
+    parser.add_argument('--cache-path', default='llm_cache.sqlite3')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--refresh-cache', action='store_true')
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="Keep duplicate and recurring events instead of collapsing them before matching")
+    args = parser.parse_args()
+
+    try:
+        profiles = load_profiles(args.profiles)
+        with open(args.events, 'r', encoding='utf-8') as f:
+            events = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: {str(e)}")
+        return
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in input: {str(e)}")
+        return
+
+    pairs = load_pairs(args.pairs, profiles) if args.pairs else all_pairs(profiles)
+    print(f"Loaded {len(profiles)} profiles, matching {len(pairs)} pairs against {len(events)} events")
+
+    cache_mode = 'bypass' if args.no_cache else 'refresh' if args.refresh_cache else 'use'
+    cache = None if args.no_cache else ResponseCache(args.cache_path)
+    batch = BatchMatcher(concurrency=args.concurrency, rate=args.rate, top_k=args.top_k or None,
+                         cache=cache, cache_mode=cache_mode, hedge=args.hedge, dedupe=not args.no_dedupe)
+    batch.run(events, pairs, args.output)
+    if cache:
+        cache.print_stats()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Beginner Classifier
+Decides whether a hackathon is beginner-friendly with one precompiled
+keyword regex per field, and reports which keywords fired
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+BEGINNER_KEYWORDS = [
+    'beginner', 'newbie', 'first time', 'starter', 'intro', 'learn',
+    'student', 'education', 'bootcamp', 'workshop', 'tutorial',
+    'getting started', 'new to', 'novice', 'entry level', 'basics'
+]
+
+# Only checked in the title and description, not in tags
+STUDENT_INDICATORS = ['student', 'university', 'college', 'school', 'campus']
+
+def _keyword_regex(keywords: List[str]) -> re.Pattern:
+    """Alternation anchored at a word start; suffixes are allowed so 'students' and 'workshops' match"""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in ordered) + ')')
+
+_TEXT_RE = _keyword_regex(BEGINNER_KEYWORDS + STUDENT_INDICATORS)
+_TAG_RE = _keyword_regex(BEGINNER_KEYWORDS)
+
+@dataclass
+class Classification:
+    beginner_friendly: bool
+    signals: List[Tuple[str, str]] = field(default_factory=list)  # (field, keyword) pairs that fired
+
+    def __bool__(self) -> bool:
+        return self.beginner_friendly
+
+def _text(title: str, description: str) -> str:
+    """Title and description as one lowercase string, the way every check scans them"""
+    return f"{title or ''} {description or ''}".lower()
+
+def classify(title: str, description: str, tags: List[str]) -> Classification:
+    """Every beginner signal in a hackathon's title, description and tags
+
+    Title and description are scanned joined, like is_beginner_friendly
+    does, so a phrase spanning the two is reported under the title.
+    """
+    title_end = len(title or '')
+    signals = [('title' if m.start() < title_end else 'description', m.group())
+               for m in _TEXT_RE.finditer(_text(title, description))]
+    signals.extend(('tags', m.group()) for m in _TAG_RE.finditer('\n'.join(tags or []).lower()))
+    return Classification(bool(signals), signals)
+
+def is_beginner_friendly(title: str, description: str, tags: List[str]) -> bool:
+    """Whether any beginner signal fires, stopping at the first one"""
+    return bool(_TEXT_RE.search(_text(title, description))
+                or _TAG_RE.search('\n'.join(tags or []).lower()))
+
+def classify_many(records: Iterable[Dict]) -> List[Classification]:
+    """Classify hackathon dicts (title, description, tags) in bulk"""
+    return [classify(r.get('title', ''), r.get('description', ''), r.get('tags') or []) for r in records]
+
+def beginner_flags(records: Iterable[Dict]) -> List[bool]:
+    """Just the beginner-friendly flag for each hackathon dict, for large archives"""
+    text_search, tag_search = _TEXT_RE.search, _TAG_RE.search
+    return [bool(text_search(_text(r.get('title'), r.get('description')))
+                 or tag_search('\n'.join(r.get('tags') or []).lower()))
+            for r in records]
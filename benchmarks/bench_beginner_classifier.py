@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the beginner classifier
+Classifies a synthetic archive of hackathon records with the original
+keyword loops and with the compiled regex, and reports throughput and how
+often the two disagree
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from beginner_classifier import beginner_flags, classify_many  # noqa: E402
+
+WORDS = [
+    'build', 'ship', 'hack', 'weekend', 'global', 'online', 'prizes', 'teams', 'ai', 'climate', 'health',
+    'fintech', 'open', 'source', 'developers', 'designers', 'challenge', 'create', 'future', 'apps',
+    'beginners', 'students', 'learning', 'workshops', 'university', 'introducing', 'preschool', 'campus',
+    'unlearn', 'education', 'novice', 'starter', 'tutorial', 'newbie', 'schooling', 'jumpstarter'
+]
+TAGS = [
+    'Beginner Friendly', 'Machine Learning/AI', 'Open Ended', 'Health', 'Education', 'Gaming', 'Fintech',
+    'Blockchain', 'Social Good', 'Low/No Code', 'Mobile', 'Web', 'IoT', 'Cybersecurity', 'Design'
+]
+
+def legacy_is_beginner_friendly(title: str, description: str, tags: List[str]) -> bool:
+    """DevpostScraper.is_beginner_friendly before the compiled classifier"""
+    beginner_keywords = [
+        'beginner', 'newbie', 'first time', 'starter', 'intro', 'learn',
+        'student', 'education', 'bootcamp', 'workshop', 'tutorial',
+        'getting started', 'new to', 'novice', 'entry level', 'basics'
+    ]
+    text_to_check = f"{title} {description}".lower()
+    for keyword in beginner_keywords:
+        if keyword in text_to_check:
+            return True
+    for tag in tags:
+        if any(keyword in tag.lower() for keyword in beginner_keywords):
+            return True
+    student_indicators = ['student', 'university', 'college', 'school', 'campus']
+    for indicator in student_indicators:
+        if indicator in text_to_check:
+            return True
+    return False
+
+def synthetic_records(n: int, rng: random.Random):
+    # Mostly neutral vocabulary so the legacy loops can't exit early on every record
+    neutral = WORDS[:20]
+    return [{
+        'title': ' '.join(rng.choice(neutral if rng.random() < 0.9 else WORDS) for _ in range(rng.randint(2, 6))).title(),
+        'description': ' '.join(rng.choice(neutral if rng.random() < 0.95 else WORDS) for _ in range(rng.randint(10, 40))),
+        'tags': rng.sample(TAGS[2:] if rng.random() < 0.8 else TAGS, rng.randint(1, 4))
+    } for _ in range(n)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled beginner classifier")
+    parser.add_argument('--records', type=int, default=200_000)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records, random.Random(42))
+
+    start = time.perf_counter()
+    legacy = [legacy_is_beginner_friendly(r['title'], r['description'], r['tags']) for r in records]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flags = beginner_flags(records)
+    flags_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classified = classify_many(records)
+    classify_time = time.perf_counter() - start
+
+    disagreements = sum(a != b for a, b in zip(legacy, flags))
+    print(f"{args.records:,} records, {sum(flags):,} beginner-friendly")
+    print(f"Legacy keyword loops:  {legacy_time:6.2f}s ({args.records / legacy_time:,.0f} records/s)")
+    print(f"beginner_flags:        {flags_time:6.2f}s ({args.records / flags_time:,.0f} records/s, "
+          f"{legacy_time / flags_time:.1f}x)")
+    print(f"classify_many:         {classify_time:6.2f}s ({args.records / classify_time:,.0f} records/s, "
+          f"with signals)")
+    print(f"Disagreements with legacy: {disagreements:,} ({disagreements / args.records:.1%}), "
+          f"from word-start matching (e.g. 'preschool', 'unlearn', 'jumpstarter' no longer fire)")
+    assert all(bool(c) == f for c, f in zip(classified, flags))
+
+if __name__ == "__main__":
+    main()
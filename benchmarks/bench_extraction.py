@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark for HTML extraction backends
+Checks that every backend returns identical dicts on the saved Luma and
+Devpost page fixtures, then times each one on the fixtures repeated to the
+size of a large "View All" page
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from html_extract import available_backends, extract_devpost_cards, extract_luma_events  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def scale_page(html: str, open_tag: str, close_marker: str, copies: int) -> str:
+    """Repeat the card list between the first open_tag and close_marker copies times"""
+    start = html.index(open_tag)
+    end = html.index(close_marker, start)
+    return html[:start] + html[start:end] * copies + html[end:]
+
+def quietly(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+def best_time(fn, args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        quietly(fn, *args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML extraction backends on saved pages")
+    parser.add_argument('--copies', type=int, default=20, help="Times to repeat each fixture's cards")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    pages = {
+        'luma': (extract_luma_events,
+                 load_fixture('luma_nyc.html'), '<div class="timeline-section">', '<script id="__NEXT_DATA__"',
+                 lambda html: (html, 'New York')),
+        'devpost': (extract_devpost_cards,
+                    load_fixture('devpost_hackathons.html'), '<div class="challenge-listing">', '</div></div></body>',
+                    lambda html: (html,)),
+    }
+
+    failed = False
+    for name, (extract, html, open_tag, close_marker, make_args) in pages.items():
+        results = {backend: quietly(extract, *make_args(html), backend) for backend in backends}
+        reference = results['bs4']
+        mismatched = [backend for backend, result in results.items() if result != reference]
+        for backend in mismatched:
+            print(f"FAIL: {name} {backend} differs from bs4 ({len(results[backend])} vs {len(reference)} cards)")
+        failed = failed or bool(mismatched)
+        print(f"{name}: {len(reference)} cards, backends agree: {not mismatched}")
+
+        big = scale_page(html, open_tag, close_marker, args.copies)
+        cards = len(reference) * args.copies
+        timings = {backend: best_time(extract, make_args(big) + (backend,), args.repeat) for backend in backends}
+        for backend, seconds in timings.items():
+            speedup = timings['bs4'] / seconds
+            print(f"  {backend:5s} {cards} cards ({len(big) / 1024:.0f} KB): {seconds * 1000:8.1f} ms "
+                  f"({cards / seconds:,.0f} cards/s, {speedup:.1f}x)")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark for LocalScorer
+Scores a synthetic cohort against a synthetic catalog and checks that the
+person-event affinity matrix for 1M pairs is computed well under a second
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from event_matcher import LocalScorer, Person  # noqa: E402
+
+INTERESTS = [
+    'technology', 'startup networking', 'artificial intelligence', 'hiking', 'hackathons',
+    'photography', 'food', 'food festivals', 'game nights', 'coffee', 'drawing', 'music',
+    'entrepreneurship', 'ultimate frisbee', 'open mic nights', 'pop-up markets', 'bowling',
+    'cultural festivals', 'nature walks', 'running', 'yoga', 'pickleball', 'design',
+    'printmaking', 'ceramics', 'reading', 'climate', 'pride', 'concerts', 'matcha'
+]
+TITLE_WORDS = [
+    'Founders', 'Run', 'Coffee', 'AI', 'Design', 'Workshop', 'Mixer', 'Photography', 'Networking',
+    'Pickleball', 'Tech', 'Drawing', 'Party', 'Walk', 'Market', 'Music', 'Concert', 'Picnic',
+    'Hackathon', 'Startup', 'Pitch', 'Printmaking', 'Matcha', 'Yoga', 'Club', 'Festival', 'Night'
+]
+
+def synthetic_people(n: int, rng: random.Random):
+    return [Person(name=f"Person {i}", interests=rng.sample(INTERESTS, rng.randint(5, 15)), location='New York, NY')
+            for i in range(n)]
+
+def synthetic_events(n: int, rng: random.Random):
+    return [{
+        'title': ' '.join(rng.sample(TITLE_WORDS, rng.randint(3, 7))),
+        'organizers': f"By {rng.choice(['Anna', 'Jordan', 'Kevin', 'Haley'])} {rng.choice(TITLE_WORDS)}",
+        'location': rng.choice(['McCarren Park', 'Chelsea Market', '115 Bowery', 'Ramp']),
+        'city': 'New York',
+        'date': '6:00 PM',
+        'status': '',
+        'attendees': '',
+        'link': f"https://lu.ma/synthetic-{i}",
+        'description': ''
+    } for i in range(n)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized local scorer")
+    parser.add_argument('--people', type=int, default=1000)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    people = synthetic_people(args.people, rng)
+    events = synthetic_events(args.events, rng)
+
+    start = time.perf_counter()
+    scorer = LocalScorer(people)
+    build_people = time.perf_counter() - start
+
+    start = time.perf_counter()
+    event_matrix = scorer.event_matrix(events)
+    build_events = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        affinities = scorer.affinities(event_matrix)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    start = time.perf_counter()
+    combined = scorer.combine(affinities[0], affinities[1:])
+    pair_scoring = time.perf_counter() - start
+
+    pairs = args.people * args.events
+    print(f"Vocabulary: {len(scorer.columns)} columns")
+    print(f"People matrix build ({args.people} people): {build_people * 1000:.1f} ms")
+    print(f"Event matrix build ({args.events} events): {build_events * 1000:.1f} ms")
+    print(f"Affinities for {pairs:,} person-event pairs: {best * 1000:.2f} ms "
+          f"({pairs / best / 1e6:.1f}M pairs/s)")
+    print(f"Pair scores for {combined.shape[0]:,} pairs x {args.events} events: {pair_scoring * 1000:.2f} ms")
+    if pairs >= 1_000_000 and best >= 1.0:
+        print("FAIL: affinity scoring took a second or more")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
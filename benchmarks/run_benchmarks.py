@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite
+Times page parsing, location resolution, beginner classification and prompt
+building on the saved fixtures and on synthetic catalogs scaled from
+all_luma_events.json, reporting throughput, p50/p99 latency and peak memory,
+and saves the results as a baseline that later runs are compared against
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from beginner_classifier import is_beginner_friendly  # noqa: E402
+from event_matcher import EventMatcher, Person  # noqa: E402
+from html_extract import DEFAULT_BACKEND, extract_devpost_cards, extract_luma_events  # noqa: E402
+from location_resolver import CityRegistry  # noqa: E402
+from luma_scraper import parse_next_data_events  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, 'fixtures')
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+CATALOG_SCALES = (10, 100, 1000)
+PAGE_SCALES = (1, 10)
+
+# Person locations as people actually type them, including ones that resolve to Unknown
+LOCATION_SAMPLES = [
+    'San Francisco, CA', 'SF', 'Palo Alto, California', 'Bay Area', 'Los Angeles, CA', 'Santa Monica, CA',
+    'New York, NY', 'Brooklyn, New York', 'NYC', 'Manhattan', 'Toronto, ON', 'North York, Ontario',
+    'Austin, TX', 'Seattle, WA', 'Remote', 'Oakland, CA', 'Jersey City, NJ', 'Mississauga, ON'
+]
+
+@dataclass
+class Case:
+    name: str
+    scale: int
+    fn: Callable[[Any], Any]
+    inputs: List[Any]            # one timed call per input, per pass
+    items_per_call: int = 1
+    reset: Optional[Callable[[], None]] = None  # run before every pass, untimed
+
+@dataclass
+class Result:
+    name: str
+    scale: int
+    calls: int
+    items: int
+    throughput: float            # items per second over all passes
+    p50_ms: float
+    p99_ms: float
+    peak_kb: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.scale}x"
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def scale_page(html: str, open_tag: str, close_marker: str, copies: int) -> str:
+    """Repeat the card list between the first open_tag and close_marker copies times"""
+    start = html.index(open_tag)
+    end = html.index(close_marker, start)
+    return html[:start] + html[start:end] * copies + html[end:]
+
+def synthetic_catalog(seed_events: List[Dict], scale: int, rng: random.Random) -> List[Dict]:
+    """scale copies of the saved catalog, with unique links and shuffled title words"""
+    catalog = []
+    for copy_index in range(scale):
+        for i, event in enumerate(seed_events):
+            event = dict(event)
+            words = event['title'].split()
+            rng.shuffle(words)
+            event['title'] = ' '.join(words)
+            event['link'] = f"{event['link']}-{copy_index}-{i}"
+            catalog.append(event)
+    return catalog
+
+def synthetic_hackathons(seed_cards: List[Dict], scale: int, rng: random.Random) -> List[Dict]:
+    hackathons = []
+    for copy_index in range(scale):
+        for card in seed_cards:
+            card = copy.deepcopy(card)
+            card['tags'] = rng.sample(card['tags'], len(card['tags']))
+            card['url'] = f"{card['url']}?copy={copy_index}"
+            hackathons.append(card)
+    return hackathons
+
+def quietly(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def run(arg):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(arg)
+    return run
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def build_cases(catalog_scales: List[int], page_scales: List[int], repeat: int) -> List[Case]:
+    rng = random.Random(42)
+    with open(os.path.join(ROOT, 'all_luma_events.json'), 'r', encoding='utf-8') as f:
+        seed_events = json.load(f)
+    luma_html = load_fixture('luma_nyc.html')
+    devpost_html = load_fixture('devpost_hackathons.html')
+    seed_cards = quietly(extract_devpost_cards)(devpost_html)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        matcher = EventMatcher(output_file=None)
+    with open(os.path.join(ROOT, 'intern1.json'), 'r') as f1, open(os.path.join(ROOT, 'intern2.json'), 'r') as f2:
+        person1, person2 = Person.from_json(json.load(f1)), Person.from_json(json.load(f2))
+
+    cases = []
+    # Each timed call parses a whole page, so the same page is parsed repeat times per pass
+    for scale in page_scales:
+        page = scale_page(luma_html, '<div class="timeline-section">', '<script id="__NEXT_DATA__"', scale)
+        cards = len(quietly(lambda html: extract_luma_events(html, 'New York'))(page))
+        cases.append(Case('luma_extract', scale, quietly(lambda html: extract_luma_events(html, 'New York')),
+                          [page] * repeat, cards))
+        page = scale_page(devpost_html, '<div class="challenge-listing">', '</div></div></body>', scale)
+        cases.append(Case('devpost_extract', scale, quietly(extract_devpost_cards), [page] * repeat,
+                          len(seed_cards) * scale))
+    # The __NEXT_DATA__ blob is what scrape_events_for_location parses on the HTTP path
+    cases.append(Case('luma_next_data', 1, lambda html: parse_next_data_events(html, 'New York'),
+                      [luma_html] * repeat, len(parse_next_data_events(luma_html, 'New York'))))
+
+    for scale in catalog_scales:
+        catalog = synthetic_catalog(seed_events, scale, rng)
+        locations = [rng.choice(LOCATION_SAMPLES) + ('' if rng.random() < 0.7 else f" {rng.randint(10000, 99999)}")
+                     for _ in range(len(catalog))]
+        registry = CityRegistry.from_file()
+        # The resolver's LRU cache is cleared before every pass, so repeats don't measure a warm cache
+        cases.append(Case('resolve_location', scale, registry.resolve, locations,
+                          reset=registry._resolve_cached.cache_clear))
+
+        hackathons = synthetic_hackathons(seed_cards, scale, rng)
+        cases.append(Case('beginner_classify', scale,
+                          lambda h: is_beginner_friendly(h['title'], h['description'], h['tags']), hackathons))
+
+        cases.append(Case('prompt_build', scale, lambda events: matcher.build_prompt(events, person1, person2),
+                          [catalog] * max(3, repeat // scale), len(catalog)))
+        cases.append(Case('prompt_build_verbose', scale,
+                          lambda events: matcher.build_prompt(events, person1, person2, compact=False),
+                          [catalog] * max(3, repeat // scale), len(catalog)))
+    return cases
+
+def run_case(case: Case, passes: int) -> Result:
+    fn = case.fn
+    samples = []
+    total = 0.0
+    for _ in range(passes):
+        if case.reset:
+            case.reset()
+        for arg in case.inputs:
+            start = time.perf_counter()
+            fn(arg)
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed)
+            total += elapsed
+
+    # Peak memory comes from one extra, untimed pass, since tracing slows everything down
+    if case.reset:
+        case.reset()
+    tracemalloc.start()
+    for arg in case.inputs:
+        fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    items = len(samples) * case.items_per_call
+    return Result(case.name, case.scale, len(samples), items, items / total if total else 0.0,
+                  percentile(samples, 0.5) * 1000, percentile(samples, 0.99) * 1000, peak / 1024)
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINES, f"{name}.json")
+
+def save_baseline(name: str, results: List[Result]):
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'extraction_backend': DEFAULT_BACKEND,
+            'results': {r.key: asdict(r) for r in results}
+        }, f, indent=2)
+    print(f"\nSaved baseline to {path}")
+
+def compare(name: str, results: List[Result], threshold: float) -> List[str]:
+    """Print the change against a saved baseline; returns the keys that regressed past threshold"""
+    path = baseline_path(name)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"\nError loading baseline {path}: {str(e)}")
+        return []
+
+    print(f"\nCompared with {path} (regression threshold {threshold:.0%}):")
+    regressions = []
+    for r in results:
+        old = baseline.get(r.key)
+        if not old:
+            print(f"  {r.key:26s} new")
+            continue
+        throughput_change = r.throughput / old['throughput'] - 1 if old['throughput'] else 0.0
+        p99_change = r.p99_ms / old['p99_ms'] - 1 if old['p99_ms'] else 0.0
+        memory_change = r.peak_kb / old['peak_kb'] - 1 if old['peak_kb'] else 0.0
+        regressed = throughput_change < -threshold or p99_change > threshold or memory_change > threshold
+        if regressed:
+            regressions.append(r.key)
+        print(f"  {r.key:26s} throughput {throughput_change:+7.1%}  p99 {p99_change:+7.1%}  "
+              f"memory {memory_change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--scales', default=','.join(map(str, CATALOG_SCALES)),
+                        help="Synthetic catalog sizes, as multiples of all_luma_events.json")
+    parser.add_argument('--page-scales', default=','.join(map(str, PAGE_SCALES)),
+                        help="Times to repeat the cards in each HTML fixture")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed calls per pass for whole-page cases")
+    parser.add_argument('--passes', type=int, default=3)
+    parser.add_argument('--only', help="Only run cases whose name contains this")
+    parser.add_argument('--save', metavar='NAME', help="Save results as benchmarks/baselines/NAME.json (or a .json path)")
+    parser.add_argument('--compare', metavar='NAME', help="Compare results with a saved baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Relative change that counts as a regression")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    page_scales = [int(s) for s in args.page_scales.split(',') if s]
+    cases = build_cases(scales, page_scales, args.repeat)
+    if args.only:
+        cases = [case for case in cases if args.only in case.name]
+
+    print(f"{'case':26s} {'calls':>7s} {'items/s':>12s} {'p50 ms':>9s} {'p99 ms':>9s} {'peak KB':>10s}")
+    results = []
+    for case in cases:
+        result = run_case(case, args.passes)
+        results.append(result)
+        print(f"{result.key:26s} {result.calls:7d} {result.throughput:12,.0f} {result.p50_ms:9.3f} "
+              f"{result.p99_ms:9.3f} {result.peak_kb:10,.0f}")
+
+    regressions = compare(args.compare, results, args.threshold) if args.compare else []
+    if args.save:
+        save_baseline(args.save, results)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Browser Pool
+Shared pool of warm headless Chrome sessions for the scrapers: the driver
+binary is resolved once and cached, sessions are handed out through a
+context manager, health-checked on checkout and recycled after N pages
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Known working chromedriver for the shared pool; override with CHROMEDRIVER_VERSION
+PINNED_DRIVER_VERSION = '137.0.7151.104'
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'avida', 'chromedriver.json')
+
+def _read_path_cache() -> Dict[str, str]:
+    try:
+        with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_path_cache(cache: Dict[str, str]):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Note: could not cache the chromedriver path: {str(e)}")
+
+@lru_cache(maxsize=None)
+def resolve_driver_path(driver_version: Optional[str] = None) -> str:
+    """Path to a chromedriver binary, resolved once per process and remembered across runs
+
+    CHROMEDRIVER_PATH overrides everything. Otherwise a path cached on disk
+    from an earlier run is reused while the file still exists, and only then
+    is webdriver-manager asked to resolve (and maybe download) the driver.
+    """
+    override = os.getenv('CHROMEDRIVER_PATH')
+    if override:
+        return override
+    key = driver_version or 'latest'
+    cache = _read_path_cache()
+    cached = cache.get(key)
+    if cached and os.path.exists(cached):
+        return cached
+    start = time.perf_counter()
+    path = ChromeDriverManager(driver_version=driver_version).install()
+    print(f"Resolved chromedriver {key} in {time.perf_counter() - start:.2f}s")
+    cache[key] = path
+    _write_path_cache(cache)
+    return path
+
+@dataclass
+class BrowserSession:
+    driver: object
+    started: float
+    pages: int = 0
+
+@dataclass
+class PoolStats:
+    cold_starts: List[float] = field(default_factory=list)
+    warm_checkouts: List[float] = field(default_factory=list)
+    recycled: int = 0
+    unhealthy: int = 0
+
+class BrowserPool:
+    def __init__(self, size: int = 2, max_pages: int = 20, driver_version: Optional[str] = None,
+                 user_agent: Optional[str] = None):
+        """Up to size headless Chrome sessions, each retired after max_pages checkouts
+
+        Sessions are started lazily (or ahead of time with warm_up) and are
+        shared by whichever scraper checks one out with session().
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_version = driver_version
+        self.user_agent = user_agent
+        self.stats = PoolStats()
+        self._idle: List[BrowserSession] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _options(self):
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        if self.user_agent:
+            chrome_options.add_argument(f'--user-agent={self.user_agent}')
+        return chrome_options
+
+    def _start(self) -> BrowserSession:
+        start = time.perf_counter()
+        try:
+            service = Service(resolve_driver_path(self.driver_version))
+            driver = webdriver.Chrome(service=service, options=self._options())
+        except Exception as e:
+            print(f"Error initializing Chrome driver: {str(e)}")
+            raise
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self.stats.cold_starts.append(elapsed)
+        print(f"Chrome driver initialized successfully in {elapsed:.2f}s")
+        return BrowserSession(driver=driver, started=time.time())
+
+    @staticmethod
+    def _healthy(session: BrowserSession) -> bool:
+        try:
+            session.driver.execute_script('return 1')
+            return bool(session.driver.window_handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(session: BrowserSession):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            print(f"Error closing Chrome driver: {str(e)}")
+
+    def warm_up(self, count: Optional[int] = None):
+        """Start sessions now, in parallel, so the first scrapes don't pay for Chrome startup"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            count = min(count if count is not None else self.size, self.size - self._live)
+            self._live += max(0, count)
+        if count <= 0:
+            return
+        started: List[BrowserSession] = []
+        errors = []
+
+        def start_one():
+            try:
+                started.append(self._start())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=start_one) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with self._cond:
+            self._live -= len(errors)
+            closed = self._closed
+            if closed:
+                # The pool was closed while these were starting; nobody will return them
+                self._live -= len(started)
+            else:
+                self._idle.extend(started)
+            self._cond.notify_all()
+        if closed:
+            for session in started:
+                self._quit(session)
+
+    def _acquire(self) -> Tuple[BrowserSession, bool]:
+        """A healthy session, and whether it had to be started for this checkout"""
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    session = self._idle.pop()
+                elif self._live < self.size:
+                    self._live += 1
+                    session = None
+                else:
+                    self._cond.wait()
+                    continue
+            if session is None:
+                try:
+                    return self._start(), True
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+            if self._healthy(session):
+                return session, False
+            # A crashed or hung browser is replaced rather than handed out
+            self._quit(session)
+            with self._cond:
+                self.stats.unhealthy += 1
+                self._live -= 1
+
+    def _release(self, session: BrowserSession):
+        session.pages += 1
+        retire = session.pages >= self.max_pages
+        with self._cond:
+            if retire or self._closed:
+                self._live -= 1
+                if retire:
+                    self.stats.recycled += 1
+            else:
+                self._idle.append(session)
+            self._cond.notify()
+        if retire or self._closed:
+            self._quit(session)
+
+    @contextmanager
+    def session(self):
+        """Check out a Chrome driver for one page; it goes back to the pool afterwards"""
+        start = time.perf_counter()
+        session, cold = self._acquire()
+        if not cold:
+            with self._cond:
+                self.stats.warm_checkouts.append(time.perf_counter() - start)
+        try:
+            yield session.driver
+        finally:
+            self._release(session)
+
+    def close(self):
+        """Quit every idle session; sessions still checked out are quit when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._quit(session)
+
+    def print_stats(self):
+        s = self.stats
+        if not s.cold_starts and not s.warm_checkouts:
+            return
+        cold = f"{len(s.cold_starts)} cold starts"
+        if s.cold_starts:
+            cold += f" (avg {sum(s.cold_starts) / len(s.cold_starts):.2f}s)"
+        warm = f"{len(s.warm_checkouts)} warm checkouts"
+        if s.warm_checkouts:
+            warm += f" (avg {sum(s.warm_checkouts) / len(s.warm_checkouts) * 1000:.0f}ms)"
+        print(f"\nBrowser pool: {cold}, {warm}, {s.recycled} recycled, {s.unhealthy} replaced after a failed health check")
+
+    def __enter__(self) -> 'BrowserPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_lock = threading.Lock()
+
+def shared_pool() -> BrowserPool:
+    """The process-wide pool both scrapers use by default, closed automatically at exit"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                size=int(os.getenv('BROWSER_POOL_SIZE', '2')),
+                max_pages=int(os.getenv('BROWSER_POOL_MAX_PAGES', '20')),
+                driver_version=os.getenv('CHROMEDRIVER_VERSION', PINNED_DRIVER_VERSION),
+                user_agent=DEFAULT_USER_AGENT
+            )
+            atexit.register(_shared_pool.close)
+        return _shared_pool
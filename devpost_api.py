@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Devpost API Client
+Pages through Devpost's hackathon listing JSON endpoint with a bounded pool
+of concurrent requests and maps the records into the scraper's Hackathon
+dict shape, so the full catalog is fetched without driving a browser
+"""
+
+import html
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEVPOST_API_URL = 'https://devpost.com/api/hackathons'
+
+# Listing states as the Devpost API reports them, mapped onto the status text
+# the browser scraper produces, so filter_open_hackathons works on both
+OPEN_STATE_STATUS = {
+    'open': 'Open for submissions',
+    'upcoming': 'Upcoming',
+    'ended': 'Closed',
+}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def _strip_html(text: Optional[str]) -> str:
+    return html.unescape(_TAG_RE.sub('', text or '')).strip()
+
+def record_to_hackathon(record: Dict[str, Any],
+                        beginner_check: Callable[[str, str, List[str]], bool]) -> Dict[str, Any]:
+    """Map one API listing record onto the Hackathon dict fields"""
+    title = (record.get('title') or '').strip()
+    tags = [theme['name'] for theme in record.get('themes') or [] if theme.get('name')]
+    location = (record.get('displayed_location') or {}).get('location') or 'Online'
+    # The listing API carries no description; the organizer is the closest summary it has
+    organization = record.get('organization_name')
+    description = f"Hosted by {organization}" if organization else ""
+    state = record.get('open_state') or ''
+    return {
+        'title': title,
+        'url': record.get('url') or '',
+        'date': record.get('submission_period_dates') or '',
+        'prize': _strip_html(record.get('prize_amount')),
+        'description': description,
+        'tags': tags,
+        'is_beginner_friendly': beginner_check(title, description, tags),
+        'location': location,
+        'status': OPEN_STATE_STATUS.get(state, state.title() or 'Unknown')
+    }
+
+class DevpostAPIClient:
+    def __init__(self, base_url: str = DEVPOST_API_URL, max_workers: int = 8, timeout: float = 15.0,
+                 max_retries: int = 2, params: Optional[Dict[str, Any]] = None):
+        """Client for the listing endpoint (base_url?page=N)
+
+        params are sent with every page request, e.g.
+        {'status[]': ['open', 'upcoming']} to skip ended hackathons. Pages
+        that still fail after max_retries are listed in failed_pages.
+        """
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.params = params or {}
+        self.failed_pages: List[int] = []
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
+            'Accept': 'application/json'
+        })
+
+    def fetch_page(self, page: int) -> Dict[str, Any]:
+        """One page of the listing, retrying transient failures"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(self.base_url, params={**self.params, 'page': page},
+                                            timeout=self.timeout)
+                response.raise_for_status()
+                return response.json()
+            except (requests.RequestException, ValueError) as e:
+                if attempt == self.max_retries:
+                    print(f"Error fetching Devpost page {page}: {str(e)}")
+                    with self._lock:
+                        self.failed_pages.append(page)
+                    return {}
+                time.sleep(0.5 * 2 ** attempt)
+        return {}
+
+    def _pages(self, max_pages: Optional[int]) -> Iterator[List[Dict[str, Any]]]:
+        first = self.fetch_page(1)
+        records = first.get('hackathons') or []
+        meta = first.get('meta') or {}
+        if not records:
+            return
+        yield records
+
+        total, per_page = meta.get('total_count'), meta.get('per_page') or len(records)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if total:
+                last_page = math.ceil(total / per_page)
+                if max_pages:
+                    last_page = min(last_page, max_pages)
+                for page in pool.map(self.fetch_page, range(2, last_page + 1)):
+                    yield page.get('hackathons') or []
+            else:
+                next_page = 2
+                while not max_pages or next_page <= max_pages:
+                    batch = range(next_page, next_page + self.max_workers)
+                    if max_pages:
+                        batch = range(next_page, min(next_page + self.max_workers, max_pages + 1))
+                    pages = [page.get('hackathons') or [] for page in pool.map(self.fetch_page, batch)]
+                    yield from pages
+                    # A page that failed to load isn't the end of the listing, but a batch
+                    # that failed entirely means the endpoint is down
+                    failed = [page in self.failed_pages for page in batch]
+                    if all(failed) or any(not records and not bad for records, bad in zip(pages, failed)):
+                        break
+                    next_page += len(batch)
+
+    def iter_records(self, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Every listing record, in page order and deduplicated by id, as pages arrive
+
+        The first page gives the total count, and the remaining pages are
+        fetched concurrently. Without a total, pages are fetched in batches
+        of max_workers until one comes back empty (or a whole batch fails).
+        A warning names any pages that failed, since the listing is short.
+        """
+        self.failed_pages = []
+        seen = set()
+        for page in self._pages(max_pages):
+            for record in page:
+                key = record.get('id') or record.get('url')
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield record
+        if self.failed_pages:
+            print(f"Warning: Devpost pages {sorted(self.failed_pages)} could not be fetched; "
+                  f"the listing is incomplete")
+
+    def fetch_all(self, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_records(max_pages))
+
+    def iter_hackathons(self, beginner_check: Callable[[str, str, List[str]], bool],
+                        max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """The catalog as Hackathon dicts, yielded page by page"""
+        start = time.perf_counter()
+        count = 0
+        for record in self.iter_records(max_pages):
+            count += 1
+            yield record_to_hackathon(record, beginner_check)
+        print(f"Fetched {count} hackathons from the Devpost API in {time.perf_counter() - start:.2f}s")
+
+    def fetch_hackathons(self, beginner_check: Callable[[str, str, List[str]], bool],
+                         max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The whole catalog as Hackathon dicts"""
+        return list(self.iter_hackathons(beginner_check, max_pages))
+
+    def close(self):
+        self.session.close()
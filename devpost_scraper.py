@@ -4,21 +4,22 @@ Devpost Hackathon Scraper
 Scrapes hackathons from Devpost and filters for beginner-friendly ones
 """
 
+import argparse
 import json
 import time
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterator, List, Any, Optional
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from browser_pool import BrowserPool, shared_pool
+from beginner_classifier import is_beginner_friendly
+from devpost_api import DEVPOST_API_URL, DevpostAPIClient
+from html_extract import DEFAULT_BACKEND, extract_devpost_cards
+from output_sinks import SINK_FORMATS, ListSink, OutputRouter, open_sink
+from scrape_waits import PhaseTimer, wait_for_count_stable, wait_for_scroll_settled
 import requests
-from datetime import datetime
-import re
 
 @dataclass
 class Hackathon:
@@ -32,203 +33,143 @@ class Hackathon:
     location: str
     status: str
 
+def is_beginner_hackathon(hackathon: Dict[str, Any]) -> bool:
+    return bool(hackathon.get('is_beginner_friendly', False))
+
+def is_open_hackathon(hackathon: Dict[str, Any]) -> bool:
+    return 'closed' not in hackathon.get('status', '').lower()
+
 class DevpostScraper:
-    def __init__(self):
-        """Initialize the scraper with Chrome driver"""
-        try:
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            print("Chrome driver initialized successfully")
-        except Exception as e:
-            print(f"Error initializing Chrome driver: {str(e)}")
-            raise
-    
-    def __del__(self):
-        """Clean up the driver when the object is destroyed"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
-    
+    def __init__(self, extraction_backend: str = DEFAULT_BACKEND, start_browser: bool = True,
+                 pool: Optional[BrowserPool] = None):
+        """Initialize the scraper with a pool of Chrome sessions (the shared pool by default)
+
+        With start_browser=False no browser is started until scrape_hackathons
+        checks one out, so API-only runs never pay for it. The scraper holds
+        nothing else, so there is nothing to close: the shared pool is closed
+        at exit, and a pool passed in belongs to the caller.
+        """
+        self.extraction_backend = extraction_backend
+        self.pool = pool or shared_pool()
+        if start_browser:
+            self.pool.warm_up(1)
+
     def is_beginner_friendly(self, title: str, description: str, tags: List[str]) -> bool:
         """Determine if a hackathon is beginner-friendly based on various indicators"""
-        beginner_keywords = [
-            'beginner', 'newbie', 'first time', 'starter', 'intro', 'learn',
-            'student', 'education', 'bootcamp', 'workshop', 'tutorial',
-            'getting started', 'new to', 'novice', 'entry level', 'basics'
-        ]
-        
-        # Check title and description (case insensitive)
-        text_to_check = f"{title} {description}".lower()
-        for keyword in beginner_keywords:
-            if keyword in text_to_check:
-                return True
-        
-        # Check tags
-        for tag in tags:
-            if any(keyword in tag.lower() for keyword in beginner_keywords):
-                return True
-        
-        # Check for student-specific hackathons
-        student_indicators = ['student', 'university', 'college', 'school', 'campus']
-        for indicator in student_indicators:
-            if indicator in text_to_check:
-                return True
-        
-        return False
+        return is_beginner_friendly(title, description, tags)
     
-    def scrape_hackathons(self) -> List[Dict[str, Any]]:
-        """Scrape hackathons from Devpost"""
+    def scrape_hackathons(self, on_record: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Scrape hackathons from Devpost, passing each to on_record as soon as it is extracted"""
         base_url = "https://devpost.com/hackathons"
         print(f"\nScraping hackathons from {base_url}")
         
+        timer = PhaseTimer('devpost', base_url)
         try:
-            self.driver.get(base_url)
-            time.sleep(5)
-            
-            # Wait for the page to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".challenge-listing"))
-            )
-            
-            # Scroll down to load more hackathons
-            print("Scrolling to load more hackathons...")
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            scroll_attempts = 0
-            max_scrolls = 5
-            
-            while scroll_attempts < max_scrolls:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)
+            acquire_start = time.perf_counter()
+            with self.pool.session() as driver:
+                # Near zero when a warm session was waiting in the pool
+                timer.record('driver_start', time.perf_counter() - acquire_start)
+                with timer.phase('navigate'):
+                    driver.get(base_url)
                 
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-                scroll_attempts += 1
-            
-            # Get page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+                    # Wait for the page to load
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ".challenge-listing"))
+                    )
+                    wait_for_count_stable(driver, ".challenge-listing")
             
-            hackathons = []
+                # Scroll down to load more hackathons
+                print("Scrolling to load more hackathons...")
+                with timer.phase('scroll'):
+                    last_height = driver.execute_script("return document.body.scrollHeight")
+                    scroll_attempts = 0
+                    max_scrolls = 5
+                
+                    while scroll_attempts < max_scrolls:
+                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    
+                        # Returns as soon as the new batch has rendered, or the old height if nothing loaded
+                        new_height = wait_for_scroll_settled(driver, last_height)
+                        if new_height == last_height:
+                            break
+                        last_height = new_height
+                        scroll_attempts += 1
             
-            # Find hackathon cards
-            hackathon_cards = soup.find_all('div', class_='challenge-listing')
-            print(f"Found {len(hackathon_cards)} hackathon cards")
+                # Get page source and extract the challenge cards
+                parse_start = time.perf_counter()
+                page_source = driver.page_source
             
-            for card in hackathon_cards:
-                try:
-                    # Extract title and URL
-                    title_elem = card.find('h6') or card.find('h5') or card.find('a', class_='challenge-link-colorless')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    
-                    # Get hackathon URL
-                    url = ""
-                    link_elem = card.find('a', class_='challenge-link-colorless')
-                    if link_elem:
-                        href = link_elem.get('href', '')
-                        url = f"https://devpost.com{href}" if href.startswith('/') else href
-                    
-                    # Extract date information
-                    date = ""
-                    date_elem = card.find('div', class_='challenge-meta') or card.find('time')
-                    if date_elem:
-                        date = date_elem.get_text(strip=True)
-                    
-                    # Extract prize information
-                    prize = ""
-                    prize_elem = card.find('div', string=re.compile(r'\$')) or card.find(text=re.compile(r'\$'))
-                    if prize_elem:
-                        if hasattr(prize_elem, 'parent'):
-                            prize = prize_elem.parent.get_text(strip=True)
-                        else:
-                            prize = str(prize_elem).strip()
-                    
-                    # Extract description
-                    description = ""
-                    desc_elem = card.find('p') or card.find('div', class_='challenge-description')
-                    if desc_elem:
-                        description = desc_elem.get_text(strip=True)
-                    
-                    # Extract tags
-                    tags = []
-                    tag_elements = card.find_all('span', class_='challenge-tag') or card.find_all('div', class_='tag')
-                    for tag_elem in tag_elements:
-                        tag_text = tag_elem.get_text(strip=True)
-                        if tag_text:
-                            tags.append(tag_text)
-                    
-                    # Extract location (online/offline)
-                    location = "Online"  # Default to online
-                    location_indicators = card.find_all(text=re.compile(r'(online|virtual|remote|in-person|offline)', re.I))
-                    if location_indicators:
-                        location = location_indicators[0].strip()
-                    
-                    # Extract status (open, closed, upcoming)
-                    status = "Unknown"
-                    status_elem = card.find('div', class_='challenge-status') or card.find('span', class_='badge')
-                    if status_elem:
-                        status = status_elem.get_text(strip=True)
-                    
+                hackathons = []
+                for card in extract_devpost_cards(page_source, self.extraction_backend):
+                    title = card['title']
+                    date = card['date']
+                    status = card['status']
+                
                     # Check if submission date has passed
-                    current_date = datetime.now()
                     if "submissions close" in date.lower():
                         status = "Open for submissions"
                     elif any(word in date.lower() for word in ['closed', 'ended', 'finished']):
                         status = "Closed"
-                    
+                
                     # Determine if beginner-friendly
-                    is_beginner_friendly = self.is_beginner_friendly(title, description, tags)
-                    
+                    is_beginner_friendly = self.is_beginner_friendly(title, card['description'], card['tags'])
+                
                     hackathon = {
                         'title': title,
-                        'url': url,
+                        'url': card['url'],
                         'date': date,
-                        'prize': prize,
-                        'description': description,
-                        'tags': tags,
+                        'prize': card['prize'],
+                        'description': card['description'],
+                        'tags': card['tags'],
                         'is_beginner_friendly': is_beginner_friendly,
-                        'location': location,
+                        'location': card['location'],
                         'status': status
                     }
-                    
+                
                     hackathons.append(hackathon)
-                    
+                    if on_record:
+                        on_record(hackathon)
+                
                     print(f"\nExtracted hackathon: {title}")
-                    print(f"  URL: {url}")
+                    print(f"  URL: {card['url']}")
                     print(f"  Date: {date}")
-                    print(f"  Prize: {prize}")
+                    print(f"  Prize: {card['prize']}")
                     print(f"  Beginner Friendly: {is_beginner_friendly}")
                     print(f"  Status: {status}")
-                    
-                except Exception as e:
-                    print(f"Error extracting hackathon details: {str(e)}")
-                    continue
             
-            print(f"\nSuccessfully scraped {len(hackathons)} hackathons")
-            return hackathons
+                print(f"\nSuccessfully scraped {len(hackathons)} hackathons")
+                timer.record('parse', time.perf_counter() - parse_start)
+                timer.finish(hackathons=len(hackathons), scrolls=scroll_attempts)
+                return hackathons
             
         except Exception as e:
             print(f"Error scraping hackathons: {str(e)}")
+            timer.finish(error=str(e))
             return []
     
+    def iter_hackathons_api(self, max_workers: int = 8, max_pages: Optional[int] = None,
+                            base_url: str = DEVPOST_API_URL) -> Iterator[Dict[str, Any]]:
+        """Yield the full listing from Devpost's JSON API, page by page, instead of scrolling the page"""
+        client = DevpostAPIClient(base_url=base_url, max_workers=max_workers)
+        try:
+            yield from client.iter_hackathons(self.is_beginner_friendly, max_pages=max_pages)
+        finally:
+            client.close()
+    
+    def fetch_hackathons_api(self, max_workers: int = 8, max_pages: Optional[int] = None,
+                             base_url: str = DEVPOST_API_URL) -> List[Dict[str, Any]]:
+        """Fetch the full listing from Devpost's JSON API instead of scrolling the page"""
+        return list(self.iter_hackathons_api(max_workers, max_pages, base_url))
+    
     def filter_beginner_friendly(self, hackathons: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter hackathons to show only beginner-friendly ones"""
-        beginner_hackathons = [h for h in hackathons if h.get('is_beginner_friendly', False)]
+        beginner_hackathons = [h for h in hackathons if is_beginner_hackathon(h)]
         print(f"\nFound {len(beginner_hackathons)} beginner-friendly hackathons out of {len(hackathons)} total")
         return beginner_hackathons
     
     def filter_open_hackathons(self, hackathons: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter hackathons to show only currently open ones"""
-        open_hackathons = [h for h in hackathons if 'closed' not in h.get('status', '').lower()]
+        open_hackathons = [h for h in hackathons if is_open_hackathon(h)]
         print(f"\nFound {len(open_hackathons)} open hackathons")
         return open_hackathons
     
@@ -265,43 +206,62 @@ class DevpostScraper:
 
 def main():
     """Main function to run the Devpost scraper"""
+    parser = argparse.ArgumentParser(description="Collect Devpost hackathons")
+    parser.add_argument('--browser', action='store_true',
+                        help="Scrape the listing page with Chrome instead of the JSON API")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent API page requests")
+    parser.add_argument('--max-pages', type=int, help="Stop after this many API pages")
+    parser.add_argument('--format', choices=list(SINK_FORMATS), default='json',
+                        help="Output format for the four result files")
+    args = parser.parse_args()
+
     try:
-        scraper = DevpostScraper()
+        scraper = DevpostScraper(start_browser=args.browser)
         
         print("Starting Devpost hackathon scraper...")
-        hackathons = scraper.scrape_hackathons()
         
-        if hackathons:
-            # Save all hackathons
-            scraper.save_to_json(hackathons, 'devpost_hackathons_all.json')
-            
-            # Filter and save beginner-friendly hackathons
-            beginner_hackathons = scraper.filter_beginner_friendly(hackathons)
-            scraper.save_to_json(beginner_hackathons, 'devpost_hackathons_beginner.json')
-            
-            # Filter and save open hackathons
-            open_hackathons = scraper.filter_open_hackathons(hackathons)
-            scraper.save_to_json(open_hackathons, 'devpost_hackathons_open.json')
-            
-            # Filter for beginner-friendly AND open hackathons
-            beginner_open = [h for h in hackathons if h.get('is_beginner_friendly', False) and 'closed' not in h.get('status', '').lower()]
-            scraper.save_to_json(beginner_open, 'devpost_hackathons_beginner_open.json')
+        # Every record is checked once against each filter and streamed to the
+        # outputs it qualifies for as soon as it is extracted
+        router = OutputRouter({'beginner': is_beginner_hackathon, 'open': is_open_hackathon})
+        router.add_route('all', (), [open_sink('devpost_hackathons_all', args.format)])
+        beginner_list = ListSink()
+        router.add_route('beginner', ('beginner',),
+                         [open_sink('devpost_hackathons_beginner', args.format), beginner_list])
+        router.add_route('open', ('open',), [open_sink('devpost_hackathons_open', args.format)])
+        router.add_route('beginner_open', ('beginner', 'open'),
+                         [open_sink('devpost_hackathons_beginner_open', args.format)])
+        
+        with router:
+            if not args.browser:
+                for hackathon in scraper.iter_hackathons_api(max_workers=args.workers, max_pages=args.max_pages):
+                    router.write(hackathon)
+                if not router.records:
+                    print("No hackathons from the Devpost API, falling back to the browser")
+            if not router.records:
+                scraper.scrape_hackathons(on_record=router.write)
+        
+        if router.records:
+            counts = router.counts()
+            for route in router.routes:
+                for sink in route.sinks:
+                    if getattr(sink, 'path', None):
+                        print(f"Saved {sink.count} hackathons to {sink.path}")
             
             # Print summary
             print(f"\n{'='*60}")
             print("FILTERING RESULTS:")
             print(f"{'='*60}")
-            print(f"Total hackathons: {len(hackathons)}")
-            print(f"Beginner-friendly: {len(beginner_hackathons)}")
-            print(f"Currently open: {len(open_hackathons)}")
-            print(f"Beginner-friendly AND open: {len(beginner_open)}")
+            print(f"Total hackathons: {counts['all']}")
+            print(f"Beginner-friendly: {counts['beginner']}")
+            print(f"Currently open: {counts['open']}")
+            print(f"Beginner-friendly AND open: {counts['beginner_open']}")
             
             # Print detailed summary of beginner-friendly hackathons
-            if beginner_hackathons:
+            if beginner_list.records:
                 print(f"\n{'='*60}")
                 print("BEGINNER-FRIENDLY HACKATHONS:")
                 print(f"{'='*60}")
-                scraper.print_summary(beginner_hackathons)
+                scraper.print_summary(beginner_list.records)
         
         else:
             print("No hackathons were scraped. Please check the website structure or try again later.")
@@ -310,7 +270,7 @@ def main():
         print(f"Error in main: {str(e)}")
     finally:
         if 'scraper' in locals():
-            del scraper
+            scraper.pool.print_stats()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
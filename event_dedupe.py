@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Event Dedupe
+Collapses repeated events before matching: exact duplicates by normalized
+link, and near-duplicates such as recurring series by MinHash signatures of
+title and organizers, bucketed with LSH so each event is only compared with
+the few events it shares a band with
+"""
+
+import argparse
+import json
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from event_store import event_key
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 4
+
+_NON_WORD_RE = re.compile(r'[^a-z ]+')
+
+def normalize_link(link: str) -> str:
+    """Scheme, www., query string, fragment and trailing slash dropped, so tracking variants compare equal"""
+    parts = urlsplit((link or '').strip())
+    if not parts.netloc:
+        return (link or '').strip()
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host + parts.path.rstrip('/')
+
+def near_duplicate_text(event: Dict) -> str:
+    """Title and organizers, lowercased, with numbers and punctuation removed so episodes of a series agree"""
+    organizers = (event.get('organizers') or '').strip()
+    if organizers.lower().startswith('by '):
+        organizers = organizers[3:]
+    text = f"{event.get('title') or ''} {organizers}".lower()
+    return ' '.join(_NON_WORD_RE.sub(' ', text).split())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hashed character shingles of text, as uint64"""
+    grams = {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+    return np.array([zlib.crc32(g.encode('utf-8')) for g in grams], dtype=np.uint64)
+
+@dataclass
+class DedupeReport:
+    events_in: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    clusters: int = 0            # representatives that absorbed at least one near-duplicate
+    comparisons: int = 0         # signature comparisons made, against n * (n - 1) / 2 for all pairs
+    elapsed: float = 0.0
+
+    @property
+    def removed(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def events_out(self) -> int:
+        return self.events_in - self.removed
+
+class EventDeduper:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, by_city: bool = True):
+        """Incremental deduper; feed events with add()
+
+        Signatures are split into bands; events that agree on a whole band
+        land in the same bucket and are then checked against the bucket's
+        first event, keeping them only if the estimated Jaccard similarity
+        reaches threshold. With by_city, near-duplicates are only looked for
+        within a city, since a series running in two cities is two events to
+        a pair living in one of them. Exact link duplicates are dropped
+        across cities.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.by_city = by_city
+        rng = np.random.default_rng(1)
+        # Multiply-shift hashing: odd 64-bit multipliers, keep the high 32 bits
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self.events: List[Dict] = []  # first copy of every distinct link; roots are the representatives
+        self.report = DedupeReport()
+        self._links: Dict[str, int] = {}
+        self._buckets: Dict[Tuple, int] = {}
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._parent: List[int] = []
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingles(text)
+        with np.errstate(over='ignore'):
+            values = (hashes[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        return values.min(axis=0).astype(np.uint32)
+
+    def _find(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _union(self, i: int, j: int) -> bool:
+        """Merge two clusters into the older representative; returns False if they were already one"""
+        ri, rj = self._find(i), self._find(j)
+        if ri == rj:
+            return False
+        keep, absorb = min(ri, rj), max(ri, rj)
+        self._parent[absorb] = keep
+        self.report.near_duplicates += 1
+        kept, absorbed = self.events[keep], self.events[absorb]
+        if kept.get('occurrences', 1) == 1:
+            self.report.clusters += 1
+        if absorbed.get('occurrences', 1) > 1:
+            self.report.clusters -= 1
+        kept['occurrences'] = kept.get('occurrences', 1) + absorbed.get('occurrences', 1)
+        kept['dates'] = list(dict.fromkeys(kept.get('dates', [kept.get('date', '')]) +
+                                           absorbed.get('dates', [absorbed.get('date', '')])))
+        return True
+
+    def add(self, event: Dict) -> Optional[Dict]:
+        """Returns a copy of event if it starts a new cluster, or None if it duplicates one seen before
+
+        A duplicate instead bumps the 'occurrences' count (and 'dates' list)
+        on its cluster's representative, in place. If a later event links two
+        clusters that were both already returned, the older absorbs the newer,
+        which then drops out of representatives().
+        """
+        start = time.perf_counter()
+        self.report.events_in += 1
+        try:
+            link = normalize_link(event.get('link') or '') or event_key(event)
+            if link in self._links:
+                self.report.exact_duplicates += 1
+                return None
+
+            index = len(self.events)
+            self._links[link] = index
+            self._parent.append(index)
+            self.events.append(dict(event))
+            text = near_duplicate_text(event)
+            if not text:
+                self._signatures.append(None)
+                return self.events[index]
+
+            signature = self.signature(text)
+            self._signatures.append(signature)
+            scope = (event.get('city') or '').strip().lower() if self.by_city else ''
+            joined = False
+            for band in range(self.bands):
+                key = (scope, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                head = self._buckets.setdefault(key, index)
+                if head == index:
+                    continue
+                self.report.comparisons += 1
+                if np.mean(self._signatures[head] == signature) >= self.threshold and self._union(head, index):
+                    joined = True
+            return None if joined else self.events[index]
+        finally:
+            self.report.elapsed += time.perf_counter() - start
+
+    def representatives(self) -> List[Dict]:
+        """One event per cluster, in first-seen order"""
+        return [event for i, event in enumerate(self.events) if self._find(i) == i]
+
+    def largest_clusters(self, limit: int = 5) -> List[Dict]:
+        clusters = [e for e in self.representatives() if e.get('occurrences', 1) > 1]
+        return sorted(clusters, key=lambda e: e['occurrences'], reverse=True)[:limit]
+
+    def print_report(self, limit: int = 5):
+        report = self.report
+        print(f"Deduplicated {report.events_in} events to {report.events_out}: removed {report.removed} "
+              f"({report.exact_duplicates} exact, {report.near_duplicates} near-duplicates in "
+              f"{report.clusters} clusters) in {report.elapsed:.3f}s")
+        all_pairs = report.events_in * (report.events_in - 1) // 2
+        if all_pairs:
+            print(f"Compared {report.comparisons:,} signature pairs of {all_pairs:,} possible")
+        for event in self.largest_clusters(limit):
+            print(f"  {event['occurrences']}x  {event.get('title', '')}  ({event.get('city', '')})")
+
+def dedupe_events(events: List[Dict], **kwargs) -> Tuple[List[Dict], EventDeduper]:
+    """Collapse events to one representative per cluster; kwargs go to EventDeduper"""
+    deduper = EventDeduper(**kwargs)
+    for event in events:
+        deduper.add(event)
+    return deduper.representatives(), deduper
+
+def main():
+    """Deduplicate one or more scraped event files into a single file"""
+    parser = argparse.ArgumentParser(description="Collapse duplicate and recurring events before matching")
+    parser.add_argument('inputs', nargs='*', default=['all_luma_events.json'],
+                        help="Event JSON files to merge and deduplicate (default: all_luma_events.json)")
+    parser.add_argument('--output', default='deduped_events.json')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity of title and organizers to count as a near-duplicate")
+    parser.add_argument('--across-cities', action='store_true',
+                        help="Also collapse near-duplicates found in different cities")
+    args = parser.parse_args()
+
+    events = []
+    for path in args.inputs:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                events.extend(json.load(f))
+        except FileNotFoundError:
+            print(f"Error: {path} not found")
+            return
+        except json.JSONDecodeError:
+            print(f"Error: Invalid JSON format in {path}")
+            return
+
+    try:
+        representatives, deduper = dedupe_events(events, threshold=args.threshold, by_city=not args.across_cities)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return
+    deduper.print_report()
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(representatives, f, indent=4, ensure_ascii=False)
+    print(f"Saved {len(representatives)} events to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
+import argparse
 import json
 import os
+import re
+import time
+import zlib
+import numpy as np
 import requests
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
+from interest_index import InterestIndex, expand_interest, normalize_terms
+from event_dedupe import dedupe_events
+from event_store import EventStore
+from llm_cache import ResponseCache
+from llm_client import LLMClient
+from llm_telemetry import RequestRecord, TelemetryLog, prompt_hash, shared_telemetry
+from location_resolver import UNKNOWN, resolve_many
+from match_results import MatchResult, parse_match_results
+from prompt_encoding import EncodingStats, encode_events, expand_links, format_interests
 
 # Load environment variables from .env file
 load_dotenv()
 
+DEFAULT_API_URL = 'https://api.deepseek.com/v1/chat/completions'
+CACHE_MODES = ('use', 'refresh', 'bypass')
+
 @dataclass
 class Person:
     name: str
@@ -22,12 +39,102 @@ class Person:
             location=data['location']
         )
 
-class EventMatcher:
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prompt text (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+@dataclass
+class PrerankStats:
+    total_events: int
+    shortlisted_events: int
+    pruned_events: int
+    prompt_tokens_before: int
+    prompt_tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.prompt_tokens_before - self.prompt_tokens_after
+
+@dataclass
+class StreamStats:
+    started: float
+    time_to_first_byte: Optional[float] = None
+    time_to_first_match: Optional[float] = None
+    total_time: Optional[float] = None
+    matches: int = 0
+
+    def record_match(self):
+        self.matches += 1
+        if self.time_to_first_match is None:
+            self.time_to_first_match = time.perf_counter() - self.started
+
+class MatchBlockParser:
+    """Incrementally split streamed response text into '---'-delimited match blocks"""
+
+    _MATCH_START = re.compile(r'^\s*\d+\.')
+    _DELIMITER = re.compile(r'^[ \t]*---[ \t]*$', re.MULTILINE)
+
     def __init__(self):
-        """Initialize the event matcher"""
+        self.buffer = ""
+
+    def _blocks(self, segments: List[str]) -> List[str]:
+        # The preamble before the first delimiter isn't a match, only numbered blocks are
+        return [seg.strip() for seg in segments if self._MATCH_START.match(seg.strip())]
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any match blocks completed by it"""
+        self.buffer += text
+        # Only split on delimiters whose line is finished, so '---' isn't confused with '----'
+        complete, newline, tail = self.buffer.rpartition('\n')
+        parts = self._DELIMITER.split(complete + newline)
+        if len(parts) == 1:
+            return []
+        self.buffer = parts[-1] + tail
+        return self._blocks(parts[:-1])
+
+    def close(self) -> List[str]:
+        """Return the final block once the stream has ended"""
+        parts = self._DELIMITER.split(self.buffer)
+        self.buffer = ""
+        return self._blocks(parts)
+
+class EventMatcher:
+    def __init__(self, top_k: Optional[int] = None, cache: Optional[ResponseCache] = None,
+                 cache_mode: str = 'use', api_url: Optional[str] = None,
+                 client: Optional[LLMClient] = None, output_file: Optional[str] = 'ai_matches.txt',
+                 telemetry: Optional[TelemetryLog] = None, compact_prompts: bool = True):
+        """Initialize the event matcher
+
+        top_k limits how many locally pre-ranked events are sent to the LLM;
+        None sends the whole catalog. With a cache, cache_mode 'use' reads and
+        writes it, 'refresh' skips the lookup but stores the new response, and
+        'bypass' ignores it entirely. Matchers running concurrently should
+        share one LLMClient (connection pool, retries, rate limiting);
+        output_file=None skips writing the response to disk. Every request
+        is recorded in telemetry (default: the shared log at
+        LLM_TELEMETRY_PATH, requests.jsonl unless set to 'off').
+        compact_prompts sends events as a table with short link IDs (see
+        prompt_encoding) instead of ten labeled lines per event.
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
         self.api_key = os.getenv('DEEPSEEK_API_KEY')
         if not self.api_key:
             print("Warning: DEEPSEEK_API_KEY not set in .env file")
+        self.api_url = api_url or os.getenv('DEEPSEEK_API_URL', DEFAULT_API_URL)
+        self.model = 'deepseek-chat'
+        self.temperature = 0.7
+        self.max_tokens = 2000
+        self.top_k = top_k
+        self.cache = cache
+        self.cache_mode = cache_mode
+        self.client = client or LLMClient(self.api_url, self.api_key)
+        self.output_file = output_file
+        self.telemetry = telemetry or shared_telemetry()
+        self.compact_prompts = compact_prompts
+        self.last_encoding_stats: Optional[EncodingStats] = None
+        self.last_prerank_stats: Optional[PrerankStats] = None
+        self.last_stream_stats: Optional[StreamStats] = None
 
     def get_common_interests(self, person1: Person, person2: Person) -> List[str]:
         """Find common interests between two people"""
@@ -35,19 +142,11 @@ class EventMatcher:
         interests2 = set(i.lower() for i in person2.interests)
         return list(interests1.intersection(interests2))
 
-    def find_matching_events(self, events: List[Dict], person1: Person, person2: Person) -> str:
-        """Find events that match both people's interests using AI"""
-        if not events:
-            print("No events to process.")
-            return ""
-        
-        # Get common interests between both people
-        common_interests = self.get_common_interests(person1, person2)
-        print(f"\nCommon interests between {person1.name} and {person2.name}:")
-        print(", ".join(common_interests))
-        
-        # Construct a single prompt with all events
-        events_text = "\n\n".join([
+    def format_events(self, events: List[Dict], compact: Optional[bool] = None) -> str:
+        """Render events as the numbered block used in the prompt"""
+        if self.compact_prompts if compact is None else compact:
+            return encode_events(events).text
+        return "\n\n".join([
             f"Event {i+1}:\n"
             f"Title: {event['title']}\n"
             f"Description: {event['description']}\n"
@@ -58,16 +157,30 @@ class EventMatcher:
             f"Organizers: {event['organizers']}\n"
             f"Status: {event['status']}\n"
             f"Attendees: {event['attendees']}"
+            + (f"\nOccurrences: {event['occurrences']}" if event.get('occurrences', 1) > 1 else "")
             for i, event in enumerate(events)
         ])
 
-        prompt = f"""Given a list of events and two people's interests, find the top 3 best events that would be good for both people to attend together.
+    def format_interests(self, person1: Person, person2: Person, compact: Optional[bool] = None) -> str:
+        """Both people's interests, as one shared vocabulary in compact prompts"""
+        if self.compact_prompts if compact is None else compact:
+            return "Interests:\n" + format_interests(person1.name, person1.interests, person2.name, person2.interests)
+        return (f"Person 1 ({person1.name})'s Interests: {', '.join(person1.interests)}\n"
+                f"Person 2 ({person2.name})'s Interests: {', '.join(person2.interests)}")
+
+    def build_prompt(self, events: List[Dict], person1: Person, person2: Person,
+                     compact: Optional[bool] = None) -> str:
+        """Build the matching prompt for a list of events and two people"""
+        compact = self.compact_prompts if compact is None else compact
+        events_text = self.format_events(events, compact)
+        link = 'Event id' if compact else 'Event URL'
+
+        return f"""Given a list of events and two people's interests, find the top 3 best events that would be good for both people to attend together.
 
 Events:
 {events_text}
 
-Person 1 ({person1.name})'s Interests: {', '.join(person1.interests)}
-Person 2 ({person2.name})'s Interests: {', '.join(person2.interests)}
+{self.format_interests(person1, person2, compact)}
 
 Please analyze all events and select the top 3 that would be best for both people to attend together. For each event:
 1. Explain why it's a good match for both people, citing which specific interests match for each person (max 20 word explanation)
@@ -86,7 +199,7 @@ City: [Event City]
 Organizers: [Event Organizers]
 Status: [Event Status]
 Attendees: [Attendee Count]
-Link: [Event URL]
+Link: [{link}]
 Match Score: [0-10]/10
 Why this matches: [explanation]
 {person1.name}'s Matching Interests: [interests]
@@ -104,54 +217,339 @@ Why this matches: [explanation]
 
 Order the events by match score from highest to lowest. Only include events that would genuinely interest both people. Make sure at least 2 events are displayed"""
 
-        try:
-            if not self.api_key:
-                print("Error: DEEPSEEK_API_KEY not set in .env file")
-                print("Please make sure your .env file contains: DEEPSEEK_API_KEY=your_api_key")
-                return ""
+    def prerank_events(self, events: List[Dict], person1: Person, person2: Person) -> List[Dict]:
+        """Shortlist the top_k events for this pair with the local interest index"""
+        if self.top_k is None or self.top_k >= len(events):
+            self.last_prerank_stats = None
+            return events
 
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'model': 'deepseek-chat',
-                'messages': [
-                    {'role': 'user', 'content': prompt}
-                ],
-                'temperature': 0.7,
-                'max_tokens': 2000
-            }
-            
-            response = requests.post(
-                'https://api.deepseek.com/v1/chat/completions',
-                headers=headers,
-                json=data
-            )
-            
-            if response.status_code != 200:
-                print(f"Error from Deepseek API: {response.text}")
-                return ""
-            
-            # Get the AI response
-            response_json = response.json()
-            ai_response = response_json['choices'][0]['message']['content']
-            
-            # Save the AI response to a text file
+        index = InterestIndex(events)
+        shortlist = index.shortlist(person1.interests, person2.interests, self.top_k)
+
+        stats = PrerankStats(
+            total_events=len(events),
+            shortlisted_events=len(shortlist),
+            pruned_events=len(events) - len(shortlist),
+            prompt_tokens_before=estimate_tokens(self.build_prompt(events, person1, person2)),
+            prompt_tokens_after=estimate_tokens(self.build_prompt(shortlist, person1, person2))
+        )
+        self.last_prerank_stats = stats
+        print(f"\nPre-ranked {stats.total_events} events down to {stats.shortlisted_events} "
+              f"({stats.pruned_events} pruned, ~{stats.tokens_saved} prompt tokens saved)")
+        return shortlist
+
+    def report_encoding(self, prompt: str, verbose_prompt: str) -> Optional[EncodingStats]:
+        """Record and print how much the compact encoding saved on this request"""
+        if not self.compact_prompts:
+            self.last_encoding_stats = None
+            return None
+        stats = EncodingStats(verbose_tokens=estimate_tokens(verbose_prompt), compact_tokens=estimate_tokens(prompt))
+        self.last_encoding_stats = stats
+        print(f"\nCompact prompt: ~{stats.compact_tokens} tokens instead of ~{stats.verbose_tokens} "
+              f"({stats.reduction:.0%} fewer)")
+        return stats
+
+    def find_matching_events(self, events: List[Dict], person1: Person, person2: Person) -> str:
+        """Find events that match both people's interests using AI"""
+        if not events:
+            print("No events to process.")
+            return ""
+        
+        # Get common interests between both people
+        common_interests = self.get_common_interests(person1, person2)
+        print(f"\nCommon interests between {person1.name} and {person2.name}:")
+        print(", ".join(common_interests))
+        
+        # Only send the locally pre-ranked shortlist to the LLM
+        events = self.prerank_events(events, person1, person2)
+        prompt = self.build_prompt(events, person1, person2)
+        self.report_encoding(prompt, self.build_prompt(events, person1, person2, compact=False))
+
+        ai_response = self.complete(prompt, events=len(events))
+        if not ai_response:
+            return ""
+        ai_response = expand_links(ai_response, events)
+
+        # Save the AI response to a text file
+        if self.output_file:
             try:
-                with open('ai_matches.txt', 'w', encoding='utf-8') as f:
+                with open(self.output_file, 'w', encoding='utf-8') as f:
                     f.write(ai_response)
-                print("\nAI matches saved to ai_matches.txt")
+                print(f"\nAI matches saved to {self.output_file}")
+            except Exception as e:
+                print(f"Error saving AI response: {str(e)}")
+
+        return ai_response
+
+    def build_json_prompt(self, events: List[Dict], person1: Person, person2: Person,
+                          compact: Optional[bool] = None) -> str:
+        """Build a matching prompt that asks for event numbers and scores as JSON"""
+        compact = self.compact_prompts if compact is None else compact
+        events_text = self.format_events(events, compact)
+
+        return f"""Given a list of events and two people's interests, find the top 3 best events that would be good for both people to attend together.
+
+Events:
+{events_text}
+
+{self.format_interests(person1, person2, compact)}
+
+Respond with a JSON object only, exactly in this shape:
+{{"matches": [{{"event": <event number>, "score": <match score 0-10>, "reason": "<why it suits both, max 20 words>", "person1_interests": ["<matching interest>"], "person2_interests": ["<matching interest>"]}}]}}
+
+Refer to events only by their number; do not repeat titles, links or other event details. Order matches by score from highest to lowest, only include events that would genuinely interest both people, and include at least 2 events."""
+
+    def find_matching_events_json(self, events: List[Dict], person1: Person, person2: Person) -> List[MatchResult]:
+        """Find the top events for both people as typed results using JSON output"""
+        if not events:
+            print("No events to process.")
+            return []
+
+        events = self.prerank_events(events, person1, person2)
+        prompt = self.build_json_prompt(events, person1, person2)
+        self.report_encoding(prompt, self.build_json_prompt(events, person1, person2, compact=False))
+
+        response = self.complete(prompt, json_mode=True, events=len(events))
+        results = parse_match_results(response, events)
+        if results is None and response:
+            # The local repair step couldn't salvage it; pay for one fresh attempt
+            print("Could not parse JSON matches from Deepseek, retrying once")
+            response = self.complete(prompt, json_mode=True, refresh=True, events=len(events))
+            results = parse_match_results(response, events)
+        results = results or []
+
+        if results and self.output_file:
+            json_file = os.path.splitext(self.output_file)[0] + '.json'
+            try:
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump([r.to_dict(person1.name, person2.name) for r in results], f,
+                              indent=4, ensure_ascii=False)
+                print(f"\nAI matches saved to {json_file}")
             except Exception as e:
                 print(f"Error saving AI response: {str(e)}")
+        return results
+
+    def stream_matching_events(self, events: List[Dict], person1: Person, person2: Person) -> Iterator[str]:
+        """Like find_matching_events, but yield each match block as soon as it is complete
+
+        Timings for the run are kept in last_stream_stats.
+        """
+        stats = StreamStats(started=time.perf_counter())
+        self.last_stream_stats = stats
+        if not events:
+            print("No events to process.")
+            return
+
+        events = self.prerank_events(events, person1, person2)
+        prompt = self.build_prompt(events, person1, person2)
+        self.report_encoding(prompt, self.build_prompt(events, person1, person2, compact=False))
+        record = self._new_record(prompt, 'stream', len(events))
+        request_start = time.perf_counter()
+
+        use_cache = self.cache is not None and self.cache_mode != 'bypass'
+        cache_key = None
+        cached = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(self.model, self.temperature, self.max_tokens, prompt)
+            if self.cache_mode == 'use':
+                cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("\nUsing cached AI response")
+            record.cache_hit = True
+            deltas = iter([cached])
+        else:
+            deltas = self._stream_completion(prompt, stats, record)
+
+        parser = MatchBlockParser()
+        chunks = []
+        try:
+            for delta in deltas:
+                chunks.append(delta)
+                for block in parser.feed(delta):
+                    stats.record_match()
+                    yield expand_links(block, events)
+            for block in parser.close():
+                stats.record_match()
+                yield expand_links(block, events)
+        except Exception as e:
+            print(f"Error streaming matches from Deepseek: {str(e)}")
+            record.status = 'error'
+            return
+        finally:
+            record.matches = stats.matches
+            record.latency = time.perf_counter() - request_start
+            self._log(record)
+        stats.total_time = time.perf_counter() - stats.started
+
+        ai_response = ''.join(chunks)
+        if ai_response and use_cache and cached is None:
+            try:
+                self.cache.put(cache_key, ai_response, stats.total_time)
+            except Exception as e:
+                print(f"Error writing to LLM cache: {str(e)}")
+        if ai_response and self.output_file:
+            try:
+                with open(self.output_file, 'w', encoding='utf-8') as f:
+                    f.write(expand_links(ai_response, events))
+            except Exception as e:
+                print(f"Error saving AI response: {str(e)}")
+
+    def complete(self, prompt: str, json_mode: bool = False, refresh: bool = False,
+                 events: Optional[int] = None, kind: str = 'complete',
+                 count: Optional[Callable[[str], int]] = None) -> str:
+        """Get a chat completion for prompt, going through the response cache when enabled
+
+        json_mode asks the API for a JSON object response; refresh skips the
+        cache lookup for this call only. events is the number of events in
+        the prompt and kind labels the call, both recorded in the telemetry
+        log, along with count(response) results (match blocks by default).
+        """
+        record = self._new_record(prompt, kind, events, json_mode)
+        start = time.perf_counter()
+        use_cache = self.cache is not None and self.cache_mode != 'bypass'
+        cache_key = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(self.model, self.temperature, self.max_tokens, prompt)
+            if self.cache_mode == 'use' and not refresh:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    print("\nUsing cached AI response")
+                    record.cache_hit = True
+                    self._finish_record(record, start, cached, count)
+                    return cached
+
+        ai_response = self._request_completion(prompt, json_mode, record)
+        if ai_response and use_cache:
+            try:
+                self.cache.put(cache_key, ai_response, time.perf_counter() - start)
+            except Exception as e:
+                print(f"Error writing to LLM cache: {str(e)}")
+        self._finish_record(record, start, ai_response, count)
+        return ai_response
+
+    def _new_record(self, prompt: str, kind: str, events: Optional[int] = None,
+                    json_mode: bool = False) -> RequestRecord:
+        return RequestRecord(ts=time.time(), kind=kind, model=self.model, prompt_hash=prompt_hash(prompt),
+                             prompt_chars=len(prompt), events=events, json_mode=json_mode)
+
+    def _finish_record(self, record: RequestRecord, start: float, response: str,
+                       count: Optional[Callable[[str], int]] = None):
+        record.latency = time.perf_counter() - start
+        if not response:
+            record.matches = 0
+        else:
+            record.matches = count(response) if count else self.count_matches(response, record.json_mode)
+        self._log(record)
+
+    def _log(self, record: RequestRecord):
+        if self.telemetry:
+            self.telemetry.log(record)
+
+    @staticmethod
+    def count_matches(response: str, json_mode: bool = False) -> int:
+        """Number of matches in a response, without the full result parsing"""
+        if json_mode:
+            try:
+                matches = json.loads(response).get('matches')
+            except (ValueError, AttributeError):
+                return 0
+            return len(matches) if isinstance(matches, list) else 0
+        parser = MatchBlockParser()
+        return len(parser.feed(response + '\n')) + len(parser.close())
+
+    def _post(self, prompt: str, stream: bool = False, json_mode: bool = False,
+              record: Optional[RequestRecord] = None) -> Optional[requests.Response]:
+        """POST prompt to the chat completions API through the shared LLM client
+
+        The outcome (status, retries) is noted on record when one is given.
+        """
+        record = record or self._new_record(prompt, 'stream' if stream else 'complete', json_mode=json_mode)
+        if not self.api_key:
+            record.status = 'no_api_key'
+            print("Error: DEEPSEEK_API_KEY not set in .env file")
+            print("Please make sure your .env file contains: DEEPSEEK_API_KEY=your_api_key")
+            return None
+
+        data = {
+            'model': self.model,
+            'messages': [
+                {'role': 'user', 'content': prompt}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens
+        }
+        if stream:
+            data['stream'] = True
+            # Ask for a final chunk carrying the usage field, which streams otherwise omit
+            data['stream_options'] = {'include_usage': True}
+        if json_mode:
+            data['response_format'] = {'type': 'json_object'}
+        
+        response = self.client.post(data, stream=stream)
+        record.retries = self.client.last_retries
+        if response is None:
+            record.status = 'connection_error'
+            return None
+
+        if response.status_code != 200:
+            record.status = f"http_{response.status_code}"
+            print(f"Error from Deepseek API: {response.text}")
+            return None
+        return response
+
+    @staticmethod
+    def _record_usage(record: Optional[RequestRecord], usage: Optional[Dict]):
+        if record and usage:
+            record.prompt_tokens = usage.get('prompt_tokens')
+            record.completion_tokens = usage.get('completion_tokens')
+
+    def _request_completion(self, prompt: str, json_mode: bool = False,
+                            record: Optional[RequestRecord] = None) -> str:
+        """Send prompt to the Deepseek chat completions API"""
+        try:
+            response = self._post(prompt, json_mode=json_mode, record=record)
+            if response is None:
+                return ""
+            if record:
+                # requests stops the clock once the headers are in, before the body is read
+                record.ttfb = response.elapsed.total_seconds()
             
-            return ai_response
+            # Get the AI response
+            response_json = response.json()
+            self._record_usage(record, response_json.get('usage'))
+            return response_json['choices'][0]['message']['content']
                 
         except Exception as e:
+            if record:
+                record.status = 'error'
             print(f"Error getting matches from Deepseek: {str(e)}")
             return ""
 
+    def _stream_completion(self, prompt: str, stats: StreamStats,
+                           record: Optional[RequestRecord] = None) -> Iterator[str]:
+        """Yield content deltas from a streamed (server-sent events) completion"""
+        start = time.perf_counter()
+        response = self._post(prompt, stream=True, record=record)
+        if response is None:
+            return
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if stats.time_to_first_byte is None:
+                    stats.time_to_first_byte = time.perf_counter() - stats.started
+                    if record:
+                        record.ttfb = time.perf_counter() - start
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = line[len('data:'):].strip()
+                if payload == '[DONE]':
+                    break
+                chunk = json.loads(payload)
+                self._record_usage(record, chunk.get('usage'))
+                # The usage chunk comes last, with an empty choices list
+                delta = (chunk.get('choices') or [{}])[0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+
     def display_matches(self, matches: str) -> None:
         """Display the AI's event matches"""
         if not matches:
@@ -162,8 +560,172 @@ Order the events by match score from highest to lowest. Only include events that
         print(matches)
         print("-" * 80)
 
+def _hashed_features(terms: List[str]) -> Dict[int, float]:
+    """Hash unigrams and bigrams into stable feature ids with sublinear term frequency"""
+    grams = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    counts: Dict[int, int] = {}
+    for gram in grams:
+        feature = zlib.crc32(gram.encode('utf-8'))
+        counts[feature] = counts.get(feature, 0) + 1
+    return {f: 1.0 + np.log(c) for f, c in counts.items()}
+
+class LocalScorer:
+    def __init__(self, people: List[Person], min_similarity: float = 0.1):
+        """Deterministic, LLM-free scorer for person-event affinity
+
+        Interests and events are embedded as L2-normalized hashed n-gram
+        vectors. Only feature columns that occur in some interest can ever
+        contribute to a dot product, so matrices are built over that
+        interest vocabulary alone, which keeps them small however large the
+        event catalog is. A person's vector is the sum of their interest
+        vectors, so a single people x events matrix multiply gives every
+        person-event affinity (the summed cosine over their interests).
+        """
+        self.people = people
+        self.min_similarity = min_similarity
+        self.columns: Dict[int, int] = {}
+
+        interest_features = []
+        self.interest_owner: List[int] = []
+        self.interest_labels: List[str] = []
+        for p_idx, person in enumerate(people):
+            for interest in dict.fromkeys(i.strip() for i in person.interests if i.strip()):
+                terms = normalize_terms(interest)
+                features = _hashed_features(terms)
+                # Synonym expansion adds recall without outweighing the literal terms
+                for term in expand_interest(interest) - set(terms):
+                    features.setdefault(zlib.crc32(term.encode('utf-8')), 0.5)
+                for feature in features:
+                    self.columns.setdefault(feature, len(self.columns))
+                interest_features.append(features)
+                self.interest_owner.append(p_idx)
+                self.interest_labels.append(interest)
+
+        self.interests = self._to_matrix(interest_features)
+        self.people_matrix = np.zeros((len(people), len(self.columns)), dtype=np.float32)
+        np.add.at(self.people_matrix, np.array(self.interest_owner, dtype=np.intp), self.interests)
+
+    def _to_matrix(self, rows: List[Dict[int, float]]) -> np.ndarray:
+        """Project feature dicts onto the interest vocabulary, normalizing by the full vector length"""
+        matrix = np.zeros((len(rows), len(self.columns)), dtype=np.float32)
+        for r, features in enumerate(rows):
+            norm = np.sqrt(sum(v * v for v in features.values())) or 1.0
+            for feature, value in features.items():
+                col = self.columns.get(feature)
+                if col is not None:
+                    matrix[r, col] = value / norm
+        return matrix
+
+    @staticmethod
+    def event_text(event: Dict) -> str:
+        """Text an event is scored on; the title counts twice"""
+        return ' '.join([event.get('title', '')] * 2 + [event.get('organizers', ''), event.get('location', '')])
+
+    @classmethod
+    def event_features(cls, events: List[Dict]) -> List[Dict[int, float]]:
+        """Hashed features of each event's text; independent of the people, so reusable across scorers"""
+        return [_hashed_features(normalize_terms(cls.event_text(e))) for e in events]
+
+    def event_matrix(self, events: List[Dict], features: Optional[List[Dict[int, float]]] = None) -> np.ndarray:
+        """Embed events as an events x vocabulary matrix, from precomputed features when given"""
+        return self._to_matrix(features if features is not None else self.event_features(events))
+
+    def affinities(self, event_matrix: np.ndarray) -> np.ndarray:
+        """Every person-event affinity (people x events) in one matrix multiply"""
+        return self.people_matrix @ event_matrix.T
+
+    @staticmethod
+    def combine(affinity1: np.ndarray, affinity2: np.ndarray) -> np.ndarray:
+        """Pair score per event: geometric mean, so both people have to like it"""
+        return np.sqrt(affinity1 * affinity2)
+
+    @staticmethod
+    def to_match_score(combined: float) -> int:
+        """Map a combined affinity onto the 0-10 match_score scale"""
+        return int(round(10 * combined / (combined + 0.25)))
+
+    def _matching_interests(self, person_idx: int, event_vector: np.ndarray) -> List[str]:
+        rows = [i for i, owner in enumerate(self.interest_owner) if owner == person_idx]
+        sims = self.interests[rows] @ event_vector
+        return [self.interest_labels[rows[k]] for k in np.argsort(-sims) if sims[k] >= self.min_similarity]
+
+    def top_matches(self, events: List[Dict], event_matrix: np.ndarray, affinities: np.ndarray,
+                    pair: Tuple[int, int], top_n: int = 10) -> List[Dict]:
+        """Best events for one pair, in the top_matching_events.json schema"""
+        i, j = pair
+        combined = self.combine(affinities[i], affinities[j])
+        order = np.argsort(-combined, kind='stable')
+        person1, person2 = self.people[i], self.people[j]
+
+        results = []
+        seen_links = set()
+        for e_idx in order:
+            if len(results) >= top_n or combined[e_idx] <= 0:
+                break
+            event = events[e_idx]
+            if event.get('link') in seen_links:
+                continue
+            seen_links.add(event.get('link'))
+
+            person1_matches = self._matching_interests(i, event_matrix[e_idx])
+            person2_matches = self._matching_interests(j, event_matrix[e_idx])
+            if not person1_matches or not person2_matches:
+                continue
+            lowered = {m.lower() for m in person2_matches}
+            result = dict(event)
+            result.update({
+                'match_score': self.to_match_score(float(combined[e_idx])),
+                'common_matches': [m for m in person1_matches if m.lower() in lowered],
+                'person1_matches': person1_matches,
+                'person2_matches': person2_matches,
+                'person1_name': person1.name,
+                'person2_name': person2.name
+            })
+            results.append(result)
+        return results
+
+    def score_pairs(self, events: List[Dict], pairs: Optional[List[Tuple[int, int]]] = None,
+                    top_n: int = 10) -> Dict[Tuple[str, str], List[Dict]]:
+        """Top events for each pair of people (every pair when pairs is None)"""
+        if pairs is None:
+            pairs = [(i, j) for i in range(len(self.people)) for j in range(i + 1, len(self.people))]
+        event_matrix = self.event_matrix(events)
+        affinities = self.affinities(event_matrix)
+        return {
+            (self.people[i].name, self.people[j].name): self.top_matches(events, event_matrix, affinities, (i, j), top_n)
+            for i, j in pairs
+        }
+
 def main():
     """Main function to run the event matcher"""
+    parser = argparse.ArgumentParser(description="Match two people to events using AI")
+    parser.add_argument('--top-k', type=int, default=25,
+                        help="Number of locally pre-ranked events sent to the LLM (0 sends all)")
+    parser.add_argument('--cache-path', default='llm_cache.sqlite3',
+                        help="SQLite file used to cache LLM responses")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Bypass the LLM response cache entirely")
+    parser.add_argument('--refresh-cache', action='store_true',
+                        help="Ignore cached responses but store the fresh ones")
+    parser.add_argument('--stream', action='store_true',
+                        help="Stream the response and print each match as soon as it arrives")
+    parser.add_argument('--json', action='store_true',
+                        help="Ask for structured JSON matches and save them to ai_matches.json")
+    parser.add_argument('--hedge', action='store_true',
+                        help="Send a duplicate request when a reply is slower than the observed p95")
+    parser.add_argument('--read-timeout', type=float, default=120.0,
+                        help="Seconds to wait for the LLM API to respond")
+    parser.add_argument('--local', action='store_true',
+                        help="Score events locally without the LLM and write top_matching_events.json")
+    parser.add_argument('--db', help="Read events from this SQLite event store instead of all_luma_events.json")
+    parser.add_argument('--city', action='append',
+                        help="With --db, only events in this city (repeatable; default: both people's cities)")
+    parser.add_argument('--since-hours', type=float,
+                        help="With --db, only events seen by a scrape in the last N hours")
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="Keep duplicate and recurring events instead of collapsing them before matching")
+    args = parser.parse_args()
+
     try:
         # Load intern profiles from JSON files
         try:
@@ -177,25 +739,81 @@ def main():
             print("Error: Invalid JSON format in one of the input files")
             return
 
-        # Load events
-        try:
-            with open('all_luma_events.json', 'r') as f:
-                events = json.load(f)
-        except FileNotFoundError:
-            print("Error: all_luma_events.json not found. Please run luma_scraper.py first.")
-            return
-        except json.JSONDecodeError:
-            print("Error: Invalid JSON format in all_luma_events.json")
-            return
-
         # Create Person objects
         person1 = Person.from_json(person1_data)
         person2 = Person.from_json(person2_data)
 
+        # Load events
+        if args.db:
+            cities = args.city or [c for c in dict.fromkeys(r.city for r in resolve_many(
+                [person1.location, person2.location])) if c != UNKNOWN]
+            seen_since = time.time() - args.since_hours * 3600 if args.since_hours else None
+            store = EventStore(args.db)
+            events = store.query(cities=cities, seen_since=seen_since)
+            store.close()
+            print(f"Loaded {len(events)} events for {', '.join(cities) or 'all cities'} from {args.db}")
+        else:
+            try:
+                with open('all_luma_events.json', 'r') as f:
+                    events = json.load(f)
+            except FileNotFoundError:
+                print("Error: all_luma_events.json not found. Please run luma_scraper.py first.")
+                return
+            except json.JSONDecodeError:
+                print("Error: Invalid JSON format in all_luma_events.json")
+                return
+
+        if not args.no_dedupe:
+            events, deduper = dedupe_events(events)
+            deduper.print_report()
+
+        if args.local:
+            scorer = LocalScorer([person1, person2])
+            top_events = scorer.score_pairs(events)[(person1.name, person2.name)]
+            try:
+                with open('top_matching_events.json', 'w', encoding='utf-8') as f:
+                    json.dump(top_events, f, indent=4, ensure_ascii=False)
+                print(f"\nSaved {len(top_events)} locally scored events to top_matching_events.json")
+            except Exception as e:
+                print(f"Error saving local matches: {str(e)}")
+            for event in top_events:
+                print(f"  {event['match_score']}/10  {event['title']}  ({', '.join(event['common_matches']) or '-'})")
+            return
+
         # Find and display matches
-        matcher = EventMatcher()
-        matches = matcher.find_matching_events(events, person1, person2)
-        matcher.display_matches(matches)
+        cache_mode = 'bypass' if args.no_cache else 'refresh' if args.refresh_cache else 'use'
+        cache = None if args.no_cache else ResponseCache(args.cache_path)
+        api_url = os.getenv('DEEPSEEK_API_URL', DEFAULT_API_URL)
+        client = LLMClient(api_url, os.getenv('DEEPSEEK_API_KEY'), read_timeout=args.read_timeout, hedge=args.hedge)
+        matcher = EventMatcher(top_k=args.top_k or None, cache=cache, cache_mode=cache_mode, client=client)
+        if args.json:
+            results = matcher.find_matching_events_json(events, person1, person2)
+            print("\nTop event suggestions:" if results else "\nNo matching events found.")
+            for rank, result in enumerate(results, 1):
+                event = result.event
+                print(f"\n{rank}. {event['title']} ({result.score:g}/10)")
+                print(f"   {event['date']} @ {event['location']}, {event['city']}")
+                print(f"   Link: {event['link']}")
+                print(f"   Why this matches: {result.reason}")
+                print(f"   {person1.name}'s Matching Interests: {', '.join(result.person1_interests)}")
+                print(f"   {person2.name}'s Matching Interests: {', '.join(result.person2_interests)}")
+        elif args.stream:
+            print("\nTop event suggestions:")
+            for block in matcher.stream_matching_events(events, person1, person2):
+                print(f"\n{block}\n")
+                print("-" * 80)
+            stats = matcher.last_stream_stats
+            if stats and stats.matches:
+                print(f"\nFirst match after {stats.time_to_first_match:.2f}s, "
+                      f"{stats.matches} matches in {stats.total_time:.2f}s")
+            else:
+                print("\nNo matching events found.")
+        else:
+            matches = matcher.find_matching_events(events, person1, person2)
+            matcher.display_matches(matches)
+        client.print_stats()
+        if cache:
+            cache.print_stats()
 
     except Exception as e:
         print(f"Error in main: {str(e)}")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Event Store
+Embedded SQLite store for scraped events, keyed by event link, that keeps
+first/last seen times across scrapes and lets consumers query one city or
+time window instead of reparsing every JSON dump
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_STORE_PATH = 'events.sqlite3'
+DEFAULT_BATCH_SIZE = 500
+
+@dataclass
+class UpsertStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+def event_key(event: Dict) -> str:
+    """The event's link, or a stand-in built from its city, title and date when it has none"""
+    link = (event.get('link') or '').strip()
+    if link:
+        return link
+    return f"{event.get('city', '')}|{event.get('title', '')}|{event.get('date', '')}"
+
+def content_hash(event: Dict) -> str:
+    payload = json.dumps(event, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class EventStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """Open (or create) the event database
+
+        Each thread gets its own connection, and WAL lets the scraper write
+        while the matcher or exporter read.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                link TEXT PRIMARY KEY,
+                city TEXT NOT NULL,
+                date TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_events_city ON events(city, position)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_events_date ON events(date)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_events_last_seen ON events(last_seen)')
+
+    def _existing_hashes(self, conn: sqlite3.Connection, keys: List[str]) -> Dict[str, str]:
+        # Stay under SQLite's default limit on bound parameters
+        found = {}
+        for i in range(0, len(keys), 900):
+            chunk = keys[i:i + 900]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(conn.execute(
+                f'SELECT link, content_hash FROM events WHERE link IN ({placeholders})', chunk
+            ).fetchall())
+        return found
+
+    def upsert_events(self, events: Iterable[Dict], seen_at: Optional[float] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> UpsertStats:
+        """Insert new events, rewrite changed ones and only touch last_seen on the rest
+
+        Events are written in transactions of batch_size rows. position keeps
+        each event's place in the scrape so queries return them in page order.
+        """
+        start = time.perf_counter()
+        seen_at = seen_at if seen_at is not None else time.time()
+        stats = UpsertStats()
+        rows = {}
+        for position, event in enumerate(events):
+            rows[event_key(event)] = (position, event)
+        keys = list(rows)
+
+        conn = self._connect()
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i:i + batch_size]
+            inserts, updates, touches = [], [], []
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                existing = self._existing_hashes(conn, batch)
+                for key in batch:
+                    position, event = rows[key]
+                    digest = content_hash(event)
+                    if key not in existing:
+                        inserts.append((key, event.get('city', ''), event.get('date', ''), position,
+                                        json.dumps(event, ensure_ascii=False), digest, seen_at, seen_at))
+                    elif existing[key] != digest:
+                        updates.append((event.get('city', ''), event.get('date', ''), position,
+                                        json.dumps(event, ensure_ascii=False), digest, seen_at, key))
+                    else:
+                        touches.append((position, seen_at, key))
+                conn.executemany(
+                    'INSERT INTO events (link, city, date, position, data, content_hash, first_seen, last_seen) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', inserts
+                )
+                conn.executemany(
+                    'UPDATE events SET city = ?, date = ?, position = ?, data = ?, content_hash = ?, last_seen = ? '
+                    'WHERE link = ?', updates
+                )
+                conn.executemany('UPDATE events SET position = ?, last_seen = ? WHERE link = ?', touches)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            stats.inserted += len(inserts)
+            stats.updated += len(updates)
+            stats.unchanged += len(touches)
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def query(self, cities: Optional[List[str]] = None, seen_since: Optional[float] = None,
+              seen_until: Optional[float] = None, date: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """Events filtered by city, last-seen window (epoch seconds) and date text, in page order"""
+        clauses, params = [], []
+        if cities:
+            clauses.append(f"city IN ({','.join('?' * len(cities))})")
+            params.extend(cities)
+        if seen_since is not None:
+            clauses.append('last_seen >= ?')
+            params.append(seen_since)
+        if seen_until is not None:
+            clauses.append('last_seen <= ?')
+            params.append(seen_until)
+        if date is not None:
+            clauses.append('date = ?')
+            params.append(date)
+        sql = 'SELECT data FROM events'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY city, position'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [json.loads(data) for (data,) in self._connect().execute(sql, params)]
+
+    def cities(self) -> Dict[str, int]:
+        """Number of stored events per city"""
+        return dict(self._connect().execute('SELECT city, COUNT(*) FROM events GROUP BY city ORDER BY city'))
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM events').fetchone()[0]
+
+    def export_json(self, path: str, **filters) -> int:
+        """Write the events matching query(**filters) to a JSON file; returns how many"""
+        events = self.query(**filters)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(events, f, indent=4, ensure_ascii=False)
+        return len(events)
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+def main():
+    """Import event JSON files into the store, export a filtered view, or show what it holds"""
+    parser = argparse.ArgumentParser(description="Manage the scraped event store")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="Upsert events from JSON files")
+    import_parser.add_argument('files', nargs='+')
+    export_parser = subparsers.add_parser('export', help="Write stored events to a JSON file")
+    export_parser.add_argument('--output', default='all_luma_events.json')
+    export_parser.add_argument('--city', action='append', help="Only this city (repeatable)")
+    export_parser.add_argument('--since-hours', type=float, help="Only events seen in the last N hours")
+    subparsers.add_parser('stats', help="Show stored event counts per city")
+    args = parser.parse_args()
+
+    store = EventStore(args.db)
+    if args.command == 'import':
+        for path in args.files:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    events = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                print(f"Error reading {path}: {str(e)}")
+                continue
+            stats = store.upsert_events(events)
+            print(f"{path}: {stats.inserted} new, {stats.updated} changed, {stats.unchanged} unchanged "
+                  f"({stats.elapsed * 1000:.0f} ms)")
+    elif args.command == 'export':
+        seen_since = time.time() - args.since_hours * 3600 if args.since_hours else None
+        count = store.export_json(args.output, cities=args.city, seen_since=seen_since)
+        print(f"Exported {count} events to {args.output}")
+    else:
+        for city, count in store.cities().items():
+            print(f"{city}: {count} events")
+        print(f"Total: {store.count()} events")
+    store.close()
+
+if __name__ == "__main__":
+    main()
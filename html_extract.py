@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+HTML Extract
+Event card extraction for the Luma and Devpost scrapers with pluggable
+backends: 'bs4' is the original BeautifulSoup code, 'lxml' runs the same
+lookups as precompiled XPath over lxml's C parser and returns identical dicts
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from cssselect import HTMLTranslator
+    from lxml import etree
+except ImportError:
+    etree = None
+
+LOCATION_RE = re.compile(r'(online|virtual|remote|in-person|offline)', re.I)
+PRIZE_RE = re.compile(r'\$')
+
+def available_backends() -> List[str]:
+    """Extraction backends usable in this environment"""
+    return ['bs4', 'lxml'] if etree is not None else ['bs4']
+
+DEFAULT_BACKEND = 'lxml' if etree is not None else 'bs4'
+
+def _check_backend(backend: str):
+    if backend not in available_backends():
+        raise ValueError(f"backend must be one of {available_backends()}, got {backend!r}")
+
+# ---------------------------------------------------------------------------
+# bs4 backend: the scrapers' original extraction code, kept for parity tests
+
+def _luma_events_bs4(html: str, city: str) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    events = []
+
+    # Find all event content divs with the new class structure
+    event_divs = soup.find_all('div', class_=lambda x: x and 'event-content' in str(x))
+    print(f"\nFound {len(event_divs)} event divs in {city}")
+
+    for div in event_divs:
+        try:
+            # Get the event title from h3
+            title_elem = div.find('h3')
+            if not title_elem:
+                continue
+            title = title_elem.text.strip()
+
+            # Get the event link
+            event_link = ""
+            link_elem = div.find_parent().find('a', class_=lambda x: x and ('event-link' in str(x) or 'content-link' in str(x)))
+            if link_elem:
+                href = link_elem.get('href', '')
+                event_link = f"https://lu.ma{href}" if href.startswith('/') else href
+
+            # Get the event time
+            time_text = ""
+            time_div = div.find('div', class_='event-time')
+            if time_div:
+                time_span = time_div.find('span')
+                if time_span:
+                    time_text = time_span.text.strip()
+
+            # Get the location text (now using the SVG icon as a marker)
+            location_text = ""
+            location_divs = div.find_all('div', class_='attribute')
+            for loc_div in location_divs:
+                if loc_div.find('svg'):  # Location usually has an SVG icon
+                    location_text = loc_div.find('div', class_='text-ellipses')
+                    if location_text:
+                        location_text = location_text.text.strip()
+                        break
+
+            # Get the organizers
+            organizers = ""
+            org_div = div.find('div', class_='text-ellipses nowrap')
+            if org_div:
+                organizers = org_div.text.strip()
+
+            # Get the event status (e.g., "Near Capacity")
+            status = ""
+            status_div = div.find('div', class_='pill-label')
+            if status_div:
+                status = status_div.text.strip()
+
+            # Get the attendee count
+            attendee_count = ""
+            count_div = div.find('div', class_='remaining-count')
+            if count_div:
+                attendee_count = count_div.text.strip()
+
+            events.append(_luma_event(title, time_text, location_text, organizers, status,
+                                      attendee_count, event_link, city))
+        except Exception as e:
+            print(f"Error extracting event details: {str(e)}")
+            continue
+    return events
+
+def _devpost_cards_bs4(html: str) -> List[Dict]:
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = []
+
+    # Find hackathon cards
+    hackathon_cards = soup.find_all('div', class_='challenge-listing')
+    print(f"Found {len(hackathon_cards)} hackathon cards")
+
+    for card in hackathon_cards:
+        try:
+            # Extract title and URL
+            title_elem = card.find('h6') or card.find('h5') or card.find('a', class_='challenge-link-colorless')
+            if not title_elem:
+                continue
+
+            title = title_elem.get_text(strip=True)
+
+            # Get hackathon URL
+            url = ""
+            link_elem = card.find('a', class_='challenge-link-colorless')
+            if link_elem:
+                href = link_elem.get('href', '')
+                url = f"https://devpost.com{href}" if href.startswith('/') else href
+
+            # Extract date information
+            date = ""
+            date_elem = card.find('div', class_='challenge-meta') or card.find('time')
+            if date_elem:
+                date = date_elem.get_text(strip=True)
+
+            # Extract prize information
+            prize = ""
+            prize_elem = card.find('div', string=PRIZE_RE) or card.find(text=PRIZE_RE)
+            if prize_elem:
+                if hasattr(prize_elem, 'parent'):
+                    prize = prize_elem.parent.get_text(strip=True)
+                else:
+                    prize = str(prize_elem).strip()
+
+            # Extract description
+            description = ""
+            desc_elem = card.find('p') or card.find('div', class_='challenge-description')
+            if desc_elem:
+                description = desc_elem.get_text(strip=True)
+
+            # Extract tags
+            tags = []
+            tag_elements = card.find_all('span', class_='challenge-tag') or card.find_all('div', class_='tag')
+            for tag_elem in tag_elements:
+                tag_text = tag_elem.get_text(strip=True)
+                if tag_text:
+                    tags.append(tag_text)
+
+            # Extract location (online/offline)
+            location = "Online"  # Default to online
+            location_indicators = card.find_all(text=LOCATION_RE)
+            if location_indicators:
+                location = location_indicators[0].strip()
+
+            # Extract status (open, closed, upcoming)
+            status = "Unknown"
+            status_elem = card.find('div', class_='challenge-status') or card.find('span', class_='badge')
+            if status_elem:
+                status = status_elem.get_text(strip=True)
+
+            cards.append(_devpost_card(title, url, date, prize, description, tags, location, status))
+        except Exception as e:
+            print(f"Error extracting hackathon details: {str(e)}")
+            continue
+    return cards
+
+# ---------------------------------------------------------------------------
+# lxml backend: every lookup above as an XPath compiled once at import time.
+# Single-class lookups go through cssselect so class matching is per token,
+# like bs4's class_='name'.
+
+if etree is not None:
+    _TRANSLATOR = HTMLTranslator()
+
+    def _css(selector: str):
+        return etree.XPath(_TRANSLATOR.css_to_xpath(selector, prefix='descendant::'))
+
+    _TEXT = etree.XPath('descendant::text()')
+    _STRINGS = etree.XPath('descendant::text() | descendant::comment()')
+
+    _LUMA_CARDS = etree.XPath("//div[contains(@class, 'event-content')]")
+    _LUMA_TITLE = _css('h3')
+    _LUMA_LINK = etree.XPath("descendant::a[contains(@class, 'event-link') or contains(@class, 'content-link')]")
+    _LUMA_TIME = _css('div.event-time')
+    _LUMA_SPAN = _css('span')
+    _LUMA_ATTRIBUTES = _css('div.attribute')
+    _LUMA_SVG = _css('svg')
+    _LUMA_LOCATION = _css('div.text-ellipses')
+    _LUMA_ORGANIZERS = etree.XPath("descendant::div[normalize-space(@class) = 'text-ellipses nowrap']")
+    _LUMA_STATUS = _css('div.pill-label')
+    _LUMA_COUNT = _css('div.remaining-count')
+
+    _DEVPOST_CARDS = etree.XPath(_TRANSLATOR.css_to_xpath('div.challenge-listing'))
+    _DEVPOST_H6 = _css('h6')
+    _DEVPOST_H5 = _css('h5')
+    _DEVPOST_LINK = _css('a.challenge-link-colorless')
+    _DEVPOST_META = _css('div.challenge-meta')
+    _DEVPOST_TIME = _css('time')
+    _DEVPOST_DIVS = _css('div')
+    _DEVPOST_P = _css('p')
+    _DEVPOST_DESCRIPTION = _css('div.challenge-description')
+    _DEVPOST_TAGS = _css('span.challenge-tag')
+    _DEVPOST_TAG_DIVS = _css('div.tag')
+    _DEVPOST_STATUS = _css('div.challenge-status')
+    _DEVPOST_BADGE = _css('span.badge')
+
+def _first(xpath, element) -> Optional[Any]:
+    found = xpath(element)
+    return found[0] if found else None
+
+def _text(element) -> str:
+    """bs4's tag.text"""
+    return ''.join(_TEXT(element))
+
+def _text_stripped(element) -> str:
+    """bs4's tag.get_text(strip=True)"""
+    return ''.join(s.strip() for s in _TEXT(element))
+
+def _single_string(element) -> Optional[str]:
+    """bs4's tag.string: the only string under a chain of single-child tags, else None"""
+    while True:
+        children = [element.text] if element.text else []
+        for child in element:
+            children.append(child)
+            if child.tail:
+                children.append(child.tail)
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if isinstance(child, str):
+            return child
+        if child.tag is etree.Comment:
+            return child.text or ''
+        element = child
+
+def _strings(element) -> List[tuple]:
+    """(string, parent element) for every string under element, like bs4's find_all(text=...)"""
+    found = []
+    for node in _STRINGS(element):
+        if isinstance(node, str):
+            parent = node.getparent()
+            found.append((str(node), parent.getparent() if node.is_tail else parent))
+        else:
+            found.append((node.text or '', node.getparent()))
+    return found
+
+def _parse_lxml(html: str):
+    return etree.HTML(html) if html and html.strip() else None
+
+def _luma_events_lxml(html: str, city: str) -> List[Dict]:
+    root = _parse_lxml(html)
+    event_divs = _LUMA_CARDS(root) if root is not None else []
+    print(f"\nFound {len(event_divs)} event divs in {city}")
+
+    events = []
+    for div in event_divs:
+        try:
+            title_elem = _first(_LUMA_TITLE, div)
+            if title_elem is None:
+                continue
+            title = _text(title_elem).strip()
+
+            event_link = ""
+            link_elem = _first(_LUMA_LINK, div.getparent())
+            if link_elem is not None:
+                href = link_elem.get('href', '')
+                event_link = f"https://lu.ma{href}" if href.startswith('/') else href
+
+            time_text = ""
+            time_div = _first(_LUMA_TIME, div)
+            if time_div is not None:
+                time_span = _first(_LUMA_SPAN, time_div)
+                if time_span is not None:
+                    time_text = _text(time_span).strip()
+
+            location_text = ""
+            for loc_div in _LUMA_ATTRIBUTES(div):
+                if _LUMA_SVG(loc_div):
+                    location_elem = _first(_LUMA_LOCATION, loc_div)
+                    location_text = None
+                    if location_elem is not None:
+                        location_text = _text(location_elem).strip()
+                        break
+
+            org_div = _first(_LUMA_ORGANIZERS, div)
+            organizers = _text(org_div).strip() if org_div is not None else ""
+            status_div = _first(_LUMA_STATUS, div)
+            status = _text(status_div).strip() if status_div is not None else ""
+            count_div = _first(_LUMA_COUNT, div)
+            attendee_count = _text(count_div).strip() if count_div is not None else ""
+
+            events.append(_luma_event(title, time_text, location_text, organizers, status,
+                                      attendee_count, event_link, city))
+        except Exception as e:
+            print(f"Error extracting event details: {str(e)}")
+            continue
+    return events
+
+def _devpost_cards_lxml(html: str) -> List[Dict]:
+    root = _parse_lxml(html)
+    hackathon_cards = _DEVPOST_CARDS(root) if root is not None else []
+    print(f"Found {len(hackathon_cards)} hackathon cards")
+
+    cards = []
+    for card in hackathon_cards:
+        try:
+            link_elem = _first(_DEVPOST_LINK, card)
+            title_elem = _first(_DEVPOST_H6, card)
+            if title_elem is None:
+                title_elem = _first(_DEVPOST_H5, card)
+            if title_elem is None:
+                title_elem = link_elem
+            if title_elem is None:
+                continue
+            title = _text_stripped(title_elem)
+
+            url = ""
+            if link_elem is not None:
+                href = link_elem.get('href', '')
+                url = f"https://devpost.com{href}" if href.startswith('/') else href
+
+            date_elem = _first(_DEVPOST_META, card)
+            if date_elem is None:
+                date_elem = _first(_DEVPOST_TIME, card)
+            date = _text_stripped(date_elem) if date_elem is not None else ""
+
+            strings = _strings(card)
+            prize = ""
+            prize_div = next((d for d in _DEVPOST_DIVS(card)
+                              if PRIZE_RE.search(_single_string(d) or '')), None)
+            if prize_div is not None:
+                prize = _text_stripped(prize_div.getparent())
+            else:
+                prize_parent = next((parent for s, parent in strings if PRIZE_RE.search(s)), None)
+                if prize_parent is not None:
+                    prize = _text_stripped(prize_parent)
+
+            desc_elem = _first(_DEVPOST_P, card)
+            if desc_elem is None:
+                desc_elem = _first(_DEVPOST_DESCRIPTION, card)
+            description = _text_stripped(desc_elem) if desc_elem is not None else ""
+
+            tag_elements = _DEVPOST_TAGS(card) or _DEVPOST_TAG_DIVS(card)
+            tags = [text for text in map(_text_stripped, tag_elements) if text]
+
+            location = next((s.strip() for s, _ in strings if LOCATION_RE.search(s)), "Online")
+
+            status_elem = _first(_DEVPOST_STATUS, card)
+            if status_elem is None:
+                status_elem = _first(_DEVPOST_BADGE, card)
+            status = _text_stripped(status_elem) if status_elem is not None else "Unknown"
+
+            cards.append(_devpost_card(title, url, date, prize, description, tags, location, status))
+        except Exception as e:
+            print(f"Error extracting hackathon details: {str(e)}")
+            continue
+    return cards
+
+# ---------------------------------------------------------------------------
+
+def _luma_event(title, time_text, location_text, organizers, status, attendee_count, event_link, city) -> Dict:
+    return {
+        'title': title,
+        'date': time_text,
+        'location': location_text or city,
+        'organizers': organizers,
+        'status': status,
+        'attendees': attendee_count,
+        'link': event_link,
+        'description': f"Organized by {organizers}. {status} {attendee_count} attendees.",
+        'city': city
+    }
+
+def _devpost_card(title, url, date, prize, description, tags, location, status) -> Dict:
+    return {
+        'title': title,
+        'url': url,
+        'date': date,
+        'prize': prize,
+        'description': description,
+        'tags': tags,
+        'location': location,
+        'status': status
+    }
+
+def extract_luma_events(html: str, city: str, backend: str = DEFAULT_BACKEND) -> List[Dict]:
+    """Event dicts for every event card on a rendered Luma city page"""
+    _check_backend(backend)
+    if backend == 'lxml':
+        return _luma_events_lxml(html, city)
+    return _luma_events_bs4(html, city)
+
+def extract_devpost_cards(html: str, backend: str = DEFAULT_BACKEND) -> List[Dict]:
+    """Raw fields of every challenge card on a rendered Devpost listing page
+
+    Status is the card's own badge; the scraper applies its date-based
+    override and the beginner-friendly check on top.
+    """
+    _check_backend(backend)
+    if backend == 'lxml':
+        return _devpost_cards_lxml(html)
+    return _devpost_cards_bs4(html)
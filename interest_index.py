@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Interest Index
+Local candidate generation for the event matcher: ranks events against two
+people's interests with an inverted index so only a shortlist goes to the LLM
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+# Fields that are indexed, with the weight a term hit in that field carries
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'organizers': 1.5,
+    'location': 1.0,
+    'city': 0.5,
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'the', 'to', 'with', 'you', 'your', 'our', 'we', 'are',
+    'be', 'here', 'new', 'amp', 'others'
+}
+
+# Interest terms that commonly show up in event text under a different word.
+# Keys are written as plain words and stemmed below, since lookups happen on
+# normalized terms.
+TERM_SYNONYMS = {
+    'ai': ['artificial', 'intelligence', 'ml', 'llm'],
+    'artificial': ['ai'],
+    'intelligence': ['ai'],
+    'startup': ['founder', 'pitch', 'vc'],
+    'entrepreneurship': ['founder', 'startup', 'pitch'],
+    'entrepreneur': ['founder', 'startup'],
+    'technology': ['tech'],
+    'tech': ['technology'],
+    'music': ['concert', 'dj', 'band', 'gig'],
+    'hiking': ['hike', 'trail'],
+    'nature': ['park', 'garden', 'outdoor', 'trail'],
+    'walk': ['stroll'],
+    'drawing': ['sketch', 'illustration', 'painting'],
+    'festival': ['celebration', 'fest'],
+    'market': ['bazaar', 'fair'],
+    'networking': ['mixer', 'meetup'],
+    'game': ['trivia'],
+    'food': ['dinner', 'brunch', 'tasting', 'culinary'],
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9&+'-]*")
+
+
+def _stem(token: str) -> str:
+    """Very small suffix stripper so 'hackathons' and 'hackathon' share a term"""
+    for suffix in ('ing', 'ers', 'es', 's'):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def normalize_terms(text: str) -> List[str]:
+    """Lowercase, tokenize, drop stopwords and stem a piece of free text"""
+    if not text:
+        return []
+    tokens = _TOKEN_RE.findall(text.lower().replace('’', "'"))
+    return [_stem(t.strip("'-")) for t in tokens if t.strip("'-") and t not in STOPWORDS]
+
+
+_STEMMED_SYNONYMS: Dict[str, List[str]] = {}
+for _word, _synonyms in TERM_SYNONYMS.items():
+    _STEMMED_SYNONYMS.setdefault(_stem(_word), []).extend(_synonyms)
+
+
+def expand_interest(interest: str) -> Set[str]:
+    """Normalized terms for an interest, including its synonyms"""
+    terms = set(normalize_terms(interest))
+    for term in list(terms):
+        for synonym in _STEMMED_SYNONYMS.get(term, []):
+            terms.update(normalize_terms(synonym))
+    return terms
+
+
+class InterestIndex:
+    def __init__(self, events: List[Dict]):
+        """Build an inverted index from normalized terms to event positions"""
+        self.events = events
+        # term -> {event index: accumulated field weight}
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for i, event in enumerate(events):
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in set(normalize_terms(str(event.get(field, '')))):
+                    self.postings[term][i] = self.postings[term].get(i, 0.0) + weight
+
+    def score_interests(self, interests: List[str]) -> Dict[int, float]:
+        """Score every event that shares a term with any of the interests"""
+        scores: Dict[int, float] = defaultdict(float)
+        for interest in interests:
+            terms = expand_interest(interest)
+            if not terms:
+                continue
+            # Each interest contributes at most its best field hit per event,
+            # so multi-word interests don't outweigh single-word ones
+            interest_scores: Dict[int, float] = {}
+            for term in terms:
+                for event_idx, weight in self.postings.get(term, {}).items():
+                    interest_scores[event_idx] = max(interest_scores.get(event_idx, 0.0), weight)
+            for event_idx, weight in interest_scores.items():
+                scores[event_idx] += weight
+        return scores
+
+    def rank(self, interests1: List[str], interests2: List[str]) -> List[Tuple[int, float]]:
+        """Rank all events for a pair, best first; events that interest both people win ties"""
+        scores1 = self.score_interests(interests1)
+        scores2 = self.score_interests(interests2)
+        ranked = []
+        for i in range(len(self.events)):
+            s1, s2 = scores1.get(i, 0.0), scores2.get(i, 0.0)
+            # Reward events that appeal to both people over ones that only one likes a lot
+            combined = s1 + s2 + 2.0 * min(s1, s2)
+            ranked.append((i, combined))
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
+
+    def shortlist(self, interests1: List[str], interests2: List[str], top_k: int) -> List[Dict]:
+        """Return the top_k events for a pair, preserving catalog order among them"""
+        if top_k is None or top_k >= len(self.events):
+            return list(self.events)
+        keep = sorted(i for i, _ in self.rank(interests1, interests2)[:top_k])
+        return [self.events[i] for i in keep]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+Persistent, content-addressed cache for chat completions so identical
+prompts are answered from disk instead of another paid API round trip
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_CACHE_PATH = 'llm_cache.sqlite3'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    latency_saved: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Open (or create) the cache database
+
+        Entries older than ttl_seconds are treated as misses (None disables
+        expiry). Once the stored responses exceed max_bytes the least recently
+        used entries are evicted. SQLite's file locking makes the cache safe
+        to share between processes; each thread gets its own connection.
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_schema()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+        """Hash the request parameters that determine the completion"""
+        payload = json.dumps({
+            'model': model,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+            'prompt': prompt
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)')
+
+    def _bump(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                setattr(self.stats, name, getattr(self.stats, name) + delta)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or expired entry"""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            'SELECT response, latency, created_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self._bump(misses=1)
+            return None
+
+        response, latency, created_at = row
+        if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+            conn.execute('DELETE FROM responses WHERE key = ? AND created_at = ?', (key, created_at))
+            self._bump(misses=1, evictions=1)
+            return None
+
+        conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        self._bump(hits=1, latency_saved=latency)
+        return response
+
+    def put(self, key: str, response: str, latency: float):
+        """Store a response along with how long the API took to produce it"""
+        conn = self._connect()
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, size, latency, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, response, size, latency, now, now)
+            )
+            evicted = self._evict(conn, now)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._bump(stores=1, evictions=evicted)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        evicted = 0
+        if self.ttl_seconds is not None:
+            evicted += conn.execute(
+                'DELETE FROM responses WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).rowcount
+
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+
+        stale_keys = []
+        for key, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed_at ASC'):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM responses WHERE key = ?', stale_keys)
+        return evicted + len(stale_keys)
+
+    def clear(self):
+        """Remove every cached response"""
+        self._connect().execute('DELETE FROM responses')
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def print_stats(self):
+        """Print hit/miss counters and the API time saved"""
+        s = self.stats
+        print(f"\nLLM cache: {s.hits} hits, {s.misses} misses ({s.hit_rate:.0%} hit rate), "
+              f"{s.stores} stored, {s.evictions} evicted, ~{s.latency_saved:.1f}s of API latency saved")
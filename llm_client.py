@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+LLM Client
+Shared HTTP layer for chat completion calls: a pooled keep-alive session,
+connect/read timeouts, jittered exponential retries on 5xx and 429,
+optional hedged requests, and per-request latency histograms
+"""
+
+import bisect
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Histogram bucket upper bounds in seconds (roughly 1-2-5 steps from 10ms to 5min)
+LATENCY_BUCKETS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300]
+
+class LatencyHistogram:
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS, max_samples: int = 1000):
+        """Bucketed latency histogram that also keeps recent samples for percentiles"""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.samples: List[float] = []
+        self.max_samples = max_samples
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+            self.samples.append(seconds)
+            if len(self.samples) > self.max_samples:
+                del self.samples[:len(self.samples) - self.max_samples]
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p-th percentile (0-100) over the recent samples, or None if empty"""
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        rank = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+        return ordered[rank]
+
+    def summary(self) -> Dict:
+        count = self.count
+        return {
+            'count': count,
+            'mean': self.total / count if count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {
+                (f"<={bound}s" if i < len(self.buckets) else f">{self.buckets[-1]}s"): n
+                for i, (bound, n) in enumerate(zip(self.buckets + [None], self.counts)) if n
+            }
+        }
+
+class LLMClient:
+    def __init__(self, api_url: str, api_key: Optional[str], connect_timeout: float = 5.0,
+                 read_timeout: float = 120.0, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0, hedge: bool = False, hedge_after: Optional[float] = None,
+                 hedge_min_samples: int = 20, pool_size: int = 10, rate_limiter=None):
+        """Create a client that can be shared by every matcher in the process
+
+        Retries back off with full jitter (a random sleep up to
+        backoff_base * 2**attempt, capped at backoff_max) and honour
+        Retry-After on 429. With hedge enabled, a non-streaming request that
+        hasn't answered after hedge_after seconds (default: the observed p95
+        once hedge_min_samples requests have completed) gets a duplicate, and
+        whichever reply arrives first is used.
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedge_min_samples = hedge_min_samples
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size * 2) if hedge else None
+
+        self.latency = LatencyHistogram()
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'hedges': 0, 'hedge_wins': 0}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _send(self, payload: Dict, stream: bool) -> requests.Response:
+        """One HTTP attempt, timed into the latency histogram"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        start = time.perf_counter()
+        response = self.session.post(self.api_url, headers=headers, json=payload,
+                                     timeout=self.timeout, stream=stream)
+        self.latency.record(time.perf_counter() - start)
+        self._count('requests')
+        return response
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if self.latency.count >= self.hedge_min_samples:
+            return self.latency.percentile(95)
+        return None
+
+    def _send_hedged(self, payload: Dict) -> requests.Response:
+        """Send, and if the reply is slower than the hedge delay, race a duplicate"""
+        delay = self._hedge_delay()
+        primary = self._hedge_pool.submit(self._send, payload, False)
+        if delay is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count('hedges')
+        backup = self._hedge_pool.submit(self._send, payload, False)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                if future is backup:
+                    self._count('hedge_wins')
+                # The loser is left to finish in the background and is discarded
+                for loser in pending:
+                    loser.add_done_callback(lambda f: f.exception() or f.result().close())
+                return response
+        raise error
+
+    def post(self, payload: Dict, stream: bool = False) -> Optional[requests.Response]:
+        """POST a chat completion payload, retrying transient failures
+
+        Returns the final response (which may still be an error status), or
+        None if every attempt failed at the connection level.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._local.retries = attempt
+            try:
+                if self.hedge and not stream:
+                    response = self._send_hedged(payload)
+                else:
+                    response = self._send(payload, stream)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    print(f"Error contacting LLM API after {attempt + 1} attempts: {str(e)}")
+                    self._count('failures')
+                    return None
+                wait_for = self._backoff(attempt)
+                print(f"LLM request failed ({type(e).__name__}), retrying in {wait_for:.1f}s")
+                self._count('retries')
+                time.sleep(wait_for)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                if response.status_code == 200:
+                    if self.rate_limiter:
+                        self.rate_limiter.on_success()
+                else:
+                    self._count('failures')
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+            response.close()
+            if response.status_code == 429 and self.rate_limiter:
+                self.rate_limiter.on_throttle(float(retry_after) if retry_after and retry_after.isdigit() else None)
+                wait_for = 0.0
+            else:
+                wait_for = self._backoff(attempt, retry_after)
+            print(f"LLM API returned {response.status_code}, retrying (attempt {attempt + 1})")
+            self._count('retries')
+            time.sleep(wait_for)
+        return None
+
+    @property
+    def last_retries(self) -> int:
+        """Retries made by the calling thread's most recent post()"""
+        return getattr(self._local, 'retries', 0)
+
+    def stats(self) -> Dict:
+        """Counters plus the latency histogram summary"""
+        with self._lock:
+            counters = dict(self.counters)
+        counters['latency'] = self.latency.summary()
+        return counters
+
+    def print_stats(self):
+        s = self.stats()
+        lat = s['latency']
+        if not lat['count']:
+            return
+        print(f"\nLLM requests: {s['requests']} sent, {s['retries']} retries, {s['failures']} failed, "
+              f"{s['hedges']} hedged ({s['hedge_wins']} won by the hedge)")
+        print(f"Latency: p50 {lat['p50']:.2f}s, p95 {lat['p95']:.2f}s, p99 {lat['p99']:.2f}s")
+
+    def close(self):
+        self.session.close()
+        if self._hedge_pool:
+            self._hedge_pool.shutdown(wait=False)
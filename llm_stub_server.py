@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Local LLM Stub Server
+Minimal stand-in for the DeepSeek chat completions endpoint, for exercising
+the matcher offline. Point the matcher at it with
+DEEPSEEK_API_URL=http://127.0.0.1:<port>/v1/chat/completions
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Union
+
+DEFAULT_REPLY = """Here are the top 3 events that would be best for both people to attend together, ordered by match score:
+
+---
+
+1. Stub Event
+Date: 6:00 PM
+Location: Stub Venue
+City: New York
+Organizers: By Stub Organizer
+Status:
+Attendees: +10
+Link: https://lu.ma/stub
+Match Score: 8/10
+Why this matches: Canned response from the local stub server.
+Person 1's Matching Interests: coffee
+Person 2's Matching Interests: coffee
+"""
+
+class StubLLMServer:
+    def __init__(self, reply: str = DEFAULT_REPLY, host: str = '127.0.0.1', port: int = 0,
+                 chunk_size: int = 16, chunk_delay: float = 0.0,
+                 latency: Union[float, Callable[[int], float]] = 0.0,
+                 fail_statuses: Optional[List[int]] = None):
+        """Create a stub server that answers every completion with reply
+
+        Streaming requests get the reply as server-sent events of chunk_size
+        characters, chunk_delay seconds apart. latency delays every response,
+        either by a fixed number of seconds or by a function of the 1-based
+        request number. fail_statuses are returned, in order, to the first
+        requests instead of a completion (e.g. [503, 429]).
+        """
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.latency = latency
+        self.fail_statuses = list(fail_statuses or [])
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    @property
+    def request_count(self) -> int:
+        with self._lock:
+            return len(self.requests)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    self._send_json(400, {'error': {'message': 'invalid JSON body'}})
+                    return
+                with stub._lock:
+                    stub.requests.append(payload)
+                    request_number = len(stub.requests)
+                    failure = stub.fail_statuses.pop(0) if stub.fail_statuses else None
+
+                delay = stub.latency(request_number) if callable(stub.latency) else stub.latency
+                if delay:
+                    time.sleep(delay)
+                if failure is not None:
+                    self.send_response(failure)
+                    if failure == 429:
+                        self.send_header('Retry-After', '1')
+                    self.send_header('Content-Type', 'application/json')
+                    body = json.dumps({'error': {'message': f'injected failure {failure}'}}).encode('utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                stub.handle_completion(self, payload)
+
+            def _send_json(self, status: int, body: Dict):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def handle_completion(self, handler: BaseHTTPRequestHandler, payload: Dict):
+        """Answer one chat completion request"""
+        if payload.get('stream'):
+            self.stream_completion(handler, payload)
+            return
+        handler._send_json(200, {
+            'id': f"stub-{self.request_count}",
+            'object': 'chat.completion',
+            'model': payload.get('model', 'deepseek-chat'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': self.reply},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': sum(len(m.get('content', '')) for m in payload.get('messages', [])) // 4,
+                'completion_tokens': len(self.reply) // 4,
+                'total_tokens': 0
+            }
+        })
+
+    def stream_completion(self, handler: BaseHTTPRequestHandler, payload: Dict):
+        """Send the reply as an OpenAI-style server-sent event stream"""
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.end_headers()
+
+        def send_event(data: str):
+            handler.wfile.write(f"data: {data}\n\n".encode('utf-8'))
+            handler.wfile.flush()
+
+        for i in range(0, len(self.reply), self.chunk_size):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            send_event(json.dumps({
+                'object': 'chat.completion.chunk',
+                'model': payload.get('model', 'deepseek-chat'),
+                'choices': [{
+                    'index': 0,
+                    'delta': {'content': self.reply[i:i + self.chunk_size]},
+                    'finish_reason': None
+                }]
+            }))
+        if (payload.get('stream_options') or {}).get('include_usage'):
+            send_event(json.dumps({
+                'object': 'chat.completion.chunk',
+                'model': payload.get('model', 'deepseek-chat'),
+                'choices': [],
+                'usage': {
+                    'prompt_tokens': sum(len(m.get('content', '')) for m in payload.get('messages', [])) // 4,
+                    'completion_tokens': len(self.reply) // 4,
+                    'total_tokens': 0
+                }
+            }))
+        send_event('[DONE]')
+        handler.close_connection = True
+
+    def start(self) -> 'StubLLMServer':
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubLLMServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stub for the DeepSeek chat completions API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--reply-file', help="File whose contents are returned as the completion")
+    parser.add_argument('--chunk-delay', type=float, default=0.0,
+                        help="Seconds between streamed chunks")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay every response")
+    parser.add_argument('--fail', type=int, nargs='*', default=[],
+                        help="HTTP statuses to return for the first requests, in order")
+    args = parser.parse_args()
+
+    reply = DEFAULT_REPLY
+    if args.reply_file:
+        with open(args.reply_file, 'r', encoding='utf-8') as f:
+            reply = f.read()
+
+    server = StubLLMServer(reply=reply, port=args.port, chunk_delay=args.chunk_delay,
+                           latency=args.latency, fail_statuses=args.fail)
+    print(f"Stub LLM server listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+if __name__ == "__main__":
+    main()
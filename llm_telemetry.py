@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+LLM Telemetry
+Appends one JSON record per LLM request (prompt hash, event count, token
+usage, latency, time to first byte, cache hit, retries and status) to a
+JSONL log from a background writer thread, and summarizes the log over a
+time window
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_TELEMETRY_PATH = 'requests.jsonl'
+TELEMETRY_PATH_ENV = 'LLM_TELEMETRY_PATH'
+
+_STOP = object()
+
+def telemetry_path() -> Optional[str]:
+    """The log path from LLM_TELEMETRY_PATH (default requests.jsonl); 'off' or empty disables logging"""
+    path = os.getenv(TELEMETRY_PATH_ENV, DEFAULT_TELEMETRY_PATH).strip()
+    return None if path.lower() in ('', 'off', 'none') else path
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+@dataclass
+class RequestRecord:
+    ts: float
+    kind: str                                # 'complete', 'stream' or 'map'
+    model: str
+    prompt_hash: str
+    prompt_chars: int
+    events: Optional[int] = None             # events in the prompt, when the caller knows
+    json_mode: bool = False
+    cache_hit: bool = False
+    status: str = 'ok'                       # ok, http_<code>, no_api_key, connection_error or error
+    retries: int = 0
+    prompt_tokens: Optional[int] = None      # from the API's usage field
+    completion_tokens: Optional[int] = None
+    latency: Optional[float] = None          # wall seconds for the whole call
+    ttfb: Optional[float] = None             # seconds until response headers (or the first streamed line)
+    matches: Optional[int] = None            # match blocks, or candidates picked for 'map' requests
+
+class TelemetryLog:
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 1.0, max_pending: int = 10000):
+        """Buffered, append-only JSONL log written by a daemon thread
+
+        log() never blocks the request path: records are queued, and the
+        writer serializes and appends whatever has accumulated every
+        flush_interval seconds. If more than max_pending records are waiting,
+        new ones are dropped and counted rather than slowing callers down.
+        """
+        self.path = path or telemetry_path() or DEFAULT_TELEMETRY_PATH
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name='llm-telemetry', daemon=True)
+        self._thread.start()
+
+    def log(self, record: RequestRecord):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        f = None
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = _STOP in batch
+            lines = [json.dumps(asdict(r), ensure_ascii=False) + '\n' for r in batch if r is not _STOP]
+            if not lines:
+                continue
+            try:
+                if f is None:
+                    f = open(self.path, 'a', encoding='utf-8')
+                f.writelines(lines)
+                f.flush()
+                self.written += len(lines)
+            except OSError as e:
+                self.dropped += len(lines)
+                print(f"Error writing LLM telemetry to {self.path}: {str(e)}")
+        if f is not None:
+            f.close()
+
+    def close(self, timeout: float = 5.0):
+        """Flush everything queued so far and stop the writer"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+_shared_log: Optional[TelemetryLog] = None
+_shared_lock = threading.Lock()
+
+def shared_telemetry() -> Optional[TelemetryLog]:
+    """The process-wide log every EventMatcher writes to by default, or None when disabled"""
+    global _shared_log
+    path = telemetry_path()
+    if path is None:
+        return None
+    with _shared_lock:
+        if _shared_log is None:
+            _shared_log = TelemetryLog(path)
+            atexit.register(_shared_log.close)
+        return _shared_log
+
+def read_records(path: str, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+    """Records from a telemetry log within [since, until), skipping lines that aren't request records"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            ts = record.get('ts') if isinstance(record, dict) else None
+            if not isinstance(ts, (int, float)):
+                continue
+            if (since is None or ts >= since) and (until is None or ts < until):
+                yield record
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+
+    def pick(p: float) -> Optional[float]:
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'max': ordered[-1] if ordered else None}
+
+def summarize(records: List[Dict]) -> Dict:
+    """Request counts, latency and TTFB percentiles, and token usage per match"""
+    sent = [r for r in records if not r.get('cache_hit')]
+    ok = [r for r in sent if r.get('status') == 'ok']
+    statuses: Dict[str, int] = {}
+    for r in records:
+        statuses[r.get('status', 'unknown')] = statuses.get(r.get('status', 'unknown'), 0) + 1
+
+    prompt_tokens = sum(r.get('prompt_tokens') or 0 for r in sent)
+    completion_tokens = sum(r.get('completion_tokens') or 0 for r in sent)
+    # Tokens per match counts requests that produced matches and reported usage, plus
+    # every map-stage request of map-reduce runs: those only pick candidates (their
+    # matches field holds the picks), but their tokens are part of what the final
+    # matches cost
+    scored = [r for r in ok if r.get('kind') != 'map' and r.get('matches') and r.get('prompt_tokens') is not None]
+    mapped = [r for r in ok if r.get('kind') == 'map' and r.get('prompt_tokens') is not None]
+    scored_matches = sum(r['matches'] for r in scored)
+    scored_tokens = sum(r['prompt_tokens'] + (r.get('completion_tokens') or 0) for r in scored + mapped)
+
+    return {
+        'requests': len(records),
+        'sent': len(sent),
+        'cache_hits': len(records) - len(sent),
+        'statuses': statuses,
+        'retries': sum(r.get('retries') or 0 for r in records),
+        'latency': _percentiles([r['latency'] for r in ok if r.get('latency') is not None]),
+        'ttfb': _percentiles([r['ttfb'] for r in ok if r.get('ttfb') is not None]),
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'matches': sum(r.get('matches') or 0 for r in records if r.get('kind') != 'map'),
+        'map_picks': sum(r.get('matches') or 0 for r in records if r.get('kind') == 'map'),
+        'tokens_per_match': scored_tokens / scored_matches if scored_matches else None,
+        'first': min((r['ts'] for r in records), default=None),
+        'last': max((r['ts'] for r in records), default=None)
+    }
+
+def print_summary(summary: Dict):
+    if not summary['requests']:
+        print("No LLM requests in this window")
+        return
+    first = time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['first']))
+    last = time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['last']))
+    print(f"{summary['requests']} LLM requests from {first} to {last}: {summary['sent']} sent, "
+          f"{summary['cache_hits']} served from cache, {summary['retries']} retries")
+    print("Statuses: " + ', '.join(f"{status} {n}" for status, n in sorted(summary['statuses'].items())))
+    for name in ('latency', 'ttfb'):
+        p = summary[name]
+        if p['p50'] is not None:
+            print(f"{name.upper() if name == 'ttfb' else name.title()}: p50 {p['p50']:.2f}s, "
+                  f"p95 {p['p95']:.2f}s, p99 {p['p99']:.2f}s, max {p['max']:.2f}s")
+    print(f"Tokens: {summary['prompt_tokens']:,} prompt, {summary['completion_tokens']:,} completion")
+    if summary['tokens_per_match'] is not None:
+        picks = f", map stage included ({summary['map_picks']} picks)" if summary['map_picks'] else ""
+        print(f"Tokens per match: {summary['tokens_per_match']:,.0f} ({summary['matches']} matches{picks})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the LLM request telemetry log")
+    parser.add_argument('--path', default=telemetry_path() or DEFAULT_TELEMETRY_PATH)
+    parser.add_argument('--since-hours', type=float, help="Only requests from the last N hours")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    since = time.time() - args.since_hours * 3600 if args.since_hours else None
+    try:
+        summary = summarize(list(read_records(args.path, since)))
+    except FileNotFoundError:
+        print(f"Error: {args.path} not found")
+        return
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Location Resolver
+Maps free-form locations ("Brooklyn, NY", "Pasadena, CA") onto the cities in
+a table-driven registry (cities.json) using one precompiled, word-anchored
+alias regex and an LRU cache, reporting Unknown instead of guessing
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cities.json')
+UNKNOWN = 'Unknown'
+
+# Confidence by how the city was found
+EXACT_CONFIDENCE = 1.0      # the whole location is an alias
+ALIAS_CONFIDENCE = 0.9      # an alias appears as whole words in the location
+REGION_CONFIDENCE = 0.6     # only a state/province matched, and it has one city
+AMBIGUOUS_CONFIDENCE = 0.4  # only a state/province matched, shared by several cities
+
+@dataclass
+class CityEntry:
+    name: str
+    luma_url: Optional[str] = None
+    aliases: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+
+@dataclass(frozen=True)
+class Resolution:
+    location: str
+    city: str
+    confidence: float
+    matched: str = ''
+
+    @property
+    def known(self) -> bool:
+        return self.city != UNKNOWN
+
+def normalize_location(location: str) -> str:
+    return ' '.join((location or '').lower().split())
+
+def _alternation(terms: List[str]) -> re.Pattern:
+    """Regex matching any term as whole words, preferring the longest term at a position"""
+    ordered = sorted(set(terms), key=len, reverse=True)
+    return re.compile(r'(?<!\w)(' + '|'.join(re.escape(t) for t in ordered) + r')(?!\w)')
+
+class CityRegistry:
+    def __init__(self, cities: List[CityEntry], default_city: Optional[str] = None, cache_size: int = 4096):
+        """Compile the alias and region tables of a list of cities
+
+        default_city is not used by resolve(); it is the registry's choice for
+        callers that must pick some city when a location is Unknown.
+        """
+        self.cities = cities
+        self.default_city = default_city
+        self.alias_to_city: Dict[str, str] = {}
+        self.region_to_cities: Dict[str, List[str]] = {}
+        for city in cities:
+            for alias in [city.name] + city.aliases:
+                self.alias_to_city.setdefault(normalize_location(alias), city.name)
+            for region in city.regions:
+                self.region_to_cities.setdefault(normalize_location(region), []).append(city.name)
+        self._alias_re = _alternation(list(self.alias_to_city))
+        self._region_re = _alternation(list(self.region_to_cities)) if self.region_to_cities else None
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve_normalized)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_REGISTRY_PATH) -> 'CityRegistry':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        cities = [CityEntry(**entry) for entry in data.get('cities', [])]
+        return cls(cities, default_city=data.get('default_city'))
+
+    def luma_urls(self) -> Dict[str, str]:
+        """City name -> Luma city page, for every city that has one"""
+        return {city.name: city.luma_url for city in self.cities if city.luma_url}
+
+    def _region(self, location: str) -> Optional[str]:
+        """The state or province a location names, if any
+
+        Regions only count after the locality ("Pasadena, CA"), or as the last
+        word when there's no comma, so "on" in prose is ignored.
+        """
+        if not self._region_re:
+            return None
+        head, sep, tail = location.partition(',')
+        region_text = tail if sep else location.rsplit(' ', 1)[-1]
+        match = self._region_re.search(region_text.replace('.', ''))
+        return match.group(1) if match else None
+
+    def _resolve_normalized(self, location: str) -> Resolution:
+        if location in self.alias_to_city:
+            return Resolution(location, self.alias_to_city[location], EXACT_CONFIDENCE, location)
+
+        region = self._region(location)
+        candidates = self.region_to_cities[region] if region else []
+
+        # Leftmost whole-word alias, so "new york" wins over the "york" inside it. An alias
+        # that the region contradicts ("Manhattan Beach, CA") is a different place, so
+        # keep looking for a later one that fits ("Queens Road, Los Angeles, CA")
+        for match in self._alias_re.finditer(location):
+            alias = match.group(1)
+            city = self.alias_to_city[alias]
+            if not candidates or city in candidates:
+                return Resolution(location, city, ALIAS_CONFIDENCE, alias)
+
+        if candidates:
+            confidence = REGION_CONFIDENCE if len(candidates) == 1 else AMBIGUOUS_CONFIDENCE
+            return Resolution(location, candidates[0], confidence, region)
+
+        return Resolution(location, UNKNOWN, 0.0)
+
+    def resolve(self, location: str) -> Resolution:
+        """Resolve one location; the city is UNKNOWN (confidence 0) when nothing matches"""
+        return self._resolve_cached(normalize_location(location))
+
+    def resolve_many(self, locations: List[str]) -> List[Resolution]:
+        """Resolve a list of locations, doing the work once per distinct normalized location"""
+        resolved: Dict[str, Resolution] = {}
+        results = []
+        for location in locations:
+            key = normalize_location(location)
+            if key not in resolved:
+                resolved[key] = self._resolve_cached(key)
+            results.append(resolved[key])
+        return results
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+@lru_cache(maxsize=None)
+def load_registry(path: str = DEFAULT_REGISTRY_PATH) -> CityRegistry:
+    """The registry stored at path, loaded once per process"""
+    return CityRegistry.from_file(path)
+
+def resolve_location(location: str) -> Resolution:
+    return load_registry().resolve(location)
+
+def resolve_many(locations: List[str]) -> List[Resolution]:
+    return load_registry().resolve_many(locations)
+
+def main():
+    """Resolve locations given as arguments, or one per line on stdin"""
+    parser = argparse.ArgumentParser(description="Map free-form locations onto registry cities")
+    parser.add_argument('locations', nargs='*', help="Locations to resolve; reads stdin if omitted")
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_PATH)
+    args = parser.parse_args()
+
+    registry = load_registry(args.registry)
+    locations = args.locations or [line.rstrip('\n') for line in sys.stdin if line.strip()]
+    for resolution in registry.resolve_many(locations):
+        print(json.dumps({'location': resolution.location, 'city': resolution.city,
+                          'confidence': resolution.confidence, 'matched': resolution.matched}))
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,29 @@ Simplified Luma Event Scraper for Two People
 Finds in-person events that match both people's interests and profiles
 """
 
+import argparse
 import json
 import os
+import re
 import time
 import platform
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
+from zoneinfo import ZoneInfo
 from bs4 import BeautifulSoup
 import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.core.os_manager import ChromeType
 from dotenv import load_dotenv
+from browser_pool import BrowserPool, shared_pool
+from event_store import DEFAULT_STORE_PATH, EventStore
+from html_extract import DEFAULT_BACKEND, extract_luma_events
+from location_resolver import Resolution, load_registry
+from scrape_waits import PhaseTimer, wait_for_count_stable, wait_for_network_idle
 
 
 @dataclass
@@ -35,265 +41,344 @@ class Person:
     def from_json(cls, json_data: Dict[str, Any]) -> 'Person':
         return cls(**json_data)
 
+EVENT_CARD_SELECTOR = 'div[class*="event-content"]'
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+def _format_organizers(hosts: List[Dict]) -> str:
+    """Format hosts the way event cards show them, e.g. 'By A, B & 2 others'"""
+    names = [h.get('name', '').strip() for h in hosts if h.get('name', '').strip()]
+    if not names:
+        return ""
+    if len(names) == 1:
+        return f"By {names[0]}"
+    if len(names) <= 4:
+        return f"By {', '.join(names[:-1])} & {names[-1]}"
+    return f"By {', '.join(names[:4])} & {len(names) - 4} others"
+
+def _format_guest_count(count: Optional[int]) -> str:
+    """Format a guest count like the card badge, e.g. '+411' or '+1.5K'"""
+    if not count:
+        return ""
+    if count >= 1000:
+        return f"+{count / 1000:.1f}".rstrip('0').rstrip('.') + "K"
+    return f"+{count}"
+
+def _format_ticket_status(ticket: Dict) -> str:
+    """Derive the card's status pill from ticket info"""
+    if not ticket:
+        return ""
+    if ticket.get('is_sold_out'):
+        return "Sold Out"
+    if ticket.get('is_waitlist_active'):
+        return "Waitlist"
+    if ticket.get('is_near_capacity'):
+        return "Near Capacity"
+    price = ticket.get('price') or {}
+    if not ticket.get('is_free', True) and price.get('cents'):
+        amount = f"${price['cents'] / 100:g}"
+        return f"Suggested: {amount}" if ticket.get('is_flexible') else amount
+    return ""
+
+def _format_start_time(start_at: str, timezone: str) -> str:
+    """Local start time as shown on cards, e.g. '7:30 AM'"""
+    if not start_at:
+        return ""
+    try:
+        start = datetime.fromisoformat(start_at.replace('Z', '+00:00'))
+        if timezone:
+            start = start.astimezone(ZoneInfo(timezone))
+        return start.strftime('%I:%M %p').lstrip('0')
+    except (ValueError, KeyError):
+        return ""
+
+def _find_event_entries(node: Any, found: List[Dict]):
+    """Collect every {'event': {...}} entry anywhere in the Next.js payload"""
+    if isinstance(node, dict):
+        event = node.get('event')
+        if isinstance(event, dict) and event.get('name') and event.get('url'):
+            found.append(node)
+            return
+        for value in node.values():
+            _find_event_entries(value, found)
+    elif isinstance(node, list):
+        for item in node:
+            _find_event_entries(item, found)
+
+def parse_next_data_events(html: str, city: str) -> List[Dict]:
+    """Extract events from the server-rendered __NEXT_DATA__ JSON of a Luma page"""
+    match = NEXT_DATA_RE.search(html)
+    if not match:
+        return []
+    data = json.loads(match.group(1))
+
+    entries: List[Dict] = []
+    _find_event_entries(data, entries)
+
+    events = []
+    seen = set()
+    for entry in entries:
+        event = entry['event']
+        url = event['url']
+        if url in seen:
+            continue
+        seen.add(url)
+
+        address = event.get('geo_address_info') or {}
+        organizers = _format_organizers(entry.get('hosts') or [])
+        status = _format_ticket_status(entry.get('ticket_info') or {})
+        attendee_count = _format_guest_count(entry.get('guest_count'))
+        events.append({
+            'title': event['name'].strip(),
+            'date': _format_start_time(event.get('start_at', ''), event.get('timezone', '')),
+            'location': address.get('address') or address.get('full_address') or city,
+            'organizers': organizers,
+            'status': status,
+            'attendees': attendee_count,
+            'link': url if url.startswith('http') else f"https://lu.ma/{url.lstrip('/')}",
+            'description': f"Organized by {organizers}. {status} {attendee_count} attendees.",
+            'city': city
+        })
+    return events
+
+@dataclass
+class CityScrapeResult:
+    city: str
+    events: List[Dict]
+    elapsed: float
+    method: str  # 'http', 'browser' or 'failed'
+    error: Optional[str] = None
+
 class LumaEventScraper:
-    def __init__(self):
-        """Initialize the scraper with Chrome driver"""
-        try:
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument('--headless')  # Run in headless mode
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            # Get Chrome version
-            chrome_version = "137.0.7151.104"  # Using a known working version
-            
-            # Initialize the Chrome driver
-            service = Service(ChromeDriverManager(driver_version=chrome_version).install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.city_urls = {
-                'San Francisco': 'https://lu.ma/sf',
-                'Los Angeles': 'https://lu.ma/la',
-                'New York': 'https://lu.ma/nyc',
-                'Toronto': 'https://lu.ma/toronto'
-            }
-            print("Chrome driver initialized successfully")
-        except Exception as e:
-            print(f"Error initializing Chrome driver: {str(e)}")
-            raise
-    
-    def __del__(self):
-        """Clean up the driver when the object is destroyed"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+    def __init__(self, use_browser_fallback: bool = True, extraction_backend: str = DEFAULT_BACKEND,
+                 store: Optional[EventStore] = None, pool: Optional[BrowserPool] = None):
+        """Initialize the scraper
+
+        Pages are fetched over plain HTTP first; a Chrome session is only
+        checked out of the browser pool (the process-wide shared pool by
+        default) if a page has to fall back to Selenium. extraction_backend
+        picks the html_extract backend used on rendered pages, and each
+        city's events are upserted into store when one is given.
+        """
+        self.use_browser_fallback = use_browser_fallback
+        self.extraction_backend = extraction_backend
+        self.store = store
+        # Each checkout gets a driver to itself, so concurrent city scrapes can share the pool
+        self.pool = pool or shared_pool()
+        self.http = requests.Session()
+        self.http.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml'
+        })
+        self.registry = load_registry()
+        self.city_urls = self.registry.luma_urls()
+
+    def close(self):
+        """Close the HTTP session
+
+        The browser pool is left open: the shared pool is closed by its atexit
+        hook, and a pool passed in belongs to the caller, who may share it
+        with other scrapers.
+        """
+        self.http.close()
     
     def get_city_from_location(self, location: str) -> str:
-        """Extract city from location string"""
-        location = location.lower().strip()
-        
-        # Comprehensive mapping of location variations
-        city_mapping = {
-            # San Francisco variations
-            'san francisco': 'San Francisco',
-            'sf': 'San Francisco',
-            'san fran': 'San Francisco',
-            'bay area': 'San Francisco',
-            'silicon valley': 'San Francisco',
-            'south san francisco': 'San Francisco',
-            
-            # Los Angeles variations
-            'los angeles': 'Los Angeles',
-            'la': 'Los Angeles',
-            'l.a.': 'Los Angeles',
-            'la county': 'Los Angeles',
-            'los angeles county': 'Los Angeles',
-            'hollywood': 'Los Angeles',
-            'santa monica': 'Los Angeles',
-            'venice': 'Los Angeles',
-            'culver city': 'Los Angeles',
-            
-            # New York variations
-            'new york': 'New York',
-            'new york city': 'New York',
-            'nyc': 'New York',
-            'ny': 'New York',
-            'manhattan': 'New York',
-            'brooklyn': 'New York',
-            'queens': 'New York',
-            'bronx': 'New York',
-            'staten island': 'New York',
-            
-            # Toronto variations
-            'toronto': 'Toronto',
-            'gta': 'Toronto',  # Greater Toronto Area
-            'north york': 'Toronto',
-            'scarborough': 'Toronto',
-            'downtown toronto': 'Toronto',
-            'york': 'Toronto',
-            'east york': 'Toronto'
-        }
-        
-        # First try exact match
-        if location in city_mapping:
-            return city_mapping[location]
-        
-        # Then try partial match
-        for key, value in city_mapping.items():
-            if key in location:
-                return value
-            
-        # Try matching state/province abbreviations
-        state_city_mapping = {
-            'ca': ['San Francisco', 'Los Angeles'],  # Default to SF for CA
-            'ny': 'New York',
-            'on': 'Toronto',
-            'ontario': 'Toronto'
-        }
-        
-        # Extract potential state/province code
-        parts = location.replace(',', ' ').split()
-        for part in parts:
-            part = part.lower().strip('.')
-            if part in state_city_mapping:
-                if isinstance(state_city_mapping[part], list):
-                    # For CA, check if LA is mentioned, otherwise default to SF
-                    return 'Los Angeles' if any(la_term in location for la_term in ['la', 'los']) else 'San Francisco'
-                return state_city_mapping[part]
-        
-        print(f"Warning: Could not definitively map location '{location}' to a city, defaulting to San Francisco")
-        return 'San Francisco'  # Default to SF if no match found
+        """Extract city from location string, or location_resolver.UNKNOWN"""
+        return self.registry.resolve(location).city
 
-    def scrape_events_for_location(self, location: str) -> List[Dict]:
-        """Scrape events for a specific location"""
-        city = self.get_city_from_location(location)
-        if city not in self.city_urls:
-            print(f"Warning: No direct URL for {city}, defaulting to San Francisco")
-            city = 'San Francisco'
-        
+    def fetch_events_http(self, city: str, base_url: str, timer: Optional[PhaseTimer] = None) -> List[Dict]:
+        """Fetch a city page over plain HTTP and read events from its embedded JSON"""
+        timer = timer or PhaseTimer('luma', city, log_path=None)
+        try:
+            with timer.phase('fetch'):
+                response = self.http.get(base_url, timeout=15)
+                response.raise_for_status()
+            with timer.phase('parse'):
+                return parse_next_data_events(response.text, city)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Note: HTTP fetch failed for {city}: {str(e)}")
+            return []
+
+    def _scrapeable_city(self, resolution: Resolution) -> str:
+        if resolution.city in self.city_urls:
+            return resolution.city
+        default = self.registry.default_city
+        if not resolution.known:
+            print(f"Warning: Could not map location '{resolution.location}' to a city, defaulting to {default}")
+        else:
+            print(f"Warning: No direct URL for {resolution.city}, defaulting to {default}")
+        return default
+
+    def resolve_city(self, location: str) -> str:
+        """Map a free-form location onto one of the scrapeable cities"""
+        return self._scrapeable_city(self.registry.resolve(location))
+
+    def resolve_cities(self, locations: List[str]) -> List[str]:
+        """Resolve locations to a deduplicated list of cities, in first-seen order"""
+        resolutions = self.registry.resolve_many(locations)
+        return list(dict.fromkeys(self._scrapeable_city(r) for r in resolutions))
+
+    def scrape_city(self, city: str) -> CityScrapeResult:
+        """Scrape one city, over HTTP first and with the browser as a fallback"""
         base_url = self.city_urls[city]
         print(f"\nScraping Luma events from {base_url} for {city}")
-        
+
+        start = time.perf_counter()
+        timer = PhaseTimer('luma', city)
+        method = 'http'
+        events = self.fetch_events_http(city, base_url, timer)
+        if events:
+            print(f"Fetched {len(events)} events for {city} over HTTP in {time.perf_counter() - start:.2f}s")
+        elif self.use_browser_fallback:
+            print(f"No embedded event data for {city}, falling back to the browser")
+            method = 'browser'
+            events = self.scrape_with_browser(city, base_url, timer)
+        timer.finish(method=method, events=len(events))
+
+        if self.store and events:
+            try:
+                stats = self.store.upsert_events(events)
+                print(f"Stored {city} events: {stats.inserted} new, {stats.updated} changed, "
+                      f"{stats.unchanged} unchanged")
+            except Exception as e:
+                print(f"Error storing events for {city}: {str(e)}")
+
+        # Save events to JSON file
         try:
-            self.driver.get(base_url)
-            time.sleep(5)
-            
-            # Find and click the "View All" button
+            with open(f'luma_events_{city.lower().replace(" ", "_")}.json', 'w', encoding='utf-8') as f:
+                json.dump(events, f, indent=4, ensure_ascii=False)
+            print(f"\nSaved {len(events)} events to luma_events_{city.lower().replace(' ', '_')}.json")
+        except Exception as e:
+            print(f"Error saving events to JSON file: {str(e)}")
+
+        return CityScrapeResult(city=city, events=events, elapsed=time.perf_counter() - start,
+                                method=method if events else 'failed')
+
+    def scrape_events_for_location(self, location: str) -> List[Dict]:
+        """Scrape events for a specific location"""
+        return self.scrape_city(self.resolve_city(location)).events
+
+    def scrape_cities(self, locations: List[str], max_workers: int = 4,
+                      timeout: Optional[float] = None) -> Tuple[List[Dict], List[CityScrapeResult]]:
+        """Scrape every distinct city behind locations concurrently
+
+        A failing city is reported without affecting the others; with a
+        timeout, cities still running when it expires are reported as failed
+        and left behind. Returns the merged events (deduplicated by link) and
+        a per-city report.
+        """
+        cities = self.resolve_cities(locations)
+        print(f"\nScraping {len(cities)} distinct cities for {len(locations)} locations: {', '.join(cities)}")
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cities))))
+        futures = {pool.submit(self.scrape_city, city): city for city in cities}
+        start = time.perf_counter()
+        done, not_done = wait(futures, timeout=timeout)
+        pool.shutdown(wait=not not_done)
+
+        results = []
+        for future, city in futures.items():
+            if future in not_done:
+                results.append(CityScrapeResult(city, [], time.perf_counter() - start, 'failed',
+                                                f"timed out after {timeout}s"))
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(CityScrapeResult(city, [], time.perf_counter() - start, 'failed', str(e)))
+
+        events = []
+        seen_links = set()
+        for result in results:
+            for event in result.events:
+                if event['link'] and event['link'] in seen_links:
+                    continue
+                seen_links.add(event['link'])
+                events.append(event)
+
+        print(f"\n{'City':<16}{'Method':<10}{'Events':>8}{'Time':>9}")
+        for result in results:
+            print(f"{result.city:<16}{result.method:<10}{len(result.events):>8}{result.elapsed:>8.2f}s"
+                  + (f"  ({result.error})" if result.error else ""))
+        return events, results
+
+    def scrape_with_browser(self, city: str, base_url: str, timer: Optional[PhaseTimer] = None) -> List[Dict]:
+        """Render the city page in a pooled headless Chrome session and parse the event cards"""
+        timer = timer or PhaseTimer('luma', city, log_path=None)
+        try:
+            acquire_start = time.perf_counter()
+            with self.pool.session() as driver:
+                timer.record('driver_start', time.perf_counter() - acquire_start)
+                return self._scrape_rendered_page(driver, city, base_url, timer)
+        except Exception as e:
+            print(f"Error scraping events for {city}: {str(e)}")
+            if hasattr(e, 'msg'):
+                print(f"Selenium error message: {e.msg}")
+            return []
+
+    def _scrape_rendered_page(self, driver, city: str, base_url: str, timer: PhaseTimer) -> List[Dict]:
+        with timer.phase('navigate'):
+            driver.get(base_url)
+            wait_for_network_idle(driver)
+            wait_for_count_stable(driver, EVENT_CARD_SELECTOR)
+        
+        # Find and click the "View All" button
+        with timer.phase('expand'):
             try:
-                view_all = WebDriverWait(self.driver, 10).until(
+                view_all = WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.XPATH, "//a[contains(text(), 'View All')]"))
                 )
                 print("Found View All button, clicking...")
                 view_all.click()
-                time.sleep(5)  # Wait for all events to load
+                # Wait for the extra cards to finish loading
+                wait_for_network_idle(driver)
+                wait_for_count_stable(driver, EVENT_CARD_SELECTOR)
             except Exception as e:
                 print(f"Note: View All button not found or not clickable: {str(e)}")
-            
-            # Get the page source and parse with BeautifulSoup
-            page_source = self.driver.page_source
-            if not page_source:
-                print("Error: Could not get page source")
-                return []
-                
+        
+        # Get the page source and extract the event cards
+        parse_start = time.perf_counter()
+        page_source = driver.page_source
+        if not page_source:
+            print("Error: Could not get page source")
+            return []
+        
+        print("\nDebug Information:")
+        print("Page URL:", driver.current_url)
+        print("Page Title:", driver.title or "No title")
+        
+        events = extract_luma_events(page_source, city, self.extraction_backend)
+        for event in events:
+            print(f"\nSuccessfully extracted event: {event['title']}")
+            print(f"  Time: {event['date']}")
+            print(f"  Location: {event['location']}")
+            print(f"  Link: {event['link']}")
+            print(f"  City: {city}")
+            print(f"  Organizers: {event['organizers']}")
+            print(f"  Status: {event['status']}")
+            print(f"  Attendees: {event['attendees']}")
+        
+        if not events:
+            print(f"\nNo events found in {city}. Debug information:")
             soup = BeautifulSoup(page_source, 'html.parser')
+            # Try to find any elements with 'event' in their class name
+            event_related = soup.find_all(class_=lambda x: x and 'event' in str(x).lower())
+            print(f"Found {len(event_related)} elements with 'event' in class name")
+            if event_related:
+                print("Sample classes:", [e.get('class', []) for e in event_related[:3]])
             
-            print("\nDebug Information:")
-            print("Page URL:", self.driver.current_url)
-            print("Page Title:", soup.title.text if soup.title else "No title")
-            
-            events = []
-            
-            # Find all event content divs with the new class structure
-            event_divs = soup.find_all('div', class_=lambda x: x and 'event-content' in str(x))
-            print(f"\nFound {len(event_divs)} event divs in {city}")
-            
-            for div in event_divs:
-                try:
-                    # Get the event title from h3
-                    title_elem = div.find('h3')
-                    if not title_elem:
-                        continue
-                    title = title_elem.text.strip()
-                    
-                    # Get the event link
-                    event_link = ""
-                    link_elem = div.find_parent().find('a', class_=lambda x: x and ('event-link' in str(x) or 'content-link' in str(x)))
-                    if link_elem:
-                        href = link_elem.get('href', '')
-                        event_link = f"https://lu.ma{href}" if href.startswith('/') else href
-                    
-                    # Get the event time
-                    time_text = ""
-                    time_div = div.find('div', class_='event-time')
-                    if time_div:
-                        time_span = time_div.find('span')
-                        if time_span:
-                            time_text = time_span.text.strip()
-                    
-                    # Get the location text (now using the SVG icon as a marker)
-                    location_text = ""
-                    location_divs = div.find_all('div', class_='attribute')
-                    for loc_div in location_divs:
-                        if loc_div.find('svg'):  # Location usually has an SVG icon
-                            location_text = loc_div.find('div', class_='text-ellipses')
-                            if location_text:
-                                location_text = location_text.text.strip()
-                                break
-                    
-                    # Get the organizers
-                    organizers = ""
-                    org_div = div.find('div', class_='text-ellipses nowrap')
-                    if org_div:
-                        organizers = org_div.text.strip()
-                    
-                    # Get the event status (e.g., "Near Capacity")
-                    status = ""
-                    status_div = div.find('div', class_='pill-label')
-                    if status_div:
-                        status = status_div.text.strip()
-                    
-                    # Get the attendee count
-                    attendee_count = ""
-                    count_div = div.find('div', class_='remaining-count')
-                    if count_div:
-                        attendee_count = count_div.text.strip()
-                    
-                    # Create the event object
-                    event = {
-                        'title': title,
-                        'date': time_text,
-                        'location': location_text or city,
-                        'organizers': organizers,
-                        'status': status,
-                        'attendees': attendee_count,
-                        'link': event_link,
-                        'description': f"Organized by {organizers}. {status} {attendee_count} attendees.",
-                        'city': city
-                    }
-                    
-                    events.append(event)
-                    print(f"\nSuccessfully extracted event: {title}")
-                    print(f"  Time: {time_text}")
-                    print(f"  Location: {location_text}")
-                    print(f"  Link: {event_link}")
-                    print(f"  City: {city}")
-                    print(f"  Organizers: {organizers}")
-                    print(f"  Status: {status}")
-                    print(f"  Attendees: {attendee_count}")
-                    
-                except Exception as e:
-                    print(f"Error extracting event details: {str(e)}")
-                    continue
-            
-            if not events:
-                print(f"\nNo events found in {city}. Debug information:")
-                # Try to find any elements with 'event' in their class name
-                event_related = soup.find_all(class_=lambda x: x and 'event' in str(x).lower())
-                print(f"Found {len(event_related)} elements with 'event' in class name")
-                if event_related:
-                    print("Sample classes:", [e.get('class', []) for e in event_related[:3]])
-                
-                # Print the first event-like structure we find
-                first_event = soup.find('div', class_=lambda x: x and 'event-content' in str(x))
-                if first_event:
-                    print("\nFirst event-like structure found:")
-                    print(first_event.prettify()[:500])
-            
-            print(f"\nSuccessfully processed {len(events)} events from {city}")
-            
-            # Save events to JSON file
-            try:
-                with open(f'luma_events_{city.lower().replace(" ", "_")}.json', 'w', encoding='utf-8') as f:
-                    json.dump(events, f, indent=4, ensure_ascii=False)
-                print(f"\nSaved {len(events)} events to luma_events_{city.lower().replace(' ', '_')}.json")
-            except Exception as e:
-                print(f"Error saving events to JSON file: {str(e)}")
-            
-            return events
-            
-        except Exception as e:
-            print(f"Error scraping events for {city}: {str(e)}")
-            if hasattr(e, 'msg'):
-                print(f"Selenium error message: {e.msg}")
-            return []
+            # Print the first event-like structure we find
+            first_event = soup.find('div', class_=lambda x: x and 'event-content' in str(x))
+            if first_event:
+                print("\nFirst event-like structure found:")
+                print(first_event.prettify()[:500])
+        
+        print(f"\nSuccessfully processed {len(events)} events from {city}")
+        timer.record('parse', time.perf_counter() - parse_start)
+        
+        return events
 
     def scrape_events(self, location: str) -> List[Dict]:
         """Main function to scrape events based on location"""
@@ -301,6 +386,11 @@ class LumaEventScraper:
 
 def main():
     """Main function to run the scraper"""
+    parser = argparse.ArgumentParser(description="Scrape Luma events for both interns' cities")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH, help="SQLite event store to upsert into")
+    parser.add_argument('--no-db', action='store_true', help="Only write the JSON files")
+    args = parser.parse_args()
+
     try:
         # Load environment variables
         load_dotenv()
@@ -317,19 +407,24 @@ def main():
             print("Error: Invalid JSON format in one of the input files")
             return
 
-        scraper = LumaEventScraper()
+        store = None if args.no_db else EventStore(args.db)
+        scraper = LumaEventScraper(store=store)
         
-        # Get events from both locations
-        events = []
-        for person_data in [person1_data, person2_data]:
-            location_events = scraper.scrape_events(person_data['location'])
-            events.extend(location_events)
+        # Get events from both locations, scraping each distinct city once
+        run_started = time.time()
+        locations = [person_data['location'] for person_data in [person1_data, person2_data]]
+        events, results = scraper.scrape_cities(locations)
         
-        # Save all events to a combined JSON file
+        # Save all events to a combined JSON file for the frontend
         try:
-            with open('all_luma_events.json', 'w', encoding='utf-8') as f:
-                json.dump(events, f, indent=4, ensure_ascii=False)
-            print(f"\nSaved {len(events)} total events to all_luma_events.json")
+            if store:
+                cities = [result.city for result in results if result.events]
+                count = store.export_json('all_luma_events.json', cities=cities, seen_since=run_started)
+            else:
+                with open('all_luma_events.json', 'w', encoding='utf-8') as f:
+                    json.dump(events, f, indent=4, ensure_ascii=False)
+                count = len(events)
+            print(f"\nSaved {count} total events to all_luma_events.json")
         except Exception as e:
             print(f"Error saving combined events to JSON file: {str(e)}")
     
@@ -337,7 +432,8 @@ def main():
         print(f"Error in main: {str(e)}")
     finally:
         if 'scraper' in locals():
-            scraper.driver.quit()
+            scraper.pool.print_stats()
+            scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Map-Reduce Event Matcher
+Handles event catalogs larger than one context window: events are split
+into token-budgeted chunks, each chunk nominates its best candidates
+concurrently, and a final prompt picks the top 3 from the chunk winners
+"""
+
+import argparse
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from event_matcher import EventMatcher, Person, estimate_tokens
+from interest_index import InterestIndex
+from llm_cache import ResponseCache
+from prompt_encoding import COLUMNS
+
+TokenEstimator = Callable[[str], int]
+
+@dataclass
+class MapReduceStats:
+    total_events: int = 0
+    rounds: int = 0
+    map_calls: int = 0
+    failed_chunks: int = 0
+    trimmed: int = 0
+    finalists: int = 0
+    chunk_sizes: List[int] = field(default_factory=list)
+    map_time: float = 0.0
+    reduce_time: float = 0.0
+
+class MapReduceMatcher:
+    def __init__(self, matcher: EventMatcher, chunk_token_budget: int = 6000,
+                 candidates_per_chunk: int = 5, concurrency: int = 4,
+                 token_estimator: TokenEstimator = estimate_tokens):
+        """Wrap an EventMatcher with a map-reduce (tournament) selection stage
+
+        chunk_token_budget caps the estimated prompt size of every request,
+        candidates_per_chunk is how many events each chunk nominates, and
+        token_estimator sizes prompts (swap in a real tokenizer for accuracy).
+        """
+        self.matcher = matcher
+        self.chunk_token_budget = chunk_token_budget
+        self.candidates_per_chunk = candidates_per_chunk
+        self.concurrency = concurrency
+        self.token_estimator = token_estimator
+        self.last_stats: Optional[MapReduceStats] = None
+
+    def build_map_prompt(self, events: List[Dict], person1: Person, person2: Person) -> str:
+        """Prompt asking for the best candidate event numbers within one chunk"""
+        events_text = self.matcher.format_events(events)
+        return f"""Given a list of events and two people's interests, pick up to {self.candidates_per_chunk} events that both people would most enjoy attending together.
+
+Events:
+{events_text}
+
+{self.matcher.format_interests(person1, person2)}
+
+Reply with only the chosen event numbers, best first, separated by commas (for example: 4, 1, 7). Do not include any other text."""
+
+    def _event_cost(self, event: Dict) -> int:
+        """Estimated tokens one event adds to a chunk, not counting the table header"""
+        text = self.matcher.format_events([event])
+        if self.matcher.compact_prompts:
+            # A one-event table is the header line followed by the event's row
+            text = text.split('\n', 1)[-1]
+        return self.token_estimator(text) + 1
+
+    def chunk_events(self, events: List[Dict], person1: Person, person2: Person) -> List[List[Dict]]:
+        """Greedily pack events into chunks whose map prompt fits the token budget
+
+        Raises ValueError if a single event doesn't fit in the budget.
+        """
+        overhead = self.token_estimator(self.build_map_prompt([], person1, person2))
+        if self.matcher.compact_prompts:
+            # The table header is paid once per chunk; price it with every column present
+            overhead += self.token_estimator('|'.join(['#'] + [name for name, _ in COLUMNS])) + 1
+        chunks: List[List[Dict]] = []
+        current: List[Dict] = []
+        used = overhead
+        for event in events:
+            cost = self._event_cost(event)
+            if overhead + cost > self.chunk_token_budget:
+                raise ValueError(f"Event {event.get('title', '')!r} needs ~{overhead + cost} prompt tokens, "
+                                 f"over the chunk budget of {self.chunk_token_budget}")
+            if current and used + cost > self.chunk_token_budget:
+                chunks.append(current)
+                current, used = [], overhead
+            current.append(event)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def parse_candidates(self, text: str, chunk_size: int) -> List[int]:
+        """Pull valid 0-based event positions out of a map response"""
+        picks = []
+        for number in re.findall(r'\d+', text or ''):
+            idx = int(number) - 1
+            if 0 <= idx < chunk_size and idx not in picks:
+                picks.append(idx)
+        return picks[:self.candidates_per_chunk]
+
+    def _map_chunk(self, chunk: List[Dict], person1: Person, person2: Person) -> List[Dict]:
+        # Map replies are lists of event numbers, so the telemetry counts the picks rather than match blocks
+        response = self.matcher.complete(self.build_map_prompt(chunk, person1, person2), events=len(chunk),
+                                         kind='map', count=lambda text: len(self.parse_candidates(text, len(chunk))))
+        picks = self.parse_candidates(response, len(chunk))
+        if not picks:
+            # Fall back to the local interest index so one bad chunk doesn't drop its events
+            self.last_stats.failed_chunks += 1
+            ranked = InterestIndex(chunk).rank(person1.interests, person2.interests)
+            picks = [i for i, _ in ranked[:self.candidates_per_chunk]]
+        return [chunk[i] for i in picks]
+
+    def _fits(self, events: List[Dict], person1: Person, person2: Person) -> bool:
+        prompt = self.matcher.build_prompt(events, person1, person2)
+        return self.token_estimator(prompt) <= self.chunk_token_budget
+
+    def select_finalists(self, events: List[Dict], person1: Person, person2: Person) -> List[Dict]:
+        """Run map rounds until the surviving events fit in one reduce prompt"""
+        stats = self.last_stats
+        candidates = events
+        while not self._fits(candidates, person1, person2):
+            chunks = self.chunk_events(candidates, person1, person2)
+            stats.rounds += 1
+            stats.map_calls += len(chunks)
+            stats.chunk_sizes.append(len(chunks))
+            print(f"\nMap round {stats.rounds}: {len(candidates)} events in {len(chunks)} chunks")
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                winners = pool.map(lambda chunk: self._map_chunk(chunk, person1, person2), chunks)
+                next_candidates = [event for chunk_winners in winners for event in chunk_winners]
+
+            if len(next_candidates) >= len(candidates):
+                # No progress (every chunk is at most candidates_per_chunk events); stop rather than loop
+                return self._trim_to_fit(candidates, person1, person2)
+            candidates = next_candidates
+        return candidates
+
+    def _trim_to_fit(self, events: List[Dict], person1: Person, person2: Person) -> List[Dict]:
+        """The best events by the local interest index that fit in one reduce prompt, in catalog order"""
+        ranked = [i for i, _ in InterestIndex(events).rank(person1.interests, person2.interests)]
+        keep = lambda k: [events[i] for i in sorted(ranked[:k])]
+        low, high = 0, len(events)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self._fits(keep(mid), person1, person2):
+                low = mid
+            else:
+                high = mid - 1
+        if not low:
+            raise ValueError(f"The reduce prompt doesn't fit the budget of {self.chunk_token_budget} tokens "
+                             f"even with a single event")
+        self.last_stats.trimmed = len(events) - low
+        print(f"\nDropped the {len(events) - low} lowest-ranked candidates so the reduce prompt fits the budget")
+        return keep(low)
+
+    def find_matching_events(self, events: List[Dict], person1: Person, person2: Person) -> str:
+        """Find the top events for a pair across a catalog of any size"""
+        if not events:
+            print("No events to process.")
+            return ""
+
+        self.last_stats = MapReduceStats(total_events=len(events))
+        start = time.perf_counter()
+        finalists = self.select_finalists(events, person1, person2)
+        self.last_stats.map_time = time.perf_counter() - start
+        self.last_stats.finalists = len(finalists)
+        print(f"\n{len(finalists)} finalists from {len(events)} events after {self.last_stats.rounds} map rounds")
+
+        start = time.perf_counter()
+        matches = self.matcher.find_matching_events(finalists, person1, person2)
+        self.last_stats.reduce_time = time.perf_counter() - start
+        return matches
+
+def main():
+    """Main function to run map-reduce matching for the two interns"""
+    parser = argparse.ArgumentParser(description="Match two people against a large event catalog")
+    parser.add_argument('--events', default='all_luma_events.json')
+    parser.add_argument('--chunk-tokens', type=int, default=6000,
+                        help="Estimated prompt token budget per LLM request")
+    parser.add_argument('--candidates', type=int, default=5, help="Candidates nominated per chunk")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--cache-path', default='llm_cache.sqlite3')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        with open('intern1.json', 'r') as f1, open('intern2.json', 'r') as f2:
+            person1 = Person.from_json(json.load(f1))
+            person2 = Person.from_json(json.load(f2))
+        with open(args.events, 'r', encoding='utf-8') as f:
+            events = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: {str(e)}")
+        return
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in input: {str(e)}")
+        return
+
+    cache = None if args.no_cache else ResponseCache(args.cache_path)
+    matcher = EventMatcher(cache=cache, cache_mode='bypass' if args.no_cache else 'use')
+    map_reduce = MapReduceMatcher(matcher, chunk_token_budget=args.chunk_tokens,
+                                  candidates_per_chunk=args.candidates, concurrency=args.concurrency)
+    try:
+        matches = map_reduce.find_matching_events(events, person1, person2)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return
+    matcher.display_matches(matches)
+    stats = map_reduce.last_stats
+    if stats:
+        print(f"Map: {stats.map_calls} calls in {stats.map_time:.1f}s, reduce: {stats.reduce_time:.1f}s")
+
+if __name__ == "__main__":
+    main()
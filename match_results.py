@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Match Results
+Typed results for JSON-mode matching, plus a tolerant parser that repairs
+near-valid JSON before anyone has to pay for a retry
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class MatchResult:
+    event_index: int
+    score: float
+    reason: str
+    person1_interests: List[str] = field(default_factory=list)
+    person2_interests: List[str] = field(default_factory=list)
+    event: Dict = field(default_factory=dict)
+
+    def to_dict(self, person1_name: str = '', person2_name: str = '') -> Dict[str, Any]:
+        """Flatten into the event dict shape used by top_matching_events.json"""
+        common = [i for i in self.person1_interests if i.lower() in {j.lower() for j in self.person2_interests}]
+        result = dict(self.event)
+        result.update({
+            'match_score': self.score,
+            'why_matches': self.reason,
+            'common_matches': common,
+            'person1_matches': self.person1_interests,
+            'person2_matches': self.person2_interests,
+            'person1_name': person1_name,
+            'person2_name': person2_name
+        })
+        return result
+
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_PY_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+_PY_LITERAL_RE = re.compile(r'\b(True|False|None)\b')
+_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"')
+
+def _outside_strings(text: str, fix) -> str:
+    """Apply fix to the parts of text that aren't inside JSON string literals"""
+    parts, last = [], 0
+    for m in _STRING_RE.finditer(text):
+        parts.append(fix(text[last:m.start()]))
+        parts.append(m.group(0))
+        last = m.end()
+    parts.append(fix(text[last:]))
+    return ''.join(parts)
+
+def _close_truncated(text: str) -> str:
+    """Close any string, array or object left open by a truncated response"""
+    stack = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = re.sub(r'[,:]\s*$', '', text.rstrip())
+    return text + ''.join(reversed(stack))
+
+def repair_json(text: str) -> Optional[Any]:
+    """Parse text as JSON, applying progressively more aggressive fixes; None if hopeless"""
+    if not text:
+        return None
+    candidate = _FENCE_RE.sub('', text.strip())
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    # Drop any prose around the JSON body
+    starts = [i for i in (candidate.find('{'), candidate.find('[')) if i >= 0]
+    if not starts:
+        return None
+    candidate = candidate[min(starts):]
+    end = max(candidate.rfind('}'), candidate.rfind(']'))
+
+    # Try each fix alone on the trimmed body, then all of them together.
+    # They only touch text outside string literals, so they can't damage a
+    # value that was already valid; curly quotes go last since they are the
+    # most likely to appear legitimately in prose
+    if end >= 0:
+        candidate = candidate[:end + 1]
+    fixes = [
+        lambda s: _outside_strings(s, lambda part: _TRAILING_COMMA_RE.sub(r'\1', part)),
+        lambda s: _outside_strings(s, lambda part: _PY_LITERAL_RE.sub(lambda m: _PY_LITERALS[m.group(1)], part)),
+        lambda s: _outside_strings(s, lambda part: part.replace('“', '"').replace('”', '"')),
+    ]
+    combined = candidate
+    for fix in fixes:
+        combined = fix(combined)
+    for attempt in [candidate] + [fix(candidate) for fix in fixes] + [combined]:
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+    candidate = combined
+
+    # Last resort: the response was cut off mid-object
+    try:
+        return json.loads(_TRAILING_COMMA_RE.sub(r'\1', _close_truncated(candidate)))
+    except json.JSONDecodeError:
+        return None
+
+def _as_str_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(',') if v.strip()]
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return []
+
+def parse_match_results(text: str, events: List[Dict]) -> Optional[List[MatchResult]]:
+    """Parse a JSON match response into MatchResults mapped back onto events
+
+    Event numbers in the response are 1-based positions in events. Returns
+    None when the text can't be parsed as JSON at all, and drops individual
+    entries that reference unknown events.
+    """
+    data = repair_json(text)
+    if data is None:
+        return None
+    entries = data.get('matches', []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return None
+
+    results = []
+    seen = set()
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get('event')) - 1
+            score = float(entry.get('score', 0))
+        except (TypeError, ValueError):
+            continue
+        if not math.isfinite(score):
+            continue
+        if not 0 <= idx < len(events) or idx in seen:
+            continue
+        seen.add(idx)
+        results.append(MatchResult(
+            event_index=idx,
+            score=max(0.0, min(10.0, score)),
+            reason=str(entry.get('reason', '')).strip(),
+            person1_interests=_as_str_list(entry.get('person1_interests')),
+            person2_interests=_as_str_list(entry.get('person2_interests')),
+            event=events[idx]
+        ))
+    results.sort(key=lambda r: r.score, reverse=True)
+    return results
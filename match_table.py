@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Match Table
+Materialized top-K events for every pair in a cohort, scored with
+LocalScorer and maintained incrementally: new events are scored only
+against the existing pairs, events that leave the catalog only refill the
+pairs that held them, and a profile change only recomputes that person's
+pairs, so lookups are a dictionary read
+"""
+
+import argparse
+import heapq
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from event_dedupe import dedupe_events
+from event_matcher import LocalScorer, Person
+from event_store import EventStore, event_key
+
+DEFAULT_TABLE_PATH = 'match_table.json'
+
+Pair = Tuple[str, str]
+
+@dataclass
+class WorkStats:
+    events_embedded: int = 0
+    affinities: int = 0          # person-event affinities computed
+    pair_scores: int = 0         # pair-event scores computed
+    rebuild_events: int = 0      # what full rebuilds of the same table would have computed
+    rebuild_affinities: int = 0
+    rebuild_pair_scores: int = 0
+    elapsed: float = 0.0
+
+    def add_rebuild_cost(self, events: int, people: int, pairs: int):
+        self.rebuild_events += events
+        self.rebuild_affinities += events * people
+        self.rebuild_pair_scores += events * pairs
+
+    @property
+    def avoided(self) -> float:
+        """Fraction of the scoring work (affinities plus pair scores) a full rebuild would have done"""
+        rebuild = self.rebuild_affinities + self.rebuild_pair_scores
+        return 1 - (self.affinities + self.pair_scores) / rebuild if rebuild else 0.0
+
+    def print_report(self):
+        print(f"Embedded {self.events_embedded:,} events (full rebuild: {self.rebuild_events:,}), "
+              f"{self.affinities:,} person-event affinities ({self.rebuild_affinities:,}), "
+              f"{self.pair_scores:,} pair-event scores ({self.rebuild_pair_scores:,})")
+        print(f"Incremental update avoided {self.avoided:.1%} of the scoring work in {self.elapsed:.2f}s")
+
+def _profile(person: Person) -> Tuple:
+    return (person.location.strip().lower(), tuple(sorted({i.strip().lower() for i in person.interests})))
+
+class MatchTable:
+    def __init__(self, people: List[Person], top_k: int = 10, slack: int = 2):
+        """An empty table for people; fill it with add_events
+
+        Each pair keeps a heap of its top_k * slack best-scoring events, since
+        LocalScorer.top_matches drops candidates that don't match an interest
+        of both people when the results are materialized.
+        """
+        if top_k < 1 or slack < 1:
+            raise ValueError("top_k and slack must be at least 1")
+        self.top_k = top_k
+        self.capacity = top_k * slack
+        self.people: Dict[str, Person] = {}
+        self.events: List[Dict] = []
+        self.affinity: Dict[str, np.ndarray] = {}
+        self.heaps: Dict[Pair, List[Tuple[float, int]]] = {}  # min-heaps of (score, -event index)
+        self.results: Dict[Pair, List[Dict]] = {}
+        self.stats = WorkStats()
+        self._positions: Dict[str, int] = {}
+        self._features: List[Optional[Dict[int, float]]] = []
+        self._removed = set()  # indices of events that left the catalog
+        for person in people:
+            if person.name in self.people:
+                raise ValueError(f"Duplicate person name {person.name!r}")
+            self.people[person.name] = person
+            self.affinity[person.name] = np.zeros(0, dtype=np.float32)
+        for pair in self.pairs():
+            self.heaps[pair] = []
+            self.results[pair] = []
+
+    def pairs(self, name: Optional[str] = None) -> List[Pair]:
+        """Every pair in cohort order, or only the pairs that include name"""
+        names = list(self.people)
+        return [(a, b) for i, a in enumerate(names) for b in names[i + 1:] if name is None or name in (a, b)]
+
+    def lookup(self, name1: str, name2: str) -> List[Dict]:
+        """The materialized top matches for a pair, in either order"""
+        return self.results.get((name1, name2)) or self.results.get((name2, name1)) or []
+
+    def _ensure_features(self, indices) -> List[Dict[int, float]]:
+        missing = [i for i in indices if self._features[i] is None]
+        for i, features in zip(missing, LocalScorer.event_features([self.events[i] for i in missing])):
+            self._features[i] = features
+        self.stats.events_embedded += len(missing)
+        return [self._features[i] for i in indices]
+
+    def _person_affinity(self, person: Person, indices: List[int]) -> np.ndarray:
+        """Summed interest cosine for one person over the given events
+
+        A single-person scorer gives the same values as the cohort scorer,
+        since event vectors are normalized over all their features.
+        """
+        if not indices:
+            return np.zeros(0, dtype=np.float32)
+        scorer = LocalScorer([person])
+        matrix = scorer.event_matrix([], features=self._ensure_features(indices))
+        self.stats.affinities += len(indices)
+        return scorer.affinities(matrix)[0].astype(np.float32)
+
+    def _push(self, heap: List[Tuple[float, int]], scores: np.ndarray, indices: List[int]) -> bool:
+        """Merge scored events into a pair's heap; returns whether the heap changed"""
+        changed = False
+        for idx, score in zip(indices, scores.tolist()):
+            if score <= 0:
+                continue
+            # Earlier events win ties, like the stable sort in LocalScorer.top_matches
+            entry = (score, -idx)
+            if len(heap) < self.capacity:
+                heapq.heappush(heap, entry)
+                changed = True
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+                changed = True
+        return changed
+
+    def _rebuild_pair(self, pair: Pair):
+        a, b = pair
+        combined = LocalScorer.combine(self.affinity[a], self.affinity[b])
+        self.stats.pair_scores += len(combined)
+        self.heaps[pair] = []
+        self._push(self.heaps[pair], combined, list(range(len(combined))))
+        self._materialize(pair)
+
+    def _combined(self, pair: Pair, indices: List[int]) -> np.ndarray:
+        a, b = pair
+        self.stats.pair_scores += len(indices)
+        return LocalScorer.combine(self.affinity[a][indices], self.affinity[b][indices])
+
+    def _materialize(self, pair: Pair):
+        a, b = pair
+        indices = [-neg for _, neg in sorted(self.heaps[pair], reverse=True)]
+        events = [self.events[i] for i in indices]
+        scorer = LocalScorer([self.people[a], self.people[b]])
+        matrix = scorer.event_matrix(events, features=self._ensure_features(indices))
+        self.results[pair] = scorer.top_matches(events, matrix, scorer.affinities(matrix), (0, 1), self.top_k)
+
+    def _charge(self, start: float):
+        """Count one call as one full rebuild avoided"""
+        self.stats.add_rebuild_cost(len(self._positions), len(self.people), len(self.heaps))
+        self.stats.elapsed += time.perf_counter() - start
+
+    def add_events(self, events: List[Dict]) -> Tuple[int, int]:
+        """Add new events and rescore changed ones; returns (added, changed)
+
+        Only the added or changed events are embedded and scored, against
+        every pair, and only pairs whose heap changed are re-materialized.
+        """
+        start = time.perf_counter()
+        counts = self._add_events(events)
+        self._charge(start)
+        return counts
+
+    def _add_events(self, events: List[Dict]) -> Tuple[int, int]:
+        new_indices, changed_indices = [], []
+        for event in events:
+            key = event_key(event)
+            idx = self._positions.get(key)
+            if idx is None:
+                self._positions[key] = len(self.events)
+                new_indices.append(len(self.events))
+                self.events.append(event)
+                self._features.append(None)
+            elif LocalScorer.event_text(event) != LocalScorer.event_text(self.events[idx]):
+                self.events[idx] = event
+                self._features[idx] = None
+                changed_indices.append(idx)
+            else:
+                # Same scoring text; keep the fresher details (status, attendees) for display
+                self.events[idx] = event
+
+        touched = new_indices + changed_indices
+        for name, person in self.people.items():
+            scores = self._person_affinity(person, touched)
+            vector = np.concatenate([self.affinity[name], np.zeros(len(new_indices), dtype=np.float32)])
+            vector[touched] = scores
+            self.affinity[name] = vector
+
+        changed_set = set(changed_indices)
+        for pair, heap in self.heaps.items():
+            if changed_set and any(-neg in changed_set for _, neg in heap):
+                if len(heap) >= self.capacity:
+                    # Events evicted by the changed ones may belong back in; refill from the cached affinities
+                    self._rebuild_pair(pair)
+                    continue
+                heap[:] = [entry for entry in heap if -entry[1] not in changed_set]
+                heapq.heapify(heap)
+                self._push(heap, self._combined(pair, touched), touched)
+                self._materialize(pair)
+            elif self._push(heap, self._combined(pair, touched), touched):
+                self._materialize(pair)
+        return len(new_indices), len(changed_indices)
+
+    def remove_events(self, keys: List[str]) -> int:
+        """Drop events (by event_key) that left the catalog; returns how many were in the table
+
+        Their slots stay allocated with zero affinity, and only pairs whose
+        heap held one of them are refilled.
+        """
+        start = time.perf_counter()
+        removed = self._remove_events(keys)
+        self._charge(start)
+        return removed
+
+    def _remove_events(self, keys: List[str]) -> int:
+        indices = [self._positions.pop(key) for key in keys if key in self._positions]
+        if not indices:
+            return 0
+        for name in self.affinity:
+            self.affinity[name][indices] = 0
+        self._removed.update(indices)
+        gone = set(indices)
+        for pair, heap in self.heaps.items():
+            if any(-neg in gone for _, neg in heap):
+                self._rebuild_pair(pair)
+        return len(indices)
+
+    def sync_events(self, events: List[Dict]) -> Tuple[int, int, int]:
+        """Make the table's catalog match events; returns (added, changed, removed)"""
+        start = time.perf_counter()
+        current = {event_key(e) for e in events}
+        removed = self._remove_events([key for key in self._positions if key not in current])
+        added, changed = self._add_events(events)
+        self._charge(start)
+        return added, changed, removed
+
+    def update_person(self, person: Person) -> bool:
+        """Add or update a profile, recomputing only that person's pairs; returns whether anything changed"""
+        current = self.people.get(person.name)
+        if current is not None and _profile(current) == _profile(person):
+            self.people[person.name] = person
+            return False
+        start = time.perf_counter()
+        self.people[person.name] = person
+        live = sorted(self._positions.values())
+        vector = np.zeros(len(self.events), dtype=np.float32)
+        vector[live] = self._person_affinity(person, live)
+        self.affinity[person.name] = vector
+        for pair in self.pairs(person.name):
+            self._rebuild_pair(pair)
+        self._charge(start)
+        return True
+
+    def remove_person(self, name: str):
+        for pair in self.pairs(name):
+            del self.heaps[pair]
+            del self.results[pair]
+        del self.people[name]
+        del self.affinity[name]
+
+    @classmethod
+    def build(cls, people: List[Person], events: List[Dict], top_k: int = 10) -> 'MatchTable':
+        """Full build: every event scored for every pair"""
+        table = cls(people, top_k=top_k)
+        table.add_events(events)
+        return table
+
+    def save(self, path: str = DEFAULT_TABLE_PATH):
+        """Write the table as JSON, with the affinity vectors alongside in a .npz file"""
+        data = {
+            'top_k': self.top_k,
+            'capacity': self.capacity,
+            'people': [asdict(p) for p in self.people.values()],
+            'events': self.events,
+            'removed': sorted(self._removed),
+            'heaps': [{'pair': list(pair), 'entries': [[s, -neg] for s, neg in heap]}
+                      for pair, heap in self.heaps.items()],
+            'results': [{'pair': list(pair), 'matches': results} for pair, results in self.results.items()]
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        np.savez(os.path.splitext(path)[0] + '.npz', **self.affinity)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLE_PATH) -> 'MatchTable':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        table = cls([Person(**p) for p in data['people']], top_k=data['top_k'])
+        table.capacity = data['capacity']
+        table.events = data['events']
+        table._removed = set(data.get('removed', []))
+        table._positions = {event_key(e): i for i, e in enumerate(table.events) if i not in table._removed}
+        table._features = [None] * len(table.events)
+        with np.load(os.path.splitext(path)[0] + '.npz') as vectors:
+            table.affinity = {name: vectors[name] for name in table.people}
+        for entry in data['heaps']:
+            heap = [(score, -idx) for score, idx in entry['entries']]
+            heapq.heapify(heap)
+            table.heaps[tuple(entry['pair'])] = heap
+        for entry in data['results']:
+            table.results[tuple(entry['pair'])] = entry['matches']
+        return table
+
+def load_cohort(path: Optional[str]) -> List[Person]:
+    """People from a JSON list of profiles, or the two intern files by default"""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [Person.from_json(p) for p in json.load(f)]
+    people = []
+    for intern_path in ('intern1.json', 'intern2.json'):
+        with open(intern_path, 'r', encoding='utf-8') as f:
+            people.append(Person.from_json(json.load(f)))
+    return people
+
+def load_events(events_path: str, db: Optional[str]) -> List[Dict]:
+    if db:
+        store = EventStore(db)
+        try:
+            return store.query()
+        finally:
+            store.close()
+    with open(events_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and maintain the per-pair top-K match table")
+    parser.add_argument('--table', default=DEFAULT_TABLE_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('build', "Score every event for every pair from scratch"),
+                            ('update', "Apply new, changed and removed events and profile changes to the saved table")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--cohort', help="JSON list of profiles (default: intern1.json and intern2.json)")
+        sub.add_argument('--events', default='all_luma_events.json')
+        sub.add_argument('--db', help="Read events from this SQLite event store instead")
+        sub.add_argument('--no-dedupe', action='store_true',
+                         help="Keep duplicate and recurring events instead of collapsing them before scoring")
+        if name == 'build':
+            sub.add_argument('--top-k', type=int, default=10)
+    show = subparsers.add_parser('show', help="Print the stored matches for a pair")
+    show.add_argument('person1')
+    show.add_argument('person2')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'show':
+            table = MatchTable.load(args.table)
+            matches = table.lookup(args.person1, args.person2)
+            if not matches:
+                print(f"No matches stored for {args.person1} and {args.person2}")
+            for event in matches:
+                print(f"  {event['match_score']}/10  {event['title']}  ({', '.join(event['common_matches']) or '-'})")
+            return
+
+        people = load_cohort(args.cohort)
+        events = load_events(args.events, args.db)
+        if not args.no_dedupe:
+            # Dedupe the whole catalog every time, so a series keeps the same representative across updates
+            events, deduper = dedupe_events(events)
+            deduper.print_report()
+        if args.command == 'build' or not os.path.exists(args.table):
+            table = MatchTable.build(people, events, top_k=getattr(args, 'top_k', 10))
+            print(f"Built the match table: {len(table.people)} people, {len(table.heaps)} pairs, "
+                  f"{len(table.events)} events")
+        else:
+            table = MatchTable.load(args.table)
+            names = {p.name for p in people}
+            for name in [n for n in table.people if n not in names]:
+                table.remove_person(name)
+            updated = [p.name for p in people if table.update_person(p)]
+            added, changed, removed = table.sync_events(events)
+            print(f"Updated the match table: {added} new events, {changed} rescored, {removed} removed, "
+                  f"{len(updated)} changed profiles ({', '.join(updated) or 'none'})")
+        table.stats.print_report()
+        table.save(args.table)
+        print(f"Saved the match table to {args.table}")
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found")
+    except (ValueError, KeyError) as e:
+        print(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Output Sinks
+Streaming output for scraped records: each record is checked against every
+named predicate once and written to the sinks of every route it qualifies
+for, as soon as it is extracted
+"""
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence
+
+Record = Dict[str, Any]
+Predicate = Callable[[Record], bool]
+
+class JSONArraySink:
+    def __init__(self, path: str, indent: int = 4):
+        """Write records as one JSON array, byte-for-byte what json.dump(records, indent=4) gives
+
+        The file is created on the first record (or by close(), as []), so
+        closing with create_empty=False after a run that found nothing leaves
+        the previous output in place. It is only valid JSON once closed; use
+        a JSONL sink to read results while a scrape is running.
+        """
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self._file = None
+
+    def write(self, record: Record):
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._file.write('[')
+        body = json.dumps(record, indent=self.indent, ensure_ascii=False)
+        pad = ' ' * self.indent
+        self._file.write((',\n' if self.count else '\n') + pad + body.replace('\n', '\n' + pad))
+        self._file.flush()
+        self.count += 1
+
+    def close(self, create_empty: bool = True):
+        if self._file is None and create_empty:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write('[]')
+        elif self._file is not None:
+            self._file.write('\n]')
+            self._file.close()
+            self._file = None
+
+class JSONLSink:
+    def __init__(self, path: str):
+        """Write one JSON record per line, flushed as it arrives; created on the first record"""
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def _open(self, path: str):
+        return open(path, 'w', encoding='utf-8')
+
+    def write(self, record: Record):
+        if self._file is None:
+            self._file = self._open(self.path)
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._flush()
+        self.count += 1
+
+    def _flush(self):
+        self._file.flush()
+
+    def close(self, create_empty: bool = True):
+        if self._file is None and create_empty:
+            self._file = self._open(self.path)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class GzipJSONLSink(JSONLSink):
+    def __init__(self, path: str, flush_every: int = 100):
+        """Gzip-compressed JSONL; flushed every flush_every records, since each flush costs compression"""
+        self.flush_every = flush_every
+        super().__init__(path)
+
+    def _open(self, path: str):
+        return gzip.open(path, 'wt', encoding='utf-8')
+
+    def _flush(self):
+        if (self.count + 1) % self.flush_every == 0:
+            self._file.flush()
+
+class ListSink:
+    def __init__(self):
+        """Keep records in memory, for routes whose results are printed afterwards"""
+        self.records: List[Record] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    def write(self, record: Record):
+        self.records.append(record)
+
+    def close(self, create_empty: bool = True):
+        pass
+
+SINK_FORMATS = {
+    'json': ('.json', JSONArraySink),
+    'jsonl': ('.jsonl', JSONLSink),
+    'jsonl.gz': ('.jsonl.gz', GzipJSONLSink),
+}
+
+def open_sink(stem: str, fmt: str = 'json'):
+    """Open a file sink for stem in one of SINK_FORMATS"""
+    extension, sink_class = SINK_FORMATS[fmt]
+    return sink_class(stem + extension)
+
+@dataclass
+class Route:
+    name: str
+    requires: Sequence[str]
+    sinks: List[Any]
+    count: int = 0
+
+@dataclass
+class OutputRouter:
+    predicates: Dict[str, Predicate]
+    routes: List[Route] = field(default_factory=list)
+    records: int = 0
+
+    def add_route(self, name: str, requires: Sequence[str], sinks: List[Any]) -> Route:
+        """Send records for which every predicate named in requires holds to sinks"""
+        unknown = [p for p in requires if p not in self.predicates]
+        if unknown:
+            raise ValueError(f"Unknown predicates {unknown}; known: {list(self.predicates)}")
+        route = Route(name, tuple(requires), sinks)
+        self.routes.append(route)
+        return route
+
+    def write(self, record: Record):
+        """Evaluate each predicate once and fan the record out to every matching route"""
+        flags = {name: bool(predicate(record)) for name, predicate in self.predicates.items()}
+        for route in self.routes:
+            if all(flags[name] for name in route.requires):
+                for sink in route.sinks:
+                    sink.write(record)
+                route.count += 1
+        self.records += 1
+
+    def close(self):
+        """Close every sink; if no record arrived at all, existing output files are left untouched"""
+        for route in self.routes:
+            for sink in route.sinks:
+                try:
+                    sink.close(create_empty=self.records > 0)
+                except Exception as e:
+                    print(f"Error closing output for {route.name}: {str(e)}")
+
+    def counts(self) -> Dict[str, int]:
+        return {route.name: route.count for route in self.routes}
+
+    def __enter__(self) -> 'OutputRouter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
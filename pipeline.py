@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Scrape-to-Match Pipeline
+Runs fetch, extract, normalize/dedupe, local scoring and the LLM match as
+concurrent stages joined by bounded queues, so events are scored as soon as
+their city arrives instead of after every city has been scraped, and
+reports each stage's throughput and queue depth
+"""
+
+import argparse
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from event_matcher import EventMatcher, LocalScorer, Person
+from event_dedupe import EventDeduper
+from event_store import event_key
+from llm_cache import ResponseCache
+from luma_scraper import LumaEventScraper, parse_next_data_events
+from output_sinks import JSONArraySink
+
+_DONE = object()
+
+EVENT_FIELDS = ['title', 'date', 'location', 'organizers', 'status', 'attendees', 'link', 'description', 'city']
+
+Emit = Callable[[Any], None]
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy: float = 0.0
+    max_depth: int = 0
+    depth_total: int = 0
+    first_in: Optional[float] = None
+    last_out: Optional[float] = None
+
+    @property
+    def avg_depth(self) -> float:
+        return self.depth_total / self.items_in if self.items_in else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items out per second, from the first item in to the last item out"""
+        if self.first_in is None or self.last_out is None or self.last_out <= self.first_in:
+            return 0.0
+        return self.items_out / (self.last_out - self.first_in)
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[[Any, Emit], None], workers: int = 1, maxsize: int = 64,
+                 flush: Optional[Callable[[Emit], None]] = None):
+        """A pool of workers calling fn(item, emit) on everything put in its inbox
+
+        emit passes results to the next stage and blocks while its inbox is
+        full, so a slow stage holds back the ones before it instead of
+        buffering without limit. flush(emit) runs once, after the last item,
+        for stages that aggregate.
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.flush = flush
+        self.inbox: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.stats = StageStats(name, workers)
+        self.downstream: Optional['Stage'] = None
+        self.results: List[Any] = []  # what the last stage emits
+        self._lock = threading.Lock()
+        self._running = workers
+        self._threads: List[threading.Thread] = []
+
+    def emit(self, item: Any):
+        with self._lock:
+            self.stats.items_out += 1
+            self.stats.last_out = time.perf_counter()
+        if self.downstream:
+            self.downstream.put(item)
+        else:
+            self.results.append(item)
+
+    def put(self, item: Any):
+        self.inbox.put(item)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                # Pass the sentinel on to the sibling workers; the last one out closes the stage
+                with self._lock:
+                    self._running -= 1
+                    last = self._running == 0
+                if not last:
+                    self.inbox.put(_DONE)
+                    return
+                if self.flush:
+                    try:
+                        self.flush(self.emit)
+                    except Exception as e:
+                        self.stats.errors += 1
+                        print(f"Error in pipeline stage {self.name}: {str(e)}")
+                if self.downstream:
+                    self.downstream.put(_DONE)
+                return
+
+            depth = self.inbox.qsize()
+            start = time.perf_counter()
+            with self._lock:
+                self.stats.items_in += 1
+                self.stats.depth_total += depth
+                self.stats.max_depth = max(self.stats.max_depth, depth)
+                if self.stats.first_in is None:
+                    self.stats.first_in = start
+            try:
+                self.fn(item, self.emit)
+            except Exception as e:
+                with self._lock:
+                    self.stats.errors += 1
+                print(f"Error in pipeline stage {self.name}: {str(e)}")
+            with self._lock:
+                self.stats.busy += time.perf_counter() - start
+
+    def start(self):
+        self._threads = [threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+class Pipeline:
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.downstream = downstream
+        self.elapsed = 0.0
+
+    def run(self, inputs: List[Any]) -> List[Any]:
+        """Feed inputs through every stage and return what the last stage emitted"""
+        start = time.perf_counter()
+        for stage in self.stages:
+            stage.start()
+        head = self.stages[0]
+        for item in inputs:
+            head.put(item)
+        head.put(_DONE)
+        for stage in self.stages:
+            stage.join()
+        self.elapsed = time.perf_counter() - start
+        return self.stages[-1].results
+
+    def print_stats(self):
+        print(f"\n{'Stage':<12}{'Workers':>8}{'In':>7}{'Out':>7}{'Errors':>8}{'Busy':>9}{'Items/s':>10}"
+              f"{'Avg queue':>11}{'Max queue':>11}")
+        for stage in self.stages:
+            s = stage.stats
+            print(f"{s.name:<12}{s.workers:>8}{s.items_in:>7}{s.items_out:>7}{s.errors:>8}{s.busy:>8.2f}s"
+                  f"{s.throughput:>10,.0f}{s.avg_depth:>11.1f}{s.max_depth:>11}")
+        print(f"Pipeline finished in {self.elapsed:.2f}s")
+
+@dataclass
+class Page:
+    city: str
+    url: str
+    html: Optional[str]
+
+@dataclass
+class MatchPipeline:
+    scraper: LumaEventScraper
+    person1: Person
+    person2: Person
+    matcher: Optional[EventMatcher] = None  # None scores locally and skips the LLM
+    top_k: Optional[int] = 30
+    score_batch: int = 32
+    events_out: Optional[str] = 'all_luma_events.json'
+    queue_size: int = 64
+    started: float = 0.0
+    first_scored: Optional[float] = None
+    events: List[Dict] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.scorer = LocalScorer([self.person1, self.person2])
+        self._seen = set()
+        self.deduper = EventDeduper()
+        self._pending: List[Dict] = []
+        self._shortlist: List = []  # min-heap of (score, sequence, event)
+        self._sequence = 0
+        self._score_stage: Optional[Stage] = None
+        self._sink = JSONArraySink(self.events_out) if self.events_out else None
+
+    def fetch(self, city: str, emit: Emit):
+        url = self.scraper.city_urls[city]
+        try:
+            response = self.scraper.http.get(url, timeout=15)
+            response.raise_for_status()
+            emit(Page(city, url, response.text))
+        except requests.RequestException as e:
+            print(f"Note: HTTP fetch failed for {city}: {str(e)}")
+            emit(Page(city, url, None))
+
+    def extract(self, page: Page, emit: Emit):
+        events = parse_next_data_events(page.html, page.city) if page.html else []
+        if not events and self.scraper.use_browser_fallback:
+            print(f"No embedded event data for {page.city}, falling back to the browser")
+            events = self.scraper.scrape_with_browser(page.city, page.url)
+        print(f"Extracted {len(events)} events for {page.city} after {time.perf_counter() - self.started:.2f}s")
+        for event in events:
+            emit(event)
+
+    def normalize(self, event: Dict, emit: Emit):
+        """Fill in missing fields, tidy whitespace and drop events already seen (single worker)
+
+        Every distinct event is saved, but only one event per recurring series
+        goes on to scoring, carrying the series' occurrence count.
+        """
+        event = {key: ' '.join(str(event.get(key) or '').split()) for key in EVENT_FIELDS}
+        key = event_key(event)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        self.events.append(event)
+        if self._sink:
+            self._sink.write(event)
+        representative = self.deduper.add(event)
+        if representative is not None:
+            emit(representative)
+
+    def _score_pending(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        affinities = self.scorer.affinities(self.scorer.event_matrix(batch))
+        combined = self.scorer.combine(affinities[0], affinities[1])
+        if self.first_scored is None:
+            self.first_scored = time.perf_counter() - self.started
+        for event, score in zip(batch, combined.tolist()):
+            self._sequence += 1
+            # Earlier events win ties, like the stable sort in LocalScorer.top_matches
+            entry = (score, -self._sequence, event)
+            if self.top_k is None or len(self._shortlist) < self.top_k:
+                heapq.heappush(self._shortlist, entry)
+            elif entry > self._shortlist[0]:
+                heapq.heapreplace(self._shortlist, entry)
+
+    def score(self, event: Dict, emit: Emit):
+        self._pending.append(event)
+        # Score a full batch, or whatever has arrived once the queue runs dry, so a city
+        # is ranked as soon as it lands rather than when the next one fills the batch
+        if len(self._pending) >= self.score_batch or self._score_stage.inbox.empty():
+            self._score_pending()
+
+    def finish_scoring(self, emit: Emit):
+        self._score_pending()
+        if self._sink:
+            self._sink.close()
+            print(f"Saved {len(self.events)} events to {self.events_out}")
+        # A late event can merge two series that were both already scored; only the older one survives
+        representatives = {id(event) for event in self.deduper.representatives()}
+        shortlist = [event for _, _, event in sorted(self._shortlist, key=lambda e: (e[0], e[1]), reverse=True)
+                     if id(event) in representatives]
+        self.deduper.print_report()
+        print(f"Shortlisted {len(shortlist)} of {len(self.events)} events after "
+              f"{time.perf_counter() - self.started:.2f}s")
+        emit(shortlist)
+
+    def match(self, shortlist: List[Dict], emit: Emit):
+        if self.matcher is None:
+            emit(self.scorer.score_pairs(shortlist)[(self.person1.name, self.person2.name)])
+        else:
+            emit(self.matcher.find_matching_events(shortlist, self.person1, self.person2))
+
+    def build(self, cities: int) -> Pipeline:
+        workers = max(1, cities)
+        self._score_stage = Stage('score', self.score, maxsize=self.queue_size, flush=self.finish_scoring)
+        return Pipeline([
+            Stage('fetch', self.fetch, workers=workers, maxsize=self.queue_size),
+            Stage('extract', self.extract, workers=workers, maxsize=self.queue_size),
+            Stage('normalize', self.normalize, maxsize=self.queue_size),
+            self._score_stage,
+            Stage('match', self.match, maxsize=1)
+        ])
+
+    def run(self, locations: List[str]) -> Any:
+        """Scrape the cities behind locations and match the pair; returns the match stage's result"""
+        cities = self.scraper.resolve_cities(locations)
+        print(f"Running the pipeline for {', '.join(cities)}")
+        pipeline = self.build(len(cities))
+        self.started = time.perf_counter()
+        results = pipeline.run(cities)
+        pipeline.print_stats()
+        if self.first_scored is not None:
+            print(f"First events scored after {self.first_scored:.2f}s")
+        return results[0] if results else None
+
+def main():
+    """Scrape both people's cities and match them in one pipelined run"""
+    parser = argparse.ArgumentParser(description="Scrape and match events in one pipelined run")
+    parser.add_argument('--location', action='append',
+                        help="Extra location to scrape (repeatable; both people's cities are always included)")
+    parser.add_argument('--top-k', type=int, default=30, help="Events pre-ranked locally and sent to the LLM (0 for all)")
+    parser.add_argument('--local', action='store_true', help="Score locally only, without calling the LLM")
+    parser.add_argument('--no-browser', action='store_true', help="Don't fall back to Selenium for pages without embedded data")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the LLM response cache")
+    parser.add_argument('--events-out', default='all_luma_events.json', help="Where to write the scraped events")
+    parser.add_argument('--queue-size', type=int, default=64)
+    args = parser.parse_args()
+
+    load_dotenv()
+    try:
+        with open('intern1.json', 'r') as f1, open('intern2.json', 'r') as f2:
+            person1 = Person.from_json(json.load(f1))
+            person2 = Person.from_json(json.load(f2))
+    except FileNotFoundError:
+        print("Error: Make sure both intern1.json and intern2.json exist in the current directory")
+        return
+    except json.JSONDecodeError:
+        print("Error: Invalid JSON format in one of the input files")
+        return
+
+    scraper = LumaEventScraper(use_browser_fallback=not args.no_browser)
+    matcher = None
+    if not args.local:
+        cache = None if args.no_cache else ResponseCache()
+        matcher = EventMatcher(cache=cache, cache_mode='bypass' if args.no_cache else 'use')
+    runner = MatchPipeline(scraper, person1, person2, matcher=matcher, top_k=args.top_k or None,
+                           events_out=args.events_out, queue_size=args.queue_size)
+    try:
+        result = runner.run([person1.location, person2.location] + (args.location or []))
+        if matcher:
+            matcher.display_matches(result)
+            matcher.client.print_stats()
+        else:
+            output = os.path.join(os.path.dirname(args.events_out) or '.', 'top_matching_events.json')
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(result or [], f, indent=4, ensure_ascii=False)
+            print(f"\nSaved {len(result or [])} locally scored events to {output}")
+            for event in result or []:
+                print(f"  {event['match_score']}/10  {event['title']}  ({', '.join(event['common_matches']) or '-'})")
+    except Exception as e:
+        print(f"Error in main: {str(e)}")
+    finally:
+        scraper.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Prompt Encoding
+Compact serialization of events and interests for matching prompts: one
+pipe-separated row per event under a single header, with empty, constant
+and redundant fields left out and links replaced by short stable IDs that
+are mapped back in the response
+"""
+
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (column name, event key) in row order; the row number comes first
+COLUMNS: List[Tuple[str, str]] = [
+    ('title', 'title'), ('date', 'date'), ('location', 'location'), ('city', 'city'),
+    ('organizers', 'organizers'), ('status', 'status'), ('attendees', 'attendees'),
+    ('notes', 'description'), ('repeats', 'occurrences'), ('id', 'link')
+]
+
+_ID_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+_BOILERPLATE_RE = re.compile(r'\b(?:organized by|by|attendees?)\b', re.IGNORECASE)
+_WORD_RE = re.compile(r'\w{2,}')
+
+def _cell(value) -> str:
+    text = str(value or '')
+    if '|' in text or '  ' in text or '\n' in text or '\t' in text:
+        return ' '.join(text.replace('|', '/').split())
+    return text.strip()
+
+def _extra(description: str, fields: Sequence[str]) -> str:
+    remainder = description
+    for value in fields:
+        if value:
+            remainder = remainder.replace(value, ' ')
+    remainder = _BOILERPLATE_RE.sub(' ', remainder)
+    return description if len(_WORD_RE.findall(remainder)) >= 3 else ''
+
+def description_extra(event: Dict) -> str:
+    """What the description says beyond the organizers, status and attendee fields, if anything
+
+    Scraped Luma descriptions are just "Organized by {organizers}. {status}
+    {attendees} attendees.", so they usually reduce to nothing.
+    """
+    return _extra(_cell(event.get('description')),
+                  [_cell(event.get(key)) for key in ('organizers', 'status', 'attendees')])
+
+def link_id(link: str, length: int = 4) -> str:
+    """Short ID derived from the link alone, so an event keeps its ID across prompts and runs"""
+    n = zlib.crc32(link.encode('utf-8'))
+    n = n * 2654435761 + len(link)  # spread the bits before taking the extra characters for longer IDs
+    chars = []
+    for _ in range(length):
+        n, digit = divmod(n, len(_ID_ALPHABET))
+        chars.append(_ID_ALPHABET[digit])
+    return 'e' + ''.join(chars)
+
+def assign_ids(links: Sequence[str]) -> Dict[str, str]:
+    """link -> ID for every link, lengthening an ID only when two links in the same prompt collide"""
+    ids: Dict[str, str] = {}
+    taken: Dict[str, str] = {}
+    for link in dict.fromkeys(links):
+        length = 4
+        candidate = link_id(link, length)
+        while candidate in taken and taken[candidate] != link:
+            length += 1
+            candidate = link_id(link, length)
+        ids[link] = candidate
+        taken[candidate] = link
+    return ids
+
+@dataclass
+class EncodedEvents:
+    text: str
+    columns: List[str]
+    constants: Dict[str, str] = field(default_factory=dict)  # fields with the same value on every event
+    links: Dict[str, str] = field(default_factory=dict)      # id -> link
+
+    def expand_links(self, text: str) -> str:
+        """Replace event IDs the model echoed back with the original links"""
+        if not self.links or not text:
+            return text
+        pattern = re.compile(r'(?<![\w/])(' + '|'.join(map(re.escape, self.links)) + r')(?![\w/])')
+        return pattern.sub(lambda m: self.links[m.group(1)], text)
+
+def encode_events(events: List[Dict]) -> EncodedEvents:
+    """Rows of '#|title|date|...' under one header line
+
+    Columns that are empty for every event are dropped, and columns with a
+    single value across all events are stated once above the table.
+    """
+    ids = assign_ids([e.get('link') or '' for e in events if e.get('link')])
+    rows = []
+    for event in events:
+        row = {name: _cell(event.get(key)) for name, key in COLUMNS}
+        row['notes'] = _extra(row['notes'], (row['organizers'], row['status'], row['attendees']))
+        if row['organizers'].lower().startswith('by '):
+            row['organizers'] = row['organizers'][3:]
+        row['id'] = ids.get(event.get('link') or '', '')
+        rows.append(row)
+
+    columns, constants = [], {}
+    for name, _ in COLUMNS:
+        values = {row[name] for row in rows}
+        if values == {''}:
+            continue
+        if len(values) == 1 and len(rows) > 1 and name not in ('title', 'id'):
+            constants[name] = values.pop()
+            continue
+        columns.append(name)
+
+    lines = []
+    if constants:
+        lines.append('All events: ' + '; '.join(f"{name} {value}" for name, value in constants.items()))
+    lines.append('|'.join(['#'] + columns))
+    for i, row in enumerate(rows, 1):
+        lines.append('|'.join([str(i)] + [row[name] for name in columns]))
+    return EncodedEvents(text='\n'.join(lines), columns=columns, constants=constants,
+                         links={event_id: link for link, event_id in ids.items()})
+
+def format_interests(name1: str, interests1: List[str], name2: str, interests2: List[str]) -> str:
+    """One shared interest vocabulary: the common interests once, then what is unique to each person"""
+    def unique(interests: List[str]) -> Dict[str, str]:
+        return {i.strip().lower(): i.strip() for i in interests if i.strip()}
+
+    first, second = unique(interests1), unique(interests2)
+    lines = [f"Both: {', '.join(first[k] for k in first if k in second) or 'none'}"]
+    lines.append(f"Only {name1}: {', '.join(v for k, v in first.items() if k not in second) or 'none'}")
+    lines.append(f"Only {name2}: {', '.join(v for k, v in second.items() if k not in first) or 'none'}")
+    return '\n'.join(lines)
+
+@dataclass
+class EncodingStats:
+    verbose_tokens: int
+    compact_tokens: int
+
+    @property
+    def reduction(self) -> float:
+        return 1 - self.compact_tokens / self.verbose_tokens if self.verbose_tokens else 0.0
+
+def expand_links(text: str, events: List[Dict], encoded: Optional[EncodedEvents] = None) -> str:
+    """Map IDs in a response for these events back to links (IDs are stable, so re-encoding is safe)"""
+    if encoded is None:
+        ids = assign_ids([e.get('link') or '' for e in events if e.get('link')])
+        encoded = EncodedEvents(text='', columns=[], links={event_id: link for link, event_id in ids.items()})
+    return encoded.expand_links(text)
@@ -60,7 +60,7 @@ def main():
         print(f"Error: {str(e)}")
     finally:
         if 'scraper' in locals():
-            del scraper
+            scraper.pool.print_stats()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Scrape Waits
+Condition-based waits and per-phase timing shared by the Luma and Devpost
+scrapers, replacing fixed sleeps
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+
+TIMINGS_LOG = 'scrape_timings.jsonl'
+
+class AdaptiveTimeout:
+    def __init__(self, initial: float = 10.0, minimum: float = 2.0, maximum: float = 30.0,
+                 factor: float = 2.0, window: int = 20):
+        """Timeout that follows how long a wait has actually been taking
+
+        Starts at initial; once waits have completed it becomes factor times
+        the slowest of the last window observations, clamped to
+        [minimum, maximum]. Fast pages stop paying for slow-page headroom and
+        slow pages get more time than a fixed sleep would give them. A wait
+        that runs out the whole adaptive timeout is recorded with timed_out(),
+        so the timeout grows again by factor instead of staying pinned low.
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.window = window
+        self.observed: List[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            if not self.observed:
+                return self.initial
+            return min(self.maximum, max(self.minimum, max(self.observed) * self.factor))
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.observed.append(seconds)
+            del self.observed[:-self.window]
+
+    def timed_out(self):
+        """Record a wait that gave up after the full current timeout"""
+        self.observe(self.value)
+
+    def record(self, start: float, settled: bool, timeout: Optional[float]):
+        """Record a wait begun at start (time.monotonic())
+
+        Settled waits are observed at their length. A wait that didn't settle
+        only counts as a timeout when it was given the adaptive value; one
+        with an explicit timeout says nothing about this kind of wait.
+        """
+        if settled:
+            self.observe(time.monotonic() - start)
+        elif timeout is None:
+            self.timed_out()
+
+# One adaptive timeout per kind of wait, shared across scrapes in this process
+TIMEOUTS: Dict[str, AdaptiveTimeout] = {
+    'cards': AdaptiveTimeout(initial=15.0),
+    'network': AdaptiveTimeout(initial=10.0, minimum=1.0),
+    'scroll': AdaptiveTimeout(initial=4.0, minimum=1.0, maximum=15.0),
+}
+
+def _poll_until_stable(read: Callable[[], object], timeout: float, stable_for: float, poll: float,
+                       ready: Callable[[object], bool] = lambda value: True) -> Tuple[object, bool]:
+    """Poll read() until its value is ready and unchanged for stable_for seconds, or timeout
+
+    Returns the last value and whether it settled before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    last = read()
+    last_change = time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        value = read()
+        now = time.monotonic()
+        if value != last:
+            last, last_change = value, now
+        elif ready(value) and now - last_change >= stable_for:
+            return last, True
+    return last, False
+
+def wait_for_count_stable(driver, css_selector: str, min_count: int = 1, stable_for: float = 0.75,
+                          poll: float = 0.25, timeout: Optional[float] = None) -> int:
+    """Wait until at least min_count elements match and the count stops changing"""
+    adaptive = TIMEOUTS['cards']
+    start = time.monotonic()
+    count, settled = _poll_until_stable(
+        lambda: len(driver.find_elements(By.CSS_SELECTOR, css_selector)),
+        timeout if timeout is not None else adaptive.value, stable_for, poll,
+        ready=lambda value: value >= min_count
+    )
+    adaptive.record(start, settled, timeout)
+    return count
+
+def wait_for_network_idle(driver, idle_for: float = 0.5, poll: float = 0.1,
+                          timeout: Optional[float] = None) -> bool:
+    """Wait until the document has loaded and no new resources have been fetched for idle_for seconds"""
+    adaptive = TIMEOUTS['network']
+    start = time.monotonic()
+    state, settled = _poll_until_stable(
+        lambda: (driver.execute_script("return document.readyState"),
+                 driver.execute_script("return performance.getEntriesByType('resource').length")),
+        timeout if timeout is not None else adaptive.value, idle_for, poll,
+        ready=lambda value: value[0] == 'complete'
+    )
+    adaptive.record(start, settled, timeout)
+    return state[0] == 'complete'
+
+def wait_for_scroll_settled(driver, previous_height: int, settle_for: float = 0.5, poll: float = 0.2,
+                            timeout: Optional[float] = None) -> int:
+    """After a scroll, wait for the page to grow and then stop growing; returns the new height
+
+    A page that never grows has reached the end of its feed, which every
+    scroll loop ends with, so that isn't recorded as a timeout.
+    """
+    adaptive = TIMEOUTS['scroll']
+    start = time.monotonic()
+    height, settled = _poll_until_stable(
+        lambda: driver.execute_script("return document.body.scrollHeight"),
+        timeout if timeout is not None else adaptive.value, settle_for, poll,
+        ready=lambda value: value > previous_height
+    )
+    if settled or height > previous_height:
+        adaptive.record(start, settled, timeout)
+    return height
+
+class PhaseTimer:
+    def __init__(self, scraper: str, target: str, log_path: Optional[str] = TIMINGS_LOG):
+        """Record how long each phase of one scrape takes
+
+        Phases are timed with `with timer.phase('navigate'):` and written as a
+        single JSON line to log_path by finish().
+        """
+        self.scraper = scraper
+        self.target = target
+        self.log_path = log_path
+        self.phases: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, name: str, seconds: float):
+        """Add a phase that was timed elsewhere"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self, **extra) -> Dict:
+        """Append this scrape's timings to the structured log and print a one-line summary"""
+        record = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'scraper': self.scraper,
+            'target': self.target,
+            'total': round(time.perf_counter() - self.started, 3),
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+        }
+        record.update(extra)
+        print(f"Timings for {self.target}: " + ", ".join(f"{k} {v:.2f}s" for k, v in record['phases'].items())
+              + f" (total {record['total']:.2f}s)")
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            except Exception as e:
+                print(f"Error writing scrape timings: {str(e)}")
+        return record
@@ -0,0 +1,71 @@
+import json
+import time
+
+from batch_matcher import BatchMatcher, TokenBucket, all_pairs, load_pairs
+from event_matcher import Person
+from llm_stub_server import StubLLMServer
+
+EVENTS = [{'title': title, 'description': '', 'date': '6:00 PM', 'location': 'Park', 'city': 'New York',
+           'organizers': f'By Host {i}', 'status': '', 'attendees': '', 'link': f'https://lu.ma/e{i}'}
+          for i, title in enumerate(['Coffee Tasting', 'Pottery Night', 'Jazz in the Park'])]
+PROFILES = [Person(name, interests, 'New York') for name, interests in [
+    ('Ana', ['coffee']), ('Ben', ['jazz']), ('Cy', ['pottery']), ('Di', ['coffee', 'jazz'])]]
+
+def make_batch(server, monkeypatch, rate):
+    monkeypatch.setenv('DEEPSEEK_API_KEY', 'test-key')
+    monkeypatch.setenv('LLM_TELEMETRY_PATH', 'off')
+    return BatchMatcher(concurrency=4, rate=rate, api_url=server.url)
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_token_bucket_limits_the_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # One token up front, then one every 50ms
+    assert time.monotonic() - start >= 0.19
+
+def test_throttle_halves_the_rate_and_pauses():
+    bucket = TokenBucket(rate=10)
+    bucket.on_throttle(retry_after=0.2)
+    assert bucket.rate == 5
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+    bucket.on_success()
+    assert bucket.rate == 6
+
+def test_load_pairs_skips_unknown_profiles(tmp_path):
+    path = tmp_path / 'pairs.jsonl'
+    path.write_text('{"person1": "Ana", "person2": "Ben"}\n\n{"person1": "Ana", "person2": "Zed"}\n')
+    assert [(a.name, b.name) for a, b in load_pairs(str(path), PROFILES)] == [('Ana', 'Ben')]
+
+def test_batch_writes_one_line_per_pair_at_the_limited_rate(tmp_path, monkeypatch):
+    output = tmp_path / 'batch.jsonl'
+    pairs = all_pairs(PROFILES)
+    with StubLLMServer() as server:
+        batch = make_batch(server, monkeypatch, rate=4)
+        start = time.perf_counter()
+        summary = batch.run(EVENTS, pairs, str(output))
+        elapsed = time.perf_counter() - start
+        assert server.request_count == 6
+
+    lines = read_lines(output)
+    assert len(lines) == 6
+    assert {(r['person1'], r['person2']) for r in lines} == {(a.name, b.name) for a, b in pairs}
+    assert all(r['ok'] for r in lines)
+    assert (summary['succeeded'], summary['failed']) == (6, 0)
+    # Four tokens are available up front, the other two arrive at 4 per second
+    assert elapsed >= 0.45
+
+def test_batch_backs_off_on_429(tmp_path, monkeypatch):
+    output = tmp_path / 'batch.jsonl'
+    with StubLLMServer(fail_statuses=[429]) as server:
+        batch = make_batch(server, monkeypatch, rate=10)
+        summary = batch.run(EVENTS, all_pairs(PROFILES[:2]), str(output))
+    assert summary['throttled'] == 1
+    assert summary['succeeded'] == 1
+    assert batch.rate_limiter.rate < 10
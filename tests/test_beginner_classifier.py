@@ -0,0 +1,44 @@
+import pytest
+
+from beginner_classifier import beginner_flags, classify, is_beginner_friendly
+
+@pytest.mark.parametrize('title,description,tags', [
+    ('HackNY', 'New to coding? No experience required.', []),
+    ('Intro to Robotics', '', []),
+    ('Campus Build Night', 'Open to all majors', []),
+    ('Data Jam', 'Win prizes', ['Beginner Friendly']),
+    ('Workshops and Talks', '', []),
+])
+def test_beginner_hackathons(title, description, tags):
+    assert is_beginner_friendly(title, description, tags)
+    assert classify(title, description, tags)
+
+@pytest.mark.parametrize('title,description,tags', [
+    ('Quant Finance Challenge', 'Advanced track for experienced engineers', ['Fintech']),
+    ('Unlearn Bias Hackathon', 'Preschool edtech ideas from upstarters', []),
+    ('Retro Games Jam', 'Build a metro app', ['Gaming']),
+])
+def test_keywords_only_match_at_word_starts(title, description, tags):
+    assert not is_beginner_friendly(title, description, tags)
+    assert not classify(title, description, tags)
+
+def test_student_indicators_are_not_checked_in_tags():
+    assert not is_beginner_friendly('Open Build', '', ['University'])
+    assert is_beginner_friendly('Open Build', 'University teams welcome', [])
+
+def test_phrase_spanning_title_and_description():
+    # "new to" only appears once the title and description are joined
+    assert is_beginner_friendly('Something New', 'to try this weekend', [])
+    result = classify('Something New', 'to try this weekend', [])
+    assert result.signals == [('title', 'new to')]
+
+def test_signals_name_the_field():
+    result = classify('Intro Hack', 'For students', ['Tutorial'])
+    assert result.signals == [('title', 'intro'), ('description', 'student'), ('tags', 'tutorial')]
+
+def test_bulk_flags_agree_with_single_checks():
+    records = [{'title': 'Intro Hack', 'description': None, 'tags': None},
+               {'title': 'Something New', 'description': 'to try'},
+               {'title': 'Pro League', 'description': 'Experts only', 'tags': ['AI']}]
+    assert beginner_flags(records) == [is_beginner_friendly(r['title'], r['description'], r.get('tags') or [])
+                                       for r in records] == [True, True, False]
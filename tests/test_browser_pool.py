@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+import browser_pool
+from browser_pool import BrowserPool, BrowserSession
+from luma_scraper import LumaEventScraper
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.window_handles = ['main']
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+def fake_pool(**kwargs) -> BrowserPool:
+    pool = BrowserPool(**kwargs)
+    pool._start = lambda: BrowserSession(driver=FakeDriver(), started=time.time())
+    return pool
+
+def test_closing_scrapers_leaves_the_shared_pool_open(monkeypatch):
+    shared = fake_pool()
+    monkeypatch.setattr(browser_pool, '_shared_pool', shared)
+    LumaEventScraper().close()
+    with LumaEventScraper().pool.session() as driver:
+        assert driver.execute_script('return 1') == 1
+
+def test_closing_scrapers_leaves_a_passed_pool_open():
+    pool = fake_pool()
+    LumaEventScraper(pool=pool).close()
+    with pool.session() as driver:
+        assert not driver.quit_called
+
+def test_warm_up_refuses_a_closed_pool():
+    pool = fake_pool(size=2)
+    pool.warm_up()
+    drivers = [session.driver for session in pool._idle]
+    pool.close()
+    assert all(driver.quit_called for driver in drivers)
+    with pytest.raises(RuntimeError):
+        pool.warm_up()
+    with pytest.raises(RuntimeError):
+        with pool.session():
+            pass
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from devpost_api import DevpostAPIClient, record_to_hackathon
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+
+def load_page(page):
+    path = os.path.join(FIXTURES, f'devpost_api_page{page}.json')
+    if not os.path.exists(path):
+        return {'hackathons': [], 'meta': {'total_count': 22, 'per_page': 9}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture
+def listing():
+    """Serve the fixture pages as base_url?page=N; yields (url, requested pages, options)
+
+    options['failures'] maps a page number to how many requests for it get a 500.
+    """
+    requested = []
+    options = {'meta': True, 'failures': {}}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            page = int(parse_qs(urlparse(self.path).query)['page'][0])
+            requested.append(page)
+            if options['failures'].get(page):
+                options['failures'][page] -= 1
+                self.send_response(500)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            data = load_page(page)
+            if not options['meta']:
+                data.pop('meta', None)
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    yield f'http://{host}:{port}/api/hackathons', requested, options
+    server.shutdown()
+    server.server_close()
+
+def expected_ids():
+    return [r['id'] for page in (1, 2, 3) for r in load_page(page)['hackathons']]
+
+def test_pages_up_to_the_total_count(listing):
+    url, requested, _ = listing
+    client = DevpostAPIClient(base_url=url, max_workers=4)
+    records = client.fetch_all()
+    client.close()
+    assert [r['id'] for r in records] == expected_ids()
+    assert sorted(requested) == [1, 2, 3]
+
+def test_max_pages_stops_early(listing):
+    url, requested, _ = listing
+    client = DevpostAPIClient(base_url=url)
+    assert len(client.fetch_all(max_pages=2)) == 18
+    client.close()
+    assert sorted(requested) == [1, 2]
+
+def test_pages_until_empty_without_a_total(listing):
+    url, requested, options = listing
+    options['meta'] = False
+    client = DevpostAPIClient(base_url=url, max_workers=2)
+    records = client.fetch_all()
+    client.close()
+    assert [r['id'] for r in records] == expected_ids()
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+
+def test_failed_pages_are_reported(listing, capsys):
+    url, _, options = listing
+    options['failures'] = {2: 99}
+    client = DevpostAPIClient(base_url=url, max_retries=0)
+    records = client.fetch_all()
+    client.close()
+    assert len(records) == 13
+    assert client.failed_pages == [2]
+    assert 'Devpost pages [2] could not be fetched' in capsys.readouterr().out
+
+def test_failed_page_does_not_end_paging_without_a_total(listing):
+    url, requested, options = listing
+    options['meta'] = False
+    options['failures'] = {2: 99}
+    client = DevpostAPIClient(base_url=url, max_workers=2, max_retries=0)
+    records = client.fetch_all()
+    client.close()
+    assert [r['id'] for r in records] == [i for i in expected_ids() if i not in
+                                          {r['id'] for r in load_page(2)['hackathons']}]
+    assert client.failed_pages == [2]
+    assert sorted(requested) == [1, 2, 3, 4, 5]
+
+def test_paging_stops_when_a_whole_batch_fails(listing):
+    url, requested, options = listing
+    options['meta'] = False
+    options['failures'] = {2: 99, 3: 99}
+    client = DevpostAPIClient(base_url=url, max_workers=2, max_retries=0)
+    assert len(client.fetch_all()) == 9
+    client.close()
+    assert sorted(client.failed_pages) == [2, 3] and sorted(requested) == [1, 2, 3]
+
+def test_transient_failures_are_retried(listing):
+    url, _, options = listing
+    options['failures'] = {3: 1}
+    client = DevpostAPIClient(base_url=url, max_retries=1)
+    assert [r['id'] for r in client.fetch_all()] == expected_ids()
+    client.close()
+    assert client.failed_pages == []
+
+def test_record_to_hackathon():
+    record = load_page(1)['hackathons'][0]
+    hackathon = record_to_hackathon(record, lambda title, description, tags: 'Beginner' in title)
+    assert hackathon == {
+        'title': 'HackMIT Beginner Track',
+        'url': 'https://hackmit-beginner-track.devpost.com/',
+        'date': 'Jun 21 - Jul 21, 2025',
+        'prize': '$25,000',
+        'description': 'Hosted by Microsoft',
+        'tags': ['Machine Learning/AI', 'Gaming', 'Low/No Code'],
+        'is_beginner_friendly': True,
+        'location': 'Toronto, Canada',
+        'status': 'Upcoming',
+    }
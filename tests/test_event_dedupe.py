@@ -0,0 +1,64 @@
+import json
+import random
+
+from api_server import EventCatalog
+from event_dedupe import dedupe_events, normalize_link
+from event_matcher import Person
+from pipeline import MatchPipeline
+
+def event(n, title, organizers='By Founders Club', city='New York', date='6:00 PM'):
+    return {'title': title, 'organizers': organizers, 'location': 'Park', 'city': city, 'date': date,
+            'link': f"https://lu.ma/e{n}", 'status': '', 'attendees': '', 'description': ''}
+
+SERIES = [event(1, 'Founders Running Club #1', date='Mon'), event(2, 'Founders Running Club #2', date='Tue'),
+          event(3, 'Founders Running Club #3', date='Wed'), event(4, 'Pottery for beginners', 'By Clay Studio')]
+
+def test_normalize_link():
+    assert normalize_link('https://www.lu.ma/abc/?tk=1#x') == normalize_link('http://lu.ma/abc') == 'lu.ma/abc'
+
+def test_exact_and_recurring_duplicates_collapse():
+    copies = [dict(SERIES[3], link=SERIES[3]['link'] + '?utm=x')]
+    events, deduper = dedupe_events(SERIES + copies)
+    assert [e['title'] for e in events] == ['Founders Running Club #1', 'Pottery for beginners']
+    assert events[0]['occurrences'] == 3 and events[0]['dates'] == ['Mon', 'Tue', 'Wed']
+    assert (deduper.report.exact_duplicates, deduper.report.near_duplicates) == (1, 2)
+
+def test_distinct_events_skip_most_comparisons():
+    rng = random.Random(7)
+    words = ('coffee pottery running founders jazz climbing yoga chess poetry robotics sushi salsa improv '
+             'hiking vinyl design crypto painting startup biking garden tennis knitting photography wine '
+             'film dance comedy writing meditation').split()
+    places = ['Brooklyn', 'Queens', 'Harlem', 'SoHo', 'Chelsea', 'Tribeca', 'Astoria', 'Bushwick']
+    n = 300
+    events = [event(i, ' '.join(rng.sample(words, 4)) + f" at {rng.choice(places)}", f'By Host {i}')
+              for i in range(n)]
+    kept, deduper = dedupe_events(events)
+    assert len(kept) == n
+    # LSH only compares events that share a band, a few per event rather than all pairs
+    assert deduper.report.comparisons <= 5 * n < n * (n - 1) // 2
+
+def test_series_in_other_cities_are_kept_by_default():
+    other = event(5, 'Founders Running Club #5', city='Toronto')
+    assert len(dedupe_events(SERIES + [other])[0]) == 3
+    assert len(dedupe_events(SERIES + [other], by_city=False)[0]) == 2
+
+def test_api_catalog_serves_deduplicated_events(tmp_path):
+    path = tmp_path / 'events.json'
+    path.write_text(json.dumps(SERIES + SERIES))
+    catalog = EventCatalog(str(path))
+    _, events, _ = catalog.snapshot()
+    assert len(events) == 2 and events[0]['occurrences'] == 3
+
+def test_pipeline_shortlist_drops_absorbed_representatives():
+    person = Person('a', ['running', 'pottery'], 'New York')
+    pipeline = MatchPipeline(scraper=None, person1=person, person2=person, events_out=None)
+    emitted = []
+    for e in (SERIES[0], SERIES[3]):
+        pipeline.normalize(e, emitted.append)
+    for e in emitted:
+        pipeline._pending.append(e)
+    # As if a later event bridged the two clusters after both were scored
+    pipeline.deduper._union(0, 1)
+    shortlists = []
+    pipeline.finish_scoring(shortlists.append)
+    assert [e['title'] for e in shortlists[0]] == ['Founders Running Club #1']
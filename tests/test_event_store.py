@@ -0,0 +1,53 @@
+import json
+
+from event_store import EventStore, event_key
+
+def event(n, city='New York', title=None, **fields):
+    data = {'title': title or f'Event {n}', 'date': '6:00 PM', 'city': city, 'link': f'https://lu.ma/e{n}'}
+    data.update(fields)
+    return data
+
+def seen_times(store, link):
+    return store._connect().execute(
+        'SELECT first_seen, last_seen FROM events WHERE link = ?', (link,)
+    ).fetchone()
+
+def test_upsert_tracks_changes_and_seen_times(tmp_path):
+    store = EventStore(str(tmp_path / 'events.sqlite3'))
+    first = [event(1), event(2), event(3, 'Toronto')]
+
+    stats = store.upsert_events(first, seen_at=100.0)
+    assert (stats.inserted, stats.updated, stats.unchanged) == (3, 0, 0)
+    assert seen_times(store, 'https://lu.ma/e1') == (100.0, 100.0)
+
+    # An unchanged re-upsert only moves last_seen
+    stats = store.upsert_events(first, seen_at=200.0)
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 0, 3)
+    assert seen_times(store, 'https://lu.ma/e1') == (100.0, 200.0)
+
+    changed = [event(1, title='Event 1 (moved)'), event(2)]
+    stats = store.upsert_events(changed, seen_at=300.0)
+    assert (stats.inserted, stats.updated, stats.unchanged) == (0, 1, 1)
+    assert seen_times(store, 'https://lu.ma/e1') == (100.0, 300.0)
+    assert store.query(cities=['New York'])[0]['title'] == 'Event 1 (moved)'
+    assert store.count() == 3
+    store.close()
+
+def test_query_filters_and_export(tmp_path):
+    store = EventStore(str(tmp_path / 'events.sqlite3'))
+    store.upsert_events([event(1), event(2, date='Tue'), event(3, 'Toronto')], seen_at=100.0)
+    store.upsert_events([event(4), event(2, date='Tue')], seen_at=200.0)
+
+    assert sorted(e['title'] for e in store.query(cities=['New York'])) == ['Event 1', 'Event 2', 'Event 4']
+    assert [e['title'] for e in store.query(cities=['New York'], seen_since=150.0)] == ['Event 4', 'Event 2']
+    assert [e['title'] for e in store.query(seen_until=150.0)] == ['Event 1', 'Event 3']
+    assert [e['title'] for e in store.query(date='Tue')] == ['Event 2']
+    assert store.cities() == {'New York': 3, 'Toronto': 1}
+
+    path = tmp_path / 'export.json'
+    assert store.export_json(str(path), cities=['Toronto']) == 1
+    assert json.loads(path.read_text()) == [event(3, 'Toronto')]
+    store.close()
+
+def test_events_without_links_get_a_stand_in_key():
+    assert event_key({'city': 'New York', 'title': 'Picnic', 'date': 'Sat'}) == 'New York|Picnic|Sat'
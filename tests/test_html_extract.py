@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from html_extract import available_backends, extract_devpost_cards, extract_luma_events
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+
+requires_lxml = pytest.mark.skipif('lxml' not in available_backends(), reason="lxml not installed")
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+@requires_lxml
+def test_devpost_backends_agree():
+    html = read_fixture('devpost_hackathons.html')
+    cards = extract_devpost_cards(html, backend='bs4')
+    assert len(cards) == 20
+    assert extract_devpost_cards(html, backend='lxml') == cards
+
+@requires_lxml
+def test_luma_backends_agree():
+    html = read_fixture('luma_nyc.html')
+    events = extract_luma_events(html, 'New York', backend='bs4')
+    assert len(events) == 25
+    assert extract_luma_events(html, 'New York', backend='lxml') == events
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_devpost_card_fields(backend):
+    card = extract_devpost_cards(read_fixture('devpost_hackathons.html'), backend=backend)[0]
+    assert card['title'] == 'HackMIT Beginner Track'
+    assert card['url'] == 'https://devpost.com/hackathons/hackmit-beginner-track'
+    assert card['tags'] == ['Low/No Code', 'Beginner Friendly', 'Machine Learning/AI']
+    assert card['status'] == 'Upcoming'
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_pages_without_cards(backend):
+    html = '<html><body><p>Nothing here</p></body></html>'
+    assert extract_devpost_cards(html, backend=backend) == []
+    assert extract_luma_events(html, 'New York', backend=backend) == []
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        extract_devpost_cards('<html></html>', backend='regex')
@@ -0,0 +1,73 @@
+import time
+
+from event_matcher import EventMatcher, Person
+from llm_cache import ResponseCache
+from llm_stub_server import StubLLMServer
+
+EVENTS = [{'title': 'Coffee Tasting', 'description': 'Single-origin pour-overs', 'date': '6:00 PM',
+           'location': 'Stub Venue', 'city': 'New York', 'organizers': 'By Stub Organizer',
+           'status': '', 'attendees': '+10', 'link': 'https://lu.ma/stub'}]
+PEOPLE = (Person('Ana', ['coffee'], 'New York'), Person('Ben', ['coffee', 'music'], 'New York'))
+
+def make_matcher(server, cache, monkeypatch, cache_mode='use'):
+    monkeypatch.setenv('DEEPSEEK_API_KEY', 'test-key')
+    monkeypatch.setenv('LLM_TELEMETRY_PATH', 'off')
+    return EventMatcher(cache=cache, cache_mode=cache_mode, api_url=server.url, output_file=None)
+
+def test_get_put_and_stats(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite3'))
+    key = ResponseCache.make_key('deepseek-chat', 0.7, 2000, 'prompt')
+    assert cache.get(key) is None
+    cache.put(key, 'response', latency=1.5)
+    assert cache.get(key) == 'response'
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+    assert cache.stats.latency_saved == 1.5
+    assert cache.stats.hit_rate == 0.5
+    cache.close()
+
+def test_key_depends_on_every_parameter():
+    base = ResponseCache.make_key('deepseek-chat', 0.7, 2000, 'prompt')
+    assert base == ResponseCache.make_key('deepseek-chat', 0.7, 2000, 'prompt')
+    assert base != ResponseCache.make_key('deepseek-chat', 0.0, 2000, 'prompt')
+    assert base != ResponseCache.make_key('deepseek-chat', 0.7, 1000, 'prompt')
+    assert base != ResponseCache.make_key('deepseek-chat', 0.7, 2000, 'other prompt')
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite3'), ttl_seconds=0.05)
+    cache.put('key', 'response', latency=1.0)
+    time.sleep(0.1)
+    assert cache.get('key') is None
+    assert cache.stats.evictions == 1
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite3'), max_bytes=25)
+    cache.put('old', 'x' * 10, latency=1.0)
+    time.sleep(0.01)
+    cache.put('recent', 'y' * 10, latency=1.0)
+    time.sleep(0.01)
+    cache.get('old')
+    time.sleep(0.01)
+    cache.put('new', 'z' * 10, latency=1.0)
+    assert cache.get('recent') is None
+    assert cache.get('old') == 'x' * 10
+    assert cache.get('new') == 'z' * 10
+
+def test_matcher_answers_repeat_prompts_from_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite3'))
+    with StubLLMServer() as server:
+        matcher = make_matcher(server, cache, monkeypatch)
+        first = matcher.find_matching_events(EVENTS, *PEOPLE)
+        second = matcher.find_matching_events(EVENTS, *PEOPLE)
+        assert server.request_count == 1
+    assert first == second
+    assert cache.stats.hits == 1
+
+def test_refresh_and_bypass_go_to_the_api(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite3'))
+    with StubLLMServer() as server:
+        make_matcher(server, cache, monkeypatch).find_matching_events(EVENTS, *PEOPLE)
+        make_matcher(server, cache, monkeypatch, 'refresh').find_matching_events(EVENTS, *PEOPLE)
+        make_matcher(server, cache, monkeypatch, 'bypass').find_matching_events(EVENTS, *PEOPLE)
+        assert server.request_count == 3
+    assert cache.stats.hits == 0
+    assert cache.stats.stores == 2
@@ -0,0 +1,67 @@
+import time
+
+from llm_client import LatencyHistogram, LLMClient
+from llm_stub_server import StubLLMServer
+
+PAYLOAD = {'model': 'deepseek-chat', 'messages': [{'role': 'user', 'content': 'hi'}]}
+
+def test_retries_transient_failures_until_success():
+    with StubLLMServer(fail_statuses=[503, 502]) as server:
+        client = LLMClient(server.url, 'test-key', backoff_base=0.01)
+        response = client.post(PAYLOAD)
+        assert response.status_code == 200
+        assert server.request_count == 3
+    assert client.last_retries == 2
+    stats = client.stats()
+    assert (stats['requests'], stats['retries'], stats['failures']) == (3, 2, 0)
+    assert stats['latency']['count'] == 3
+    client.close()
+
+def test_429_waits_for_retry_after():
+    with StubLLMServer(fail_statuses=[429]) as server:
+        client = LLMClient(server.url, 'test-key', backoff_base=0.01)
+        start = time.perf_counter()
+        response = client.post(PAYLOAD)
+        elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    # The stub sends Retry-After: 1, far longer than the jittered backoff would be
+    assert elapsed >= 1.0
+    client.close()
+
+def test_gives_up_after_max_retries():
+    with StubLLMServer(fail_statuses=[503, 503, 503]) as server:
+        client = LLMClient(server.url, 'test-key', max_retries=2, backoff_base=0.01)
+        response = client.post(PAYLOAD)
+        assert server.request_count == 3
+    assert response.status_code == 503
+    assert client.stats()['failures'] == 1
+    client.close()
+
+def test_client_errors_are_not_retried():
+    with StubLLMServer(fail_statuses=[400]) as server:
+        client = LLMClient(server.url, 'test-key', backoff_base=0.01)
+        assert client.post(PAYLOAD).status_code == 400
+        assert server.request_count == 1
+    assert client.last_retries == 0
+    client.close()
+
+def test_histogram_percentiles_and_buckets():
+    histogram = LatencyHistogram()
+    for seconds in [0.005, 0.015, 0.3, 0.3, 4.0]:
+        histogram.record(seconds)
+    summary = histogram.summary()
+    assert summary['count'] == 5
+    assert summary['p50'] == 0.3
+    assert summary['p99'] == 4.0
+    assert summary['buckets'] == {'<=0.01s': 1, '<=0.02s': 1, '<=0.5s': 2, '<=5s': 1}
+
+def test_slow_request_is_hedged():
+    # Only the first request is slow, so the duplicate sent after hedge_after wins
+    with StubLLMServer(latency=lambda n: 1.0 if n == 1 else 0.0) as server:
+        client = LLMClient(server.url, 'test-key', hedge=True, hedge_after=0.05)
+        start = time.perf_counter()
+        assert client.post(PAYLOAD).status_code == 200
+        assert time.perf_counter() - start < 1.0
+    stats = client.stats()
+    assert (stats['hedges'], stats['hedge_wins']) == (1, 1)
+    client.close()
@@ -0,0 +1,20 @@
+from llm_telemetry import summarize
+
+def record(kind, matches, prompt_tokens, completion_tokens=0, **extra):
+    data = {'ts': 1.0, 'kind': kind, 'status': 'ok', 'matches': matches,
+            'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens}
+    data.update(extra)
+    return data
+
+def test_map_stage_tokens_count_towards_tokens_per_match():
+    records = [record('map', 3, 900, 10), record('map', 3, 900, 10), record('complete', 4, 500, 180)]
+    summary = summarize(records)
+    assert summary['matches'] == 4
+    assert summary['map_picks'] == 6
+    assert summary['tokens_per_match'] == (910 + 910 + 680) / 4
+
+def test_cache_hits_and_failures_are_left_out():
+    records = [record('complete', 2, 100, 20),
+               record('complete', 5, None, cache_hit=True),
+               record('complete', 0, None, status='http_500')]
+    assert summarize(records)['tokens_per_match'] == 60
@@ -0,0 +1,18 @@
+from location_resolver import ALIAS_CONFIDENCE, AMBIGUOUS_CONFIDENCE, resolve_location
+
+def test_alias_agreeing_with_region():
+    resolution = resolve_location("Brooklyn, NY")
+    assert (resolution.city, resolution.confidence) == ('New York', ALIAS_CONFIDENCE)
+
+def test_alias_contradicted_by_region_is_rejected():
+    resolution = resolve_location("Manhattan Beach, CA")
+    assert resolution.city != 'New York'
+    assert resolution.confidence == AMBIGUOUS_CONFIDENCE
+
+def test_alias_without_region():
+    assert resolve_location("Venice Beach").city == 'Los Angeles'
+
+def test_later_alias_that_fits_the_region_wins():
+    for location in ("Queens Road, Los Angeles, CA", "Brooklyn Ave, Los Angeles, California"):
+        resolution = resolve_location(location)
+        assert (resolution.city, resolution.confidence) == ('Los Angeles', ALIAS_CONFIDENCE)
@@ -0,0 +1,48 @@
+import json
+import os
+
+from luma_scraper import parse_next_data_events
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'luma_nyc.html')
+
+def load_fixture_events():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        return parse_next_data_events(f.read(), 'New York')
+
+def page(entries):
+    data = {'props': {'pageProps': {'initialData': {'featured_items': entries}}}}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></html>'
+
+def test_fixture_events_have_card_fields():
+    events = load_fixture_events()
+    assert len(events) == 25
+    assert len({e['link'] for e in events}) == 25
+    first = events[0]
+    assert first['title'] == 'Tech Pickleball NYC'
+    assert first['date'] == '7:30 AM'
+    assert first['location'] == 'McCarren Park Tennis Courts'
+    assert first['attendees'] == '+1.5K'
+    assert first['link'] == 'https://lu.ma/9uxgw8l4'
+    for event in events:
+        assert event['city'] == 'New York'
+        assert set(event) >= {'title', 'date', 'location', 'organizers', 'status', 'attendees', 'link'}
+
+def test_fixture_ticket_statuses():
+    statuses = {e['status'] for e in load_fixture_events()}
+    assert {'Sold Out', 'Waitlist', 'Near Capacity', '$25', 'Suggested: $10'} <= statuses
+
+def test_duplicates_and_incomplete_entries_are_skipped():
+    entry = {'event': {'name': ' Run Club ', 'url': 'run-club', 'start_at': '2025-06-06T13:00:00Z',
+                       'timezone': 'America/New_York'},
+             'guest_count': 42, 'ticket_info': {'is_free': False, 'price': {'cents': 1500}}}
+    html = page([entry, entry, {'event': {'name': 'No link'}}])
+    events = parse_next_data_events(html, 'New York')
+    assert len(events) == 1
+    assert events[0]['title'] == 'Run Club'
+    assert events[0]['date'] == '9:00 AM'
+    assert events[0]['link'] == 'https://lu.ma/run-club'
+    assert events[0]['location'] == 'New York'
+    assert (events[0]['attendees'], events[0]['status']) == ('+42', '$15')
+
+def test_page_without_next_data():
+    assert parse_next_data_events('<html><body>Loading…</body></html>', 'New York') == []
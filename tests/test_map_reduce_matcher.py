@@ -0,0 +1,58 @@
+import pytest
+
+from event_matcher import EventMatcher, Person, estimate_tokens
+from llm_stub_server import StubLLMServer
+from map_reduce_matcher import MapReduceMatcher
+
+PEOPLE = (Person('Ana', ['coffee', 'jazz'], 'New York'), Person('Ben', ['jazz', 'pottery'], 'New York'))
+TOPICS = ['Coffee Tasting', 'Jazz Night', 'Pottery Class', 'Chess Club', 'Trail Run', 'Poetry Slam']
+
+def make_events(n):
+    return [{'title': f'{TOPICS[i % len(TOPICS)]} #{i}', 'description': '', 'date': f'{i % 12 + 1}:00 PM',
+             'location': f'Venue {i}', 'city': 'New York', 'organizers': f'By Host {i}', 'status': '',
+             'attendees': f'+{i * 7}', 'link': f'https://lu.ma/e{i}'} for i in range(n)]
+
+@pytest.fixture
+def matcher_for(monkeypatch):
+    monkeypatch.setenv('DEEPSEEK_API_KEY', 'test-key')
+    monkeypatch.setenv('LLM_TELEMETRY_PATH', 'off')
+    return lambda server: EventMatcher(api_url=server.url, output_file=None)
+
+def test_chunks_fill_the_budget(matcher_for):
+    with StubLLMServer() as server:
+        map_reduce = MapReduceMatcher(matcher_for(server), chunk_token_budget=1500)
+        events = make_events(200)
+        chunks = map_reduce.chunk_events(events, *PEOPLE)
+    assert [e for chunk in chunks for e in chunk] == events
+    sizes = [estimate_tokens(map_reduce.build_map_prompt(chunk, *PEOPLE)) for chunk in chunks]
+    assert max(sizes) <= 1500
+    # Events are priced by their row, not row plus header, so full chunks use most of the budget
+    # (the rest is columns like city that a chunk states once instead of on every row)
+    assert min(sizes[:-1]) >= 1500 * 0.75
+
+def test_event_larger_than_the_budget_is_rejected(matcher_for):
+    with StubLLMServer() as server:
+        map_reduce = MapReduceMatcher(matcher_for(server), chunk_token_budget=400)
+        huge = dict(make_events(1)[0], title='Jazz ' * 400)
+        with pytest.raises(ValueError):
+            map_reduce.chunk_events([huge], *PEOPLE)
+
+def test_no_prompt_exceeds_the_budget(matcher_for):
+    with StubLLMServer(reply="1, 2, 3") as server:
+        map_reduce = MapReduceMatcher(matcher_for(server), chunk_token_budget=1500, candidates_per_chunk=3)
+        map_reduce.find_matching_events(make_events(120), *PEOPLE)
+        prompts = [r['messages'][0]['content'] for r in server.requests]
+    stats = map_reduce.last_stats
+    assert stats.rounds >= 1 and stats.map_calls == len(prompts) - 1
+    assert max(estimate_tokens(p) for p in prompts) <= 1500
+
+def test_reduce_is_trimmed_when_rounds_stop_shrinking(matcher_for):
+    # Chunks never hold more events than they nominate, so map rounds make no progress
+    with StubLLMServer(reply=", ".join(str(i) for i in range(1, 101))) as server:
+        map_reduce = MapReduceMatcher(matcher_for(server), chunk_token_budget=1200, candidates_per_chunk=500)
+        map_reduce.find_matching_events(make_events(80), *PEOPLE)
+        reduce_prompt = server.requests[-1]['messages'][0]['content']
+    stats = map_reduce.last_stats
+    assert stats.trimmed > 0
+    assert stats.finalists == 80 - stats.trimmed
+    assert estimate_tokens(reduce_prompt) <= 1200
@@ -0,0 +1,22 @@
+from match_results import parse_match_results, repair_json
+
+EVENTS = [{'title': f"Event {i}"} for i in range(1, 4)]
+
+def test_trailing_comma_with_curly_quotes_in_a_value():
+    text = '{"matches":[{"event":2,"score":8,"reason":"Both love “hands-on” making"},]}'
+    assert repair_json(text) == {'matches': [{'event': 2, 'score': 8, 'reason': 'Both love “hands-on” making'}]}
+
+def test_curly_quotes_as_delimiters():
+    assert repair_json('{“matches”: [{“event”: 1, “score”: 7}]}') == {'matches': [{'event': 1, 'score': 7}]}
+
+def test_python_literals_outside_strings_only():
+    assert repair_json('```json\n{"a": None, "b": "None of it, ]",}\n```') == {'a': None, 'b': 'None of it, ]'}
+
+def test_prose_and_truncation():
+    data = repair_json('Here you go: {"matches": [{"event": 1, "score": 9, "reason": "cut')
+    assert data == {'matches': [{'event': 1, 'score': 9, 'reason': 'cut'}]}
+
+def test_non_finite_scores_are_dropped():
+    text = '{"matches":[{"event":1,"score":NaN},{"event":2,"score":"inf"},{"event":3,"score":12}]}'
+    results = parse_match_results(text, EVENTS)
+    assert [(r.event_index, r.score) for r in results] == [(2, 10.0)]
@@ -0,0 +1,62 @@
+import random
+
+from event_matcher import Person
+from event_store import event_key
+from match_table import MatchTable
+
+def event(n, title, city='New York'):
+    return {'title': title, 'organizers': 'By Club', 'location': 'Park', 'city': city,
+            'date': '6:00 PM', 'link': f"https://lu.ma/e{n}"}
+
+def links(matches):
+    return [m['link'] for m in matches]
+
+def assert_matches_full_build(table):
+    catalog = [table.events[i] for i in sorted(table._positions.values())]
+    full = MatchTable.build(list(table.people.values()), catalog, top_k=table.top_k)
+    for a, b in full.pairs():
+        assert links(table.lookup(a, b)) == links(full.lookup(a, b)), (a, b)
+
+def test_changed_events_let_evicted_events_back_in():
+    people = [Person('a', ['coffee', 'running'], 'NYC'), Person('b', ['coffee', 'running'], 'NYC')]
+    # Equal scores, so the heap (2 * top_k entries) keeps the first two and evicts the rest
+    table = MatchTable.build(people, [event(n, 'Running coffee social') for n in range(5)], top_k=1)
+    table.add_events([event(0, 'Tax seminar'), event(1, 'Tax workshop')])
+    assert table.lookup('a', 'b')
+    assert_matches_full_build(table)
+
+def test_incremental_updates_match_a_full_build(tmp_path):
+    rng = random.Random(3)
+    words = ['coffee', 'running', 'jazz', 'ai', 'startup', 'hiking', 'drawing', 'food', 'market', 'trivia']
+    interests = lambda: rng.sample(words, 3)
+    people = [Person(f"p{i}", interests(), 'NYC') for i in range(5)]
+    catalog = [event(n, ' '.join(rng.sample(words, 3))) for n in range(40)]
+
+    table = MatchTable.build(people, catalog[:20], top_k=3)
+    table.add_events(catalog[20:])
+    assert_matches_full_build(table)
+
+    changed = [event(n, ' '.join(rng.sample(words, 2))) for n in rng.sample(range(40), 10)]
+    table.add_events(changed)
+    assert_matches_full_build(table)
+
+    table.remove_events([event_key(catalog[n]) for n in rng.sample(range(40), 8)])
+    assert_matches_full_build(table)
+
+    table.update_person(Person('p2', interests(), 'NYC'))
+    table.update_person(Person('p5', interests(), 'NYC'))
+    assert_matches_full_build(table)
+
+    path = str(tmp_path / 'table.json')
+    table.save(path)
+    loaded = MatchTable.load(path)
+    assert_matches_full_build(loaded)
+    added, _, removed = loaded.sync_events([table.events[i] for i in sorted(table._positions.values())])
+    assert (added, removed) == (0, 0)
+
+def test_incremental_updates_avoid_work():
+    people = [Person(f"p{i}", ['coffee', 'jazz'], 'NYC') for i in range(4)]
+    table = MatchTable.build(people, [event(n, 'Coffee jazz night') for n in range(30)], top_k=3)
+    table.stats.__init__()
+    table.add_events([event(30, 'Jazz brunch')])
+    assert table.stats.avoided > 0.9
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+import pytest
+
+from output_sinks import GzipJSONLSink, JSONArraySink, JSONLSink, ListSink, OutputRouter, open_sink
+
+RECORDS = [{'title': 'HackNY', 'tags': ['Beginner Friendly'], 'prize': '$1,000'},
+           {'title': 'Café Jam', 'tags': [], 'nested': {'a': [1, 2]}}]
+
+def test_json_array_matches_json_dump(tmp_path):
+    path = tmp_path / 'out.json'
+    sink = JSONArraySink(str(path))
+    for record in RECORDS:
+        sink.write(record)
+    sink.close()
+    assert path.read_text(encoding='utf-8') == json.dumps(RECORDS, indent=4, ensure_ascii=False)
+    assert sink.count == 2
+
+def test_json_array_without_records(tmp_path):
+    path = tmp_path / 'out.json'
+    JSONArraySink(str(path)).close()
+    assert json.loads(path.read_text()) == []
+
+    path.write_text('["previous"]')
+    JSONArraySink(str(path)).close(create_empty=False)
+    assert json.loads(path.read_text()) == ['previous']
+
+@pytest.mark.parametrize('fmt,read', [
+    ('jsonl', lambda path: open(path, 'r', encoding='utf-8')),
+    ('jsonl.gz', lambda path: gzip.open(path, 'rt', encoding='utf-8')),
+])
+def test_jsonl_round_trip(tmp_path, fmt, read):
+    sink = open_sink(str(tmp_path / 'out'), fmt)
+    assert isinstance(sink, GzipJSONLSink if fmt == 'jsonl.gz' else JSONLSink)
+    for record in RECORDS:
+        sink.write(record)
+    sink.close()
+    with read(sink.path) as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+    empty = open_sink(str(tmp_path / 'empty'), fmt)
+    empty.close()
+    with read(empty.path) as f:
+        assert f.read() == ''
+
+def test_router_sends_records_only_where_every_filter_passes():
+    calls = []
+
+    def beginner(record):
+        calls.append(record['title'])
+        return record['beginner']
+
+    router = OutputRouter({'beginner': beginner, 'open': lambda r: r['open']})
+    everything, beginners, open_beginners = ListSink(), ListSink(), ListSink()
+    router.add_route('all', [], [everything])
+    router.add_route('beginner', ['beginner'], [beginners])
+    router.add_route('open_beginner', ['beginner', 'open'], [open_beginners])
+
+    records = [{'title': 'a', 'beginner': True, 'open': True},
+               {'title': 'b', 'beginner': True, 'open': False},
+               {'title': 'c', 'beginner': False, 'open': True}]
+    with router:
+        for record in records:
+            router.write(record)
+
+    assert [r['title'] for r in everything.records] == ['a', 'b', 'c']
+    assert [r['title'] for r in beginners.records] == ['a', 'b']
+    assert [r['title'] for r in open_beginners.records] == ['a']
+    assert router.counts() == {'all': 3, 'beginner': 2, 'open_beginner': 1}
+    assert router.records == 3
+    # Each predicate runs once per record, however many routes use it
+    assert calls == ['a', 'b', 'c']
+
+def test_router_rejects_unknown_predicates():
+    with pytest.raises(ValueError):
+        OutputRouter({'open': lambda r: True}).add_route('x', ['beginner'], [])
+
+def test_router_without_records_leaves_files_alone(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_text('["previous"]')
+    router = OutputRouter({})
+    router.add_route('all', [], [JSONArraySink(str(path))])
+    router.close()
+    assert json.loads(path.read_text()) == ['previous']
@@ -0,0 +1,51 @@
+from prompt_encoding import assign_ids, encode_events, expand_links, format_interests
+
+# Two links whose 4-character IDs collide
+COLLIDING = ['https://lu.ma/e212', 'https://lu.ma/e1757']
+
+def event(n, title, **fields):
+    data = {'title': title, 'date': '6:00 PM', 'location': 'Park', 'city': 'New York',
+            'organizers': 'By Founders Club', 'status': '', 'attendees': '', 'description': '',
+            'link': f'https://lu.ma/e{n}'}
+    data.update(fields)
+    return data
+
+def test_colliding_ids_are_lengthened():
+    ids = assign_ids(COLLIDING)
+    assert ids[COLLIDING[0]] == 'esugq'
+    assert ids[COLLIDING[1]] == 'esugqb'
+    # Without the collision the second link keeps its short ID
+    assert assign_ids(COLLIDING[1:]) == {COLLIDING[1]: 'esugq'}
+
+def test_echoed_ids_expand_to_links():
+    events = [event(212, 'Coffee'), event(1757, 'Pottery')]
+    encoded = encode_events(events)
+    assert encoded.links == {'esugq': COLLIDING[0], 'esugqb': COLLIDING[1]}
+    response = "1. Pottery\nLink: esugqb\n---\n2. Coffee\nLink: esugq\nesugqbx stays"
+    expanded = expand_links(response, events)
+    assert expanded == (f"1. Pottery\nLink: {COLLIDING[1]}\n---\n2. Coffee\nLink: {COLLIDING[0]}\n"
+                        "esugqbx stays")
+    assert encoded.expand_links(response) == expanded
+
+def test_empty_and_constant_columns_are_dropped():
+    events = [event(1, 'Coffee', date='Mon'), event(2, 'Pottery', date='Tue')]
+    encoded = encode_events(events)
+    assert encoded.columns == ['title', 'date', 'id']
+    assert encoded.constants == {'location': 'Park', 'city': 'New York', 'organizers': 'Founders Club'}
+    lines = encoded.text.splitlines()
+    assert lines[0] == 'All events: location Park; city New York; organizers Founders Club'
+    assert lines[1] == '#|title|date|id'
+    assert lines[2].startswith('1|Coffee|Mon|e')
+
+def test_cells_escape_pipes_and_newlines():
+    events = [event(1, 'Jazz | Blues\nNight'), event(2, 'Tea  time')]
+    rows = encode_events(events).text.splitlines()[-2:]
+    assert rows[0].split('|')[1] == 'Jazz / Blues Night'
+    assert rows[1].split('|')[1] == 'Tea time'
+    assert all(len(row.split('|')) == 3 for row in rows)
+
+def test_format_interests():
+    text = format_interests('Ana', ['Coffee', 'Jazz ', 'hiking'], 'Ben', ['coffee', 'Chess'])
+    assert text.splitlines() == ['Both: Coffee', 'Only Ana: Jazz, hiking', 'Only Ben: Chess']
+    assert format_interests('Ana', ['Jazz'], 'Ben', []).splitlines() == [
+        'Both: none', 'Only Ana: Jazz', 'Only Ben: none']
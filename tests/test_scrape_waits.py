@@ -0,0 +1,47 @@
+import scrape_waits
+from scrape_waits import AdaptiveTimeout, wait_for_scroll_settled
+
+def test_timeouts_grow_back_after_fast_waits():
+    timeout = AdaptiveTimeout(initial=4.0, minimum=1.0, maximum=15.0)
+    for _ in range(20):
+        timeout.observe(0.3)
+    assert timeout.value == 1.0
+    timeout.timed_out()
+    assert timeout.value == 2.0
+    for _ in range(3):
+        timeout.timed_out()
+    assert timeout.value == 15.0
+
+class FlatPage:
+    def execute_script(self, script):
+        return 1000
+
+class GrowingPage:
+    """A page whose height keeps growing for as long as it is polled"""
+    def __init__(self):
+        self.height = 1000
+
+    def execute_script(self, script):
+        self.height += 100
+        return self.height
+
+def test_end_of_feed_does_not_raise_the_timeout(monkeypatch):
+    timeout = AdaptiveTimeout(initial=0.2, minimum=0.1, maximum=1.0)
+    monkeypatch.setitem(scrape_waits.TIMEOUTS, 'scroll', timeout)
+    for _ in range(3):
+        assert wait_for_scroll_settled(FlatPage(), previous_height=1000, poll=0.05) == 1000
+    assert timeout.observed == []
+    assert timeout.value == 0.2
+
+def test_page_still_growing_at_the_deadline_is_a_timeout(monkeypatch):
+    timeout = AdaptiveTimeout(initial=0.2, minimum=0.1, maximum=1.0)
+    monkeypatch.setitem(scrape_waits.TIMEOUTS, 'scroll', timeout)
+    assert wait_for_scroll_settled(GrowingPage(), previous_height=1000, poll=0.05) > 1000
+    assert timeout.observed == [0.2]
+    assert timeout.value == 0.4
+
+def test_explicit_timeouts_are_not_recorded_as_timeouts(monkeypatch):
+    timeout = AdaptiveTimeout(initial=0.2, minimum=0.1, maximum=1.0)
+    monkeypatch.setitem(scrape_waits.TIMEOUTS, 'scroll', timeout)
+    wait_for_scroll_settled(GrowingPage(), previous_height=1000, poll=0.05, timeout=0.1)
+    assert timeout.observed == []
@@ -0,0 +1,47 @@
+from event_matcher import EventMatcher, MatchBlockParser, Person
+from llm_stub_server import StubLLMServer
+
+EVENTS = [{'title': 'Coffee Tasting', 'description': 'Single-origin pour-overs', 'date': '6:00 PM',
+           'location': 'Stub Venue', 'city': 'New York', 'organizers': 'By Stub Organizer',
+           'status': '', 'attendees': '+10', 'link': 'https://lu.ma/stub'}]
+PEOPLE = (Person('Ana', ['coffee'], 'New York'), Person('Ben', ['coffee', 'music'], 'New York'))
+
+REPLY = """Here are the best events:
+
+---
+
+1. Coffee Tasting
+Match Score: 9/10
+
+---
+
+2. Coffee Tasting
+Match Score: 7/10
+"""
+
+def test_parser_splits_blocks_across_chunk_boundaries():
+    parser = MatchBlockParser()
+    blocks = []
+    for i in range(0, len(REPLY), 5):
+        blocks.extend(parser.feed(REPLY[i:i + 5]))
+    blocks.extend(parser.close())
+    assert [b.splitlines()[0] for b in blocks] == ['1. Coffee Tasting', '2. Coffee Tasting']
+
+def test_parser_ignores_longer_rules():
+    parser = MatchBlockParser()
+    assert parser.feed("1. A\n----\nstill A\n") == []
+    assert parser.close() == ["1. A\n----\nstill A"]
+
+def test_stream_yields_blocks_before_the_response_ends(monkeypatch):
+    monkeypatch.setenv('DEEPSEEK_API_KEY', 'test-key')
+    monkeypatch.setenv('LLM_TELEMETRY_PATH', 'off')
+    with StubLLMServer(reply=REPLY, chunk_size=8, chunk_delay=0.01) as server:
+        matcher = EventMatcher(api_url=server.url, output_file=None)
+        blocks = list(matcher.stream_matching_events(EVENTS, *PEOPLE))
+        assert server.requests[0]['stream'] is True
+
+    assert len(blocks) == 2
+    assert blocks[0].startswith('1. Coffee Tasting')
+    stats = matcher.last_stream_stats
+    assert stats.matches == 2
+    assert stats.time_to_first_byte <= stats.time_to_first_match < stats.total_time